@@ -1,5 +1,7 @@
 import numpy as np
 
+from utils.encoding_lib import BitBuffer
+
 # Tracks the signal as it moves through the processing pipeline.
 class SignalContext:
 
@@ -33,11 +35,23 @@ class SignalContext:
 
         # Sliced symbols.
         self.symbols = None
+        self.soft_symbols = None # Analog value at each symbol center.
         self.symbol_rate = 1.0
         self.thresholds = []
-
-        # Extracted packet data.
-        self.extracted_packets = []
+        self.burst_symbols = [] # One int8 symbol array per burst, when the slicer clocked bursts.
+
+        # Packets framed in the inspector, as packed rows (zero padded) for batched analysis.
+        # This is the only copy; extracted_packets views it one packet at a time.
+        self.packet_matrix = None
+        self.packet_lengths = None # Bits per packet.
+        self.packet_starts = None # Workbench offset of each packet.
+
+    # One BitBuffer per framed packet, built on demand over its row of packet_matrix.
+    @property
+    def extracted_packets(self):
+        if self.packet_matrix is None:
+            return []
+        return [BitBuffer(row[:(n + 7) // 8], n) for row, n in zip(self.packet_matrix, self.packet_lengths.tolist())]
 
     # Resets the context to empty state.
     def clear(self):
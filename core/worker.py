@@ -0,0 +1,39 @@
+from PyQt5.QtCore import QThread, pyqtSignal
+
+class BackgroundTask(QThread):
+    # Runs a single function off the GUI thread.
+    # Emits result_ready with the return value, or failed with the error message.
+    # A cancelled task emits neither. With cancellable=True the function also gets an
+    # is_cancelled keyword (a callable) so it can stop early between steps.
+    result_ready = pyqtSignal(object)
+    failed = pyqtSignal(str)
+
+    def __init__(self, func, *args, cancellable=False, **kwargs):
+        super().__init__()
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.cancelled = False
+        if cancellable:
+            self.kwargs['is_cancelled'] = self.is_cancelled
+
+        # Kept on the object so callers can block with wait() and read it directly.
+        self.result = None
+        self.error = None
+
+    def cancel(self):
+        self.cancelled = True
+
+    def is_cancelled(self):
+        return self.cancelled
+
+    def run(self):
+        if self.cancelled: return
+        try:
+            self.result = self.func(*self.args, **self.kwargs)
+            if not self.cancelled:
+                self.result_ready.emit(self.result)
+        except Exception as e:
+            self.error = str(e)
+            print(f"Background task error: {e}")
+            self.failed.emit(self.error)
@@ -2,15 +2,19 @@ import numpy as np
 import pyqtgraph as pg
 from PyQt5.QtWidgets import (QVBoxLayout, QHBoxLayout, QLabel, QComboBox, 
                              QPushButton, QGroupBox, QCheckBox, QSlider, 
-                             QSpinBox, QScrollArea)
+                             QSpinBox, QDoubleSpinBox, QScrollArea)
 from PyQt5.QtCore import Qt, QTimer
 
 # Import the base class.
 from core.base_tab import BaseSignalTab
+from core.worker import BackgroundTask
 # Import dsp utilities.
 import utils.dsp_lib as dsp
 
 class DemodTab(BaseSignalTab):
+    # Order of the outputs of dsp.demodulate_all, keyed like the mode combo box.
+    COMPARE_MODES = ("Amplitude", "Frequency", "Phase")
+
     def __init__(self, context):
         super().__init__(context, "Demodulator")
         
@@ -18,8 +22,26 @@ class DemodTab(BaseSignalTab):
         self.local_filtered_data = None
         self.local_filtered_sr = 1.0
         
+        # Sample rate of the demod arrays (differs from the input if decimated).
+        self.demod_sr = 1.0
+        
         self.raw_demod_result = None
         self.demod_result = None
+        self.demod_pyramid = []
+        
+        # Per-mode (result, pyramid) from the fused comparison pass.
+        self.compare_results = None
+        
+        # Matched filter state. The preview covers the view while the full pass runs.
+        self.filter_preview = None
+        self.filter_task = None
+        self.filter_generation = 0
+        self.running_tasks = []
+        
+        # Full-signal level statistics backing the digital overlay.
+        self.level_hist = None
+        self.level_stats = None
+        self.level_stats_key = None
         
         self.thresh_lines = []
         self.digital_color_name = 'Orange'
@@ -46,9 +68,9 @@ class DemodTab(BaseSignalTab):
         self.plot_main.setBackground('#1e1e1e')
         self.plot_main.setMouseEnabled(x=True, y=False)
         
-        # Optimization
-        self.plot_main.setClipToView(True) 
-        self.plot_main.setDownsampling(auto=True, mode='peak')
+        # Downsampling is handled by our own min/max envelope pyramid.
+        self.plot_main.setClipToView(False)
+        self.plot_main.setDownsampling(auto=False)
         
         # Analog trace.
         self.curve_main = self.plot_main.plot(pen=pg.mkPen('g', width=3))
@@ -67,6 +89,22 @@ class DemodTab(BaseSignalTab):
         
         self.viz_layout.addWidget(self.plot_main)
         
+        # Stacked mode comparison, x-linked to the main plot.
+        self.plot_compare = pg.GraphicsLayoutWidget()
+        self.plot_compare.setBackground('#1e1e1e')
+        self.plot_compare.setFixedHeight(300)
+        self.compare_curves = {}
+        for row, key in enumerate(self.COMPARE_MODES):
+            plot = self.plot_compare.addPlot(row=row, col=0)
+            plot.setLabel('left', key)
+            plot.hideAxis('bottom')
+            plot.showGrid(x=True, y=True, alpha=0.3)
+            plot.setMouseEnabled(x=False, y=False)
+            plot.setXLink(self.plot_main.getViewBox())
+            self.compare_curves[key] = plot.plot(pen=pg.mkPen('c', width=1))
+        self.plot_compare.setVisible(False)
+        self.viz_layout.addWidget(self.plot_compare)
+        
         # Mini map.
         self.plot_mini = pg.PlotWidget()
         self.plot_mini.setFixedHeight(80)
@@ -101,7 +139,12 @@ class DemodTab(BaseSignalTab):
         self.sidebar_layout.addWidget(QLabel("Mode:"))
         self.cb_mode = QComboBox()
         self.cb_mode.addItems(["Amplitude (ASK)", "Frequency (FSK)", "Phase (PSK)"])
+        self.cb_mode.currentTextChanged.connect(self.on_mode_changed)
         self.sidebar_layout.addWidget(self.cb_mode)
+        
+        self.chk_compare = QCheckBox("Compare All Modes (Stacked)")
+        self.chk_compare.setToolTip("Run AM, FM and PSK in one pass and show them stacked.")
+        self.sidebar_layout.addWidget(self.chk_compare)
         self.sidebar_layout.addSpacing(10)
         
         self.btn_autoscale = QPushButton("Auto Scale Y-Axis")
@@ -131,6 +174,44 @@ class DemodTab(BaseSignalTab):
         self.sidebar_layout.addWidget(self.grp_filter)
         self.sidebar_layout.addSpacing(10)
 
+        # Post-demod decimation.
+        self.grp_decim = QGroupBox("Decimation (Optional)")
+        self.decim_layout = QVBoxLayout()
+        self.grp_decim.setLayout(self.decim_layout)
+        
+        self.chk_decimate = QCheckBox("Resample to Target SPS")
+        self.chk_decimate.setToolTip("Low-pass and resample the demod output on the next RUN DEMOD.")
+        self.decim_layout.addWidget(self.chk_decimate)
+        
+        row_baud = QHBoxLayout()
+        row_baud.addWidget(QLabel("Symbol Rate (Bd):"))
+        self.spin_baud = QDoubleSpinBox()
+        self.spin_baud.setRange(1.0, 1e9)
+        self.spin_baud.setDecimals(1)
+        self.spin_baud.setValue(9600.0)
+        row_baud.addWidget(self.spin_baud)
+        self.decim_layout.addLayout(row_baud)
+        
+        self.btn_baud_from_box = QPushButton("Rate From Filter Box")
+        self.btn_baud_from_box.setToolTip("Treat the filter box width as one symbol.")
+        self.btn_baud_from_box.clicked.connect(self.baud_from_filter_box)
+        self.decim_layout.addWidget(self.btn_baud_from_box)
+        
+        row_sps = QHBoxLayout()
+        row_sps.addWidget(QLabel("Target SPS:"))
+        self.spin_target_sps = QSpinBox()
+        self.spin_target_sps.setRange(2, 256)
+        self.spin_target_sps.setValue(10)
+        row_sps.addWidget(self.spin_target_sps)
+        self.decim_layout.addLayout(row_sps)
+        
+        self.lbl_decim_info = QLabel("Output Rate: Input Rate")
+        self.lbl_decim_info.setStyleSheet("font-size: 10px; color: #666;")
+        self.decim_layout.addWidget(self.lbl_decim_info)
+        
+        self.sidebar_layout.addWidget(self.grp_decim)
+        self.sidebar_layout.addSpacing(10)
+
         # View Settings.
         self.grp_view = QGroupBox("View Settings")
         self.view_layout = QVBoxLayout()
@@ -174,6 +255,16 @@ class DemodTab(BaseSignalTab):
         self.cb_levels.currentTextChanged.connect(self.setup_thresholds)
         self.slicer_layout.addWidget(self.cb_levels)
         
+        row_auto = QHBoxLayout()
+        self.btn_auto_levels = QPushButton("Auto Thresholds")
+        self.btn_auto_levels.setToolTip("Cluster the demod histogram and place thresholds between the levels.")
+        self.btn_auto_levels.clicked.connect(self.auto_thresholds)
+        row_auto.addWidget(self.btn_auto_levels)
+        self.chk_auto_visible = QCheckBox("Visible Only")
+        self.chk_auto_visible.setToolTip("Estimate from the visible range instead of the full signal.")
+        row_auto.addWidget(self.chk_auto_visible)
+        self.slicer_layout.addLayout(row_auto)
+        
         self.slicer_layout.addSpacing(10)
         self.slicer_layout.addWidget(QLabel("Trace Color:"))
         self.cb_color = QComboBox()
@@ -222,10 +313,16 @@ class DemodTab(BaseSignalTab):
         # Create a local copy to ensure safety.
         self.local_filtered_data = np.copy(self.context.filtered_signal)
         self.local_filtered_sr = self.context.filtered_sr
+        self.demod_sr = self.local_filtered_sr
         
         # Reset Demod and Filter state on new load.
         self.raw_demod_result = None
         self.demod_result = None
+        self.demod_pyramid = []
+        self.compare_results = None
+        self.plot_compare.setVisible(False)
+        self.reset_level_stats()
+        self.cancel_filter_task()
         self.chk_filter_box.setChecked(False)
         
         self.plot_main.setTitle("Data Loaded. Select Mode and click RUN.")
@@ -237,9 +334,18 @@ class DemodTab(BaseSignalTab):
         # Push demodulated data to context.
         if self.demod_result is None:
             return False, "No demodulated data. Click 'RUN DEMOD' first."
+        
+        # Never stage the preview, block until the full filter pass is in.
+        if self.filter_task is not None:
+            self.filter_task.wait()
+            if self.filter_task.error is not None:
+                msg = self.filter_task.error
+                self.on_filter_failed(self.filter_generation, msg)
+                return False, f"Matched filter failed: {msg}"
+            self.on_filter_finished(self.filter_generation, self.filter_task.result)
             
         self.context.demod_mode = self.cb_mode.currentText()
-        self.context.demod_sr = self.local_filtered_sr
+        self.context.demod_sr = self.demod_sr
         
         # If we are doing DPSK and slicer is active, threshold the entire array for the next tab.
         if "Phase" in self.context.demod_mode and self.chk_slicer.isChecked() and self.thresh_lines:
@@ -273,47 +379,107 @@ class DemodTab(BaseSignalTab):
         mode = self.cb_mode.currentText()
         sr = self.local_filtered_sr
         
-        # Use DSP library.
+        # Look up filter length from context for the DPSK delay.
+        k_base = getattr(self.context, 'filter_length', 1) 
+        k = int(k_base * 1.05)
+        
+        if self.chk_compare.isChecked():
+            # One fused pass yields every mode, switching modes afterwards is free.
+            am, fm, ph = dsp.demodulate_all(self.local_filtered_data, sr, k)
+            self.compare_results = {}
+            for key, result in zip(self.COMPARE_MODES, (am, fm, ph)):
+                result, self.demod_sr = self.decimate_result(result)
+                self.compare_results[key] = (result, dsp.build_envelope_pyramid(result))
+            self.raw_demod_result = self.compare_results[self.mode_key(mode)][0]
+            self.plot_compare.setVisible(True)
+            
+        else:
+            self.compare_results = None
+            self.plot_compare.setVisible(False)
+            
+            # Use DSP library.
+            if "Amplitude" in mode:
+                self.raw_demod_result = dsp.demodulate_am(self.local_filtered_data)
+            elif "Frequency" in mode:
+                self.raw_demod_result = dsp.demodulate_fm(self.local_filtered_data, sr)
+            elif "Phase" in mode:
+                self.raw_demod_result = dsp.demodulate_dpsk(self.local_filtered_data, k)
+            
+            self.raw_demod_result, self.demod_sr = self.decimate_result(self.raw_demod_result)
+        
+        self.activate_demod_result(reset_view=True)
+
+    def decimate_result(self, result):
+        # Optionally decimate the analog output down to a few samples per symbol.
+        if not self.chk_decimate.isChecked():
+            self.lbl_decim_info.setText("Output Rate: Input Rate")
+            return result, self.local_filtered_sr
+            
+        result, new_sr = dsp.resample_to_sps(
+            result, 
+            self.local_filtered_sr, 
+            self.spin_baud.value(), 
+            self.spin_target_sps.value()
+        )
+        self.lbl_decim_info.setText(f"Output Rate: {new_sr:,.1f} Hz")
+        return result, new_sr
+
+    def mode_key(self, mode_text):
+        # "Frequency (FSK)" -> "Frequency"
+        return mode_text.split()[0]
+
+    def on_mode_changed(self, mode_text):
+        # With cached comparison results, a mode switch is just a lookup.
+        if self.compare_results is None: return
+        self.raw_demod_result = self.compare_results[self.mode_key(mode_text)][0]
+        self.activate_demod_result(reset_view=False)
+
+    def activate_demod_result(self, reset_view):
+        mode = self.cb_mode.currentText()
+        sr = self.demod_sr
+        
         if "Amplitude" in mode:
-            self.raw_demod_result = dsp.demodulate_am(self.local_filtered_data)
             self.plot_main.setLabel('left', 'Magnitude')
         elif "Frequency" in mode:
-            self.raw_demod_result = dsp.demodulate_fm(self.local_filtered_data, sr)
             self.plot_main.setLabel('left', 'Frequency', units='Hz')
         elif "Phase" in mode:
-            # Look up filter length from context
-            k_base = getattr(self.context, 'filter_length', 1) 
-            k = int(k_base * 1.05)
-            self.raw_demod_result = dsp.demodulate_dpsk(self.local_filtered_data, k)
             self.plot_main.setLabel('left', 'Phase Mag', units='rad')
             
         # Default active array is the raw array.
+        self.cancel_filter_task()
         self.demod_result = self.raw_demod_result.copy()
+        if self.compare_results is not None:
+            self.demod_pyramid = self.compare_results[self.mode_key(mode)][1]
+        else:
+            self.demod_pyramid = dsp.build_envelope_pyramid(self.demod_result)
+        self.reset_level_stats()
             
-        # Update minimap. Peak decimate for pure speed on the mini overview.
-        mini_step = max(1, len(self.demod_result) // 5000)
-        mini_y = self.demod_result[::mini_step]
-        mini_x = np.arange(len(mini_y)) * (mini_step / sr)
+        # Update minimap from the envelope so spikes are not dropped.
+        mini_y, x0, dx = dsp.get_envelope(self.demod_result, self.demod_pyramid, 
+                                          0, len(self.demod_result), 10000)
+        mini_x = (x0 + dx * np.arange(len(mini_y))) / sr
         self.curve_mini.setData(mini_x, mini_y)
         
-        # Reset navigation region.
-        duration = len(self.demod_result) / sr
-        self.plot_mini.setXRange(0, duration) 
-        start_t, end_t = 0, duration * 0.25 
-        
-        self.region.blockSignals(True)
-        self.region.setRegion([start_t, end_t])
-        self.region.blockSignals(False)
-        
-        # Calling setXRange triggers on_range_changed, which starts the timer
-        self.plot_main.setXRange(start_t, end_t, padding=0)
+        if reset_view:
+            # Reset navigation region.
+            duration = len(self.demod_result) / sr
+            self.plot_mini.setXRange(0, duration) 
+            start_t, end_t = 0, duration * 0.25 
+            
+            self.region.blockSignals(True)
+            self.region.setRegion([start_t, end_t])
+            self.region.blockSignals(False)
+            
+            # Calling setXRange triggers on_range_changed, which starts the timer
+            self.plot_main.setXRange(start_t, end_t, padding=0)
         
         self.autoscale_view()
         
-        # Reset filter region size to a sensible default.
-        box_width = max(0.0001, (end_t - start_t) * 0.05)
-        self.filter_region.setRegion([start_t + box_width, start_t + (box_width * 2)])
-        self.update_filter_label()
+        if reset_view:
+            # Reset filter region size to a sensible default.
+            box_width = max(0.0001, (end_t - start_t) * 0.05)
+            self.filter_region.setRegion([start_t + box_width, start_t + (box_width * 2)])
+            self.update_filter_label()
         
         # Re-apply slicer if enabled.
         if self.chk_slicer.isChecked():
@@ -335,11 +501,27 @@ class DemodTab(BaseSignalTab):
         self.update_main_plot()
         if self.chk_slicer.isChecked():
             self.update_digital_overlay()
+        if self.compare_results is not None:
+            self.update_compare_plots()
+
+    def update_compare_plots(self):
+        sr = self.demod_sr
+        min_t, max_t = self.plot_main.viewRange()[0]
+        max_points = max(1000, 2 * int(self.plot_main.getViewBox().width()))
+        
+        for key, (result, pyramid) in self.compare_results.items():
+            i_start = max(0, int(min_t * sr))
+            i_stop = min(len(result), int(max_t * sr) + 1)
+            if i_stop <= i_start: continue
+            
+            view_y, x0, dx = dsp.get_envelope(result, pyramid, i_start, i_stop, max_points)
+            view_x = (x0 + dx * np.arange(len(view_y))) / sr
+            self.compare_curves[key].setData(view_x, view_y)
 
     def update_main_plot(self):
         if self.demod_result is None: return
         
-        sr = self.local_filtered_sr
+        sr = self.demod_sr
         total_points = len(self.demod_result)
         
         # Get the strict visible time window
@@ -354,33 +536,42 @@ class DemodTab(BaseSignalTab):
         i_start = max(0, int(min_t * sr))
         i_stop = min(total_points, int(max_t * sr))
         
-        if i_stop <= i_start: return
+        # While the full filter pass runs, only the previewed span is drawn.
+        source, pyramid, offset = self.demod_result, self.demod_pyramid, 0
+        if self.filter_preview is not None:
+            offset, source = self.filter_preview
+            pyramid = None
+            i_start = max(i_start, offset)
+            i_stop = min(i_stop, offset + len(source))
         
-        # Only extract the exact segment we need
-        view_y = self.demod_result[i_start:i_stop]
-        view_x = np.arange(i_start, i_stop) / sr
+        if i_stop <= i_start: return
         
-        # Decide if we pass raw points or let PyQtGraph apply Peak Downsampling
-        num_points = len(view_y)
+        # Decide if we pass raw points or a display width min/max envelope
+        num_points = i_stop - i_start
         if num_points > self.spin_plot_thresh.value():
-            self.plot_main.setDownsampling(auto=True, mode='peak')
+            max_points = max(1000, 2 * int(self.plot_main.getViewBox().width()))
             self.lbl_active_points.setText(f"Visible Points: {num_points:,}  [Downsampled]")
         else:
-            self.plot_main.setDownsampling(auto=False)
+            max_points = num_points
             self.lbl_active_points.setText(f"Visible Points: {num_points:,}  [1:1]")
+        
+        view_y, x0, dx = dsp.get_envelope(source, pyramid, 
+                                          i_start - offset, i_stop - offset, max_points)
+        view_x = (x0 + offset + dx * np.arange(len(view_y))) / sr
             
         self.curve_main.setData(view_x, view_y)
 
     def update_digital_overlay(self):
         if self.demod_result is None or not self.chk_slicer.isChecked(): return
         if not self.thresh_lines: return
+        # The overlay is refreshed once the full filter result lands.
+        if self.filter_preview is not None: return
         
         thresh_vals = sorted([line.value() for line in self.thresh_lines])
         
         txt = " | ".join([f"{v:.4f}" for v in thresh_vals])
-        self.lbl_thresh_info.setText(f"Thresholds: {txt}")
         
-        sr = self.local_filtered_sr
+        sr = self.demod_sr
         total_points = len(self.demod_result)
         
         view_range = self.plot_main.viewRange()[0]
@@ -395,10 +586,11 @@ class DemodTab(BaseSignalTab):
         
         if i_stop <= i_start: return
         
-        view_y = self.demod_result[i_start:i_stop]
-        view_x = np.arange(i_start, i_stop) / sr
-        
         if "Phase" in self.cb_mode.currentText():
+            self.lbl_thresh_info.setText(f"Thresholds: {txt}")
+            
+            view_y = self.demod_result[i_start:i_stop]
+            view_x = np.arange(i_start, i_stop) / sr
             thresh = thresh_vals[0] if thresh_vals else 0.5
             
             # Find rising edges ONLY
@@ -415,21 +607,48 @@ class DemodTab(BaseSignalTab):
             self.curve_digital.setData(view_x, mapped_y)
             return
         
-        # Digitize only the visible data for normal AM/FM
-        view_symbols = np.digitize(view_y, thresh_vals)
+        # Per-level medians come from the full signal, so they only change with the thresholds.
+        stats = self.get_level_stats(thresh_vals)
+        medians = stats['median']
+        
+        lvl_txt = " | ".join([f"{v:.4f} (n={c:,})" for v, c in zip(medians, stats['count'])])
+        self.lbl_thresh_info.setText(f"Thresholds: {txt}\nLevels: {lvl_txt}")
+        
+        # Digitizing is monotonic, so the min/max envelope maps straight to level extremes.
+        if i_stop - i_start > self.spin_plot_thresh.value():
+            max_points = max(1000, 2 * int(self.plot_main.getViewBox().width()))
+        else:
+            max_points = i_stop - i_start
         
-        mapped_y = np.zeros_like(view_y)
-        unique_syms = np.unique(view_symbols)
+        view_y, x0, dx = dsp.get_envelope(self.demod_result, self.demod_pyramid, 
+                                          i_start, i_stop, max_points)
+        view_x = (x0 + dx * np.arange(len(view_y))) / sr
         
         # Map symbols back to analog levels for the overlay trace.
-        for s in unique_syms:
-            mask = (view_symbols == s)
-            if np.any(mask):
-                val = np.median(view_y[mask])
-                mapped_y[mask] = val
+        mapped_y = medians[np.digitize(view_y, thresh_vals)]
                 
         self.curve_digital.setData(view_x, mapped_y)
 
+    def reset_level_stats(self):
+        # Invalidates the cached histogram whenever the active demod array changes.
+        self.level_hist = None
+        self.level_stats = None
+        self.level_stats_key = None
+
+    def get_level_stats(self, thresh_vals):
+        # Histogram is built once per demod result, stats are re-read from it only when thresholds move.
+        if self.level_hist is None:
+            self.level_hist = dsp.compute_value_histogram(self.demod_result, 
+                                                          value_range=self.get_value_range())
+            
+        key = tuple(thresh_vals)
+        if self.level_stats is None or key != self.level_stats_key:
+            counts, edges = self.level_hist
+            self.level_stats = dsp.compute_level_stats(counts, edges, thresh_vals)
+            self.level_stats_key = key
+            
+        return self.level_stats
+
     def toggle_filter_box(self, checked):
         if checked:
             self.filter_region.show()
@@ -442,25 +661,103 @@ class DemodTab(BaseSignalTab):
             return
         min_x, max_x = self.filter_region.getRegion()
         # Time width in seconds * sample rate = length in samples
-        length_samples = int(abs(max_x - min_x) * self.local_filtered_sr)
+        length_samples = int(abs(max_x - min_x) * self.demod_sr)
         self.lbl_filter_len.setText(f"Length: {length_samples} samples")
 
+    def baud_from_filter_box(self):
+        min_x, max_x = self.filter_region.getRegion()
+        width = abs(max_x - min_x)
+        if width > 0:
+            self.spin_baud.setValue(1.0 / width)
+
     def apply_filter(self):
         if self.raw_demod_result is None:
             return
             
         min_x, max_x = self.filter_region.getRegion()
-        length_samples = int(abs(max_x - min_x) * self.local_filtered_sr)
+        length_samples = int(abs(max_x - min_x) * self.demod_sr)
+        
+        # Any pass still in flight is now stale.
+        self.cancel_filter_task()
         
         # If the box is too small (or user wants to quickly revert).
         if length_samples < 2:
             self.demod_result = self.raw_demod_result.copy()
-        else:
-            f_type = self.cb_filter.currentText()
-            # Apply filter strictly to the RAW data to avoid compound filtering.
-            self.demod_result = dsp.apply_matched_filter(self.raw_demod_result, f_type, length_samples)
+            self.demod_pyramid = dsp.build_envelope_pyramid(self.demod_result)
+            self.reset_level_stats()
+            self.refresh_plot_data()
+            return
             
+        f_type = self.cb_filter.currentText()
+        sr = self.demod_sr
+        
+        # Filter just the view (plus the plot padding) right away.
+        min_t, max_t = self.plot_main.viewRange()[0]
+        pad_t = (max_t - min_t) * 0.15
+        i_start = max(0, int((min_t - pad_t) * sr))
+        i_stop = min(len(self.raw_demod_result), int((max_t + pad_t) * sr))
+        
+        # Apply filter strictly to the RAW data to avoid compound filtering.
+        preview = dsp.apply_matched_filter(self.raw_demod_result, f_type, length_samples, 
+                                           window=(i_start, i_stop))
+        self.filter_preview = (i_start, preview)
+        
+        # The full array (and its plot pyramid) is computed in the background.
+        self.filter_generation += 1
+        generation = self.filter_generation
+        task = BackgroundTask(self.compute_full_filter, self.raw_demod_result, f_type, length_samples,
+                              cancellable=True)
+        task.result_ready.connect(lambda result: self.on_filter_finished(generation, result))
+        task.failed.connect(lambda msg: self.on_filter_failed(generation, msg))
+        task.finished.connect(lambda: self.running_tasks.remove(task))
+        self.running_tasks.append(task)
+        self.filter_task = task
+        
+        self.lbl_filter_len.setText(f"Length: {length_samples} samples  [Filtering...]")
         self.refresh_plot_data()
+        task.start()
+
+    @staticmethod
+    def compute_full_filter(raw_data, f_type, length_samples, is_cancelled, chunk_size=1 << 22):
+        # Runs on the worker thread. Filters in windows so a superseded pass stops early.
+        # Returns (filtered, pyramid), or None if cancelled.
+        if length_samples < 2:
+            filtered = raw_data
+        else:
+            chunks = []
+            for start in range(0, len(raw_data), chunk_size):
+                if is_cancelled(): return None
+                chunks.append(dsp.apply_matched_filter(raw_data, f_type, length_samples, 
+                                                       window=(start, start + chunk_size)))
+            filtered = np.concatenate(chunks)
+        if is_cancelled(): return None
+        return filtered, dsp.build_envelope_pyramid(filtered)
+
+    def on_filter_finished(self, generation, result):
+        # Ignore results from passes that were superseded or already applied.
+        if generation != self.filter_generation or self.filter_task is None or result is None:
+            return
+        
+        self.demod_result, self.demod_pyramid = result
+        self.filter_task = None
+        self.filter_preview = None
+        self.reset_level_stats()
+        self.update_filter_label()
+        self.refresh_plot_data()
+
+    def on_filter_failed(self, generation, msg):
+        if generation != self.filter_generation: return
+        self.cancel_filter_task()
+        self.lbl_filter_len.setText(f"Filter Error: {msg}")
+        self.refresh_plot_data()
+
+    def cancel_filter_task(self):
+        # Drops any preview and invalidates the running pass, which stops at its next window.
+        self.filter_generation += 1
+        if self.filter_task is not None:
+            self.filter_task.cancel()
+        self.filter_task = None
+        self.filter_preview = None
 
     def get_adaptive_color(self, name):
         # Returns hex color tuple (dark_mode_hex, light_mode_hex).
@@ -564,6 +861,41 @@ class DemodTab(BaseSignalTab):
         
         self.update_digital_overlay()
 
+    def get_value_range(self):
+        # The coarsest pyramid level gives the global min/max without another pass.
+        if not self.demod_pyramid: return None
+        _, mins, maxs = self.demod_pyramid[-1]
+        return float(np.min(mins)), float(np.max(maxs))
+
+    def auto_thresholds(self):
+        if self.demod_result is None: return
+        
+        # Make sure the overlay and its lines exist.
+        if not self.chk_slicer.isChecked():
+            self.chk_slicer.setChecked(True)
+        if not self.thresh_lines: return
+        
+        if self.chk_auto_visible.isChecked():
+            sr = self.demod_sr
+            min_t, max_t = self.plot_main.viewRange()[0]
+            i_start = max(0, int(min_t * sr))
+            i_stop = min(len(self.demod_result), int(max_t * sr))
+            if i_stop <= i_start: return
+            counts, edges = dsp.compute_value_histogram(self.demod_result[i_start:i_stop])
+        else:
+            self.get_level_stats(sorted([line.value() for line in self.thresh_lines]))
+            counts, edges = self.level_hist
+            
+        thresholds, _ = dsp.estimate_thresholds(counts, edges, len(self.thresh_lines) + 1)
+        
+        # Lines are moved with signals blocked so the anti-crossing clamp sees the final layout.
+        for line, val in zip(self.thresh_lines, thresholds):
+            line.blockSignals(True)
+            line.setValue(float(val))
+            line.blockSignals(False)
+            
+        self.update_digital_overlay()
+
     def limit_line_movement(self, moved_line):
         # Prevents lines from crossing each other.
         if moved_line not in self.thresh_lines: return
@@ -584,7 +916,7 @@ class DemodTab(BaseSignalTab):
         if self.demod_result is None: return
         
         min_t, max_t = self.region.getRegion()
-        sr = self.local_filtered_sr
+        sr = self.demod_sr
         
         i_start = max(0, int(min_t * sr))
         i_stop = min(len(self.demod_result), int(max_t * sr))
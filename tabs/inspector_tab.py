@@ -1,14 +1,15 @@
 import numpy as np
-from PyQt5.QtWidgets import (QVBoxLayout, QHBoxLayout, QLabel, QPushButton, 
-                             QGroupBox, QPlainTextEdit, QTableWidget, 
+from PyQt5.QtWidgets import (QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QApplication,
+                             QGroupBox, QAbstractScrollArea, QTableWidget, QTableView,
                              QTableWidgetItem, QHeaderView, QAbstractItemView, 
                              QRadioButton, QSplitter, QLineEdit, QFileDialog,
                              QMessageBox, QCheckBox, QComboBox, QSpinBox, QScrollArea,
-                             QDialog, QDialogButtonBox)
-from PyQt5.QtGui import QFont, QTextCursor, QColor, QSyntaxHighlighter, QTextCharFormat
-from PyQt5.QtCore import Qt, QTimer
+                             QDialog, QDialogButtonBox, QListWidget, QListWidgetItem)
+from PyQt5.QtGui import QFont, QFontMetrics, QColor, QPainter, QKeySequence
+from PyQt5.QtCore import Qt, QTimer, QAbstractTableModel, QVariant, pyqtSignal
 
 from core.base_tab import BaseSignalTab
+from core.worker import BackgroundTask
 import utils.encoding_lib as enc
 
 class AbsoluteMapDialog(QDialog):
@@ -91,24 +92,313 @@ class DifferentialMapDialog(QDialog):
             1: self.table.item(1, 1).text()
         }
 
-class ByteHighlighter(QSyntaxHighlighter):
-    # Highlights every alternating byte (8 characters) in the text document.
-    def __init__(self, document):
-        super().__init__(document)
-        self.highlight_format = QTextCharFormat()
-        self.set_mode(False)
+class BitView(QAbstractScrollArea):
+    # Virtualized editor for a BitBuffer. Lines hold a whole number of bytes and only the
+    # visible lines are rendered. Cursor and selection are bit offsets, and edits are
+    # applied as buffer splices.
+    cursorMoved = pyqtSignal(int)
+    edited = pyqtSignal()
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.buffer = enc.BitBuffer()
+        self.cursor = 0
+        self.anchor = 0
+        self.bits_per_line = 64
+        
+        self.setFocusPolicy(Qt.StrongFocus)
+        self.viewport().setCursor(Qt.IBeamCursor)
+        self.set_light_mode(False)
+        self.setFont(QFont("Monospace", 10))
 
-    def set_mode(self, is_light):
+    def setFont(self, font):
+        font.setStyleHint(QFont.TypeWriter)
+        super().setFont(font)
+        self.update_layout()
+
+    def set_light_mode(self, is_light):
         if is_light:
-            self.highlight_format.setBackground(QColor("#E0E0E0"))
+            self.colors = {'bg': QColor("#FFFFFF"), 'text': QColor("#000000"), 'byte': QColor("#E0E0E0"),
+                           'gutter': QColor("#9E9E9E"), 'select': QColor("#90CAF9"), 'erased': QColor("#D32F2F")}
         else:
-            self.highlight_format.setBackground(QColor("#424242"))
-        self.rehighlight()
+            self.colors = {'bg': QColor("#1e1e1e"), 'text': QColor("#00FF00"), 'byte': QColor("#424242"),
+                           'gutter': QColor("#757575"), 'select': QColor("#1565C0"), 'erased': QColor("#FF5252")}
+        self.viewport().update()
+
+    def set_buffer(self, buffer):
+        self.buffer = buffer
+        self.cursor = min(self.cursor, len(buffer))
+        self.anchor = self.cursor
+        self.update_layout()
+
+    def selection(self):
+        # Returns the selected bit range as (start, stop); empty when start == stop.
+        return min(self.cursor, self.anchor), max(self.cursor, self.anchor)
+
+    def has_selection(self):
+        return self.cursor != self.anchor
+
+    def set_selection(self, start, stop):
+        # Selects bits [start, stop) with the cursor left at start, and scrolls to it.
+        n = len(self.buffer)
+        self.anchor = max(0, min(stop, n))
+        self.move_cursor(max(0, min(start, n)), keep_anchor=True)
+
+    def line_metrics(self):
+        # Returns (char width, line height, gutter width) in pixels for the current font.
+        fm = QFontMetrics(self.font())
+        char_w = fm.horizontalAdvance('0')
+        return char_w, fm.height(), char_w * 11
+
+    def update_layout(self):
+        # Fits a whole number of bytes per line and resizes the scroll range to the buffer.
+        char_w, line_h, gutter = self.line_metrics()
+        usable = max(0, self.viewport().width() - gutter - char_w)
+        self.bits_per_line = max(8, usable // char_w // 8 * 8)
+        
+        rows = (len(self.buffer) + self.bits_per_line - 1) // self.bits_per_line + 1
+        visible = max(1, self.viewport().height() // line_h)
+        self.verticalScrollBar().setRange(0, max(0, rows - visible))
+        self.verticalScrollBar().setPageStep(visible)
+        self.verticalScrollBar().setSingleStep(1)
+        self.viewport().update()
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.update_layout()
+
+    def scrollContentsBy(self, dx, dy):
+        self.viewport().update()
+
+    def ensure_visible(self, pos):
+        _, line_h, _ = self.line_metrics()
+        row = pos // self.bits_per_line
+        first = self.verticalScrollBar().value()
+        visible = max(1, self.viewport().height() // line_h)
+        if row < first:
+            self.verticalScrollBar().setValue(row)
+        elif row >= first + visible:
+            self.verticalScrollBar().setValue(row - visible + 1)
+
+    def paintEvent(self, event):
+        painter = QPainter(self.viewport())
+        painter.setFont(self.font())
+        painter.fillRect(self.viewport().rect(), self.colors['bg'])
+        
+        char_w, line_h, gutter = self.line_metrics()
+        ascent = QFontMetrics(self.font()).ascent()
+        width = self.bits_per_line
+        first_row = self.verticalScrollBar().value()
+        num_rows = self.viewport().height() // line_h + 1
+        
+        # One slice covers every visible line.
+        start_bit = first_row * width
+        stop_bit = min(len(self.buffer), start_bit + num_rows * width)
+        text = self.buffer.slice(start_bit, stop_bit).to_string() if stop_bit > start_bit else ""
+        sel_start, sel_stop = self.selection()
+        
+        for r in range(num_rows):
+            line_start = start_bit + r * width
+            if line_start > len(self.buffer):
+                break
+            line = text[r * width:(r + 1) * width]
+            y = r * line_h
+            
+            painter.setPen(self.colors['gutter'])
+            painter.drawText(0, y + ascent, f"{line_start:>9}")
+            
+            # Shade every other byte, counted from the start of the buffer.
+            for j in range(0, len(line), 8):
+                if ((line_start + j) // 8) % 2:
+                    painter.fillRect(gutter + j * char_w, y, min(8, len(line) - j) * char_w, line_h, self.colors['byte'])
+            
+            lo = max(sel_start, line_start) - line_start
+            hi = min(sel_stop, line_start + width) - line_start
+            if hi > lo:
+                painter.fillRect(gutter + lo * char_w, y, (hi - lo) * char_w, line_h, self.colors['select'])
+                
+            painter.setPen(self.colors['text'])
+            painter.drawText(gutter, y + ascent, line)
+            if 'E' in line:
+                painter.setPen(self.colors['erased'])
+                painter.drawText(gutter, y + ascent, "".join(c if c == 'E' else ' ' for c in line))
+                
+        # Caret.
+        if self.hasFocus():
+            row, col = divmod(self.cursor, width)
+            if first_row <= row < first_row + num_rows:
+                x = gutter + col * char_w
+                y = (row - first_row) * line_h
+                painter.fillRect(x, y, 2, line_h, self.colors['text'])
+        painter.end()
+
+    def position_at(self, point):
+        # Maps a viewport point to the nearest bit boundary.
+        char_w, line_h, gutter = self.line_metrics()
+        row = self.verticalScrollBar().value() + max(0, point.y()) // line_h
+        col = int(round((point.x() - gutter) / char_w))
+        col = max(0, min(self.bits_per_line, col))
+        return max(0, min(len(self.buffer), row * self.bits_per_line + col))
+
+    def move_cursor(self, pos, keep_anchor=False):
+        self.cursor = max(0, min(len(self.buffer), pos))
+        if not keep_anchor:
+            self.anchor = self.cursor
+        self.ensure_visible(self.cursor)
+        self.viewport().update()
+        self.cursorMoved.emit(self.cursor)
+
+    def mousePressEvent(self, event):
+        if event.button() == Qt.LeftButton:
+            self.move_cursor(self.position_at(event.pos()), keep_anchor=bool(event.modifiers() & Qt.ShiftModifier))
+
+    def mouseMoveEvent(self, event):
+        if event.buttons() & Qt.LeftButton:
+            self.move_cursor(self.position_at(event.pos()), keep_anchor=True)
+
+    def replace_selection(self, insert):
+        # Replaces the selection (or inserts at the cursor) with the bits of insert.
+        start, stop = self.selection()
+        self.buffer = self.buffer.splice(start, stop, insert)
+        self.update_layout()
+        self.move_cursor(start + (len(insert) if insert is not None else 0))
+        self.edited.emit()
+
+    def keyPressEvent(self, event):
+        key = event.key()
+        shift = bool(event.modifiers() & Qt.ShiftModifier)
+        width = self.bits_per_line
+        _, line_h, _ = self.line_metrics()
+        page = max(1, self.viewport().height() // line_h) * width
+        
+        moves = {
+            Qt.Key_Left: self.cursor - 1, Qt.Key_Right: self.cursor + 1,
+            Qt.Key_Up: self.cursor - width, Qt.Key_Down: self.cursor + width,
+            Qt.Key_PageUp: self.cursor - page, Qt.Key_PageDown: self.cursor + page,
+            Qt.Key_Home: self.cursor - self.cursor % width, 
+            Qt.Key_End: min(len(self.buffer), self.cursor - self.cursor % width + width),
+        }
+        if event.modifiers() & Qt.ControlModifier and key in (Qt.Key_Home, Qt.Key_End):
+            moves[key] = 0 if key == Qt.Key_Home else len(self.buffer)
+            
+        if key in moves:
+            self.move_cursor(moves[key], keep_anchor=shift)
+        elif event.matches(QKeySequence.SelectAll):
+            self.anchor = 0
+            self.move_cursor(len(self.buffer), keep_anchor=True)
+        elif event.matches(QKeySequence.Copy):
+            start, stop = self.selection()
+            QApplication.clipboard().setText(self.buffer.slice(start, stop).to_string())
+        elif event.matches(QKeySequence.Paste):
+            pasted = enc.BitBuffer.from_string(QApplication.clipboard().text())
+            if len(pasted):
+                self.replace_selection(pasted)
+        elif key in (Qt.Key_Backspace, Qt.Key_Delete):
+            if not self.has_selection():
+                if key == Qt.Key_Backspace and self.cursor > 0:
+                    self.anchor = self.cursor - 1
+                elif key == Qt.Key_Delete and self.cursor < len(self.buffer):
+                    self.anchor = self.cursor + 1
+                else:
+                    return
+            self.replace_selection(None)
+        elif event.text() in ('0', '1'):
+            self.replace_selection(enc.BitBuffer.from_string(event.text()))
+        else:
+            super().keyPressEvent(event)
+
+class HexTableModel(QAbstractTableModel):
+    # Read-only hex dump of a byte buffer, 16 bytes per row plus offset and ASCII columns.
+    # Cells are formatted on request, so only the rows the view shows cost anything.
+    BYTES_PER_ROW = 16
+    HEX = [f"{i:02X}" for i in range(256)]
+    # Printable ASCII maps to itself, everything else to '.'.
+    ASCII = bytes(b if 32 <= b <= 126 else ord('.') for b in range(256))
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.data_bytes = b""
+        self.headers = ["Offset"] + [f"{i:02X}" for i in range(self.BYTES_PER_ROW)] + ["ASCII"]
+        self.offset_brush = QColor("#333333")
+
+    def set_bytes(self, data_bytes):
+        self.beginResetModel()
+        self.data_bytes = bytes(data_bytes)
+        self.endResetModel()
+
+    def rowCount(self, parent=None):
+        return (len(self.data_bytes) + self.BYTES_PER_ROW - 1) // self.BYTES_PER_ROW
 
-    def highlightBlock(self, text):
-        for i in range(8, len(text), 16):
-            length = min(8, len(text) - i)
-            self.setFormat(i, length, self.highlight_format)
+    def columnCount(self, parent=None):
+        return self.BYTES_PER_ROW + 2
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return QVariant()
+        row, col = index.row(), index.column()
+        start = row * self.BYTES_PER_ROW
+        
+        if role == Qt.DisplayRole:
+            if col == 0:
+                return f"{start:08X}"
+            if col == self.BYTES_PER_ROW + 1:
+                return self.data_bytes[start:start + self.BYTES_PER_ROW].translate(self.ASCII).decode('ascii')
+            idx = start + col - 1
+            return self.HEX[self.data_bytes[idx]] if idx < len(self.data_bytes) else ""
+        if role == Qt.BackgroundRole and col == 0:
+            return self.offset_brush
+        return QVariant()
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.headers[section]
+        return QVariant()
+
+class PacketTableModel(QAbstractTableModel):
+    # Read-only packet list over the framed packet matrix. Data is shown as hex of the
+    # first HEX_BYTES bytes and formatted on request like the hex viewer.
+    HEX_BYTES = 48
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.headers = ["#", "Start", "Bits", "Pol", "Data (Hex)"]
+        self.set_packets(np.zeros((0, 0), dtype=np.uint8), np.zeros(0, dtype=np.int64),
+                         np.zeros(0, dtype=np.int64), np.zeros(0, dtype=bool))
+
+    def set_packets(self, matrix, lengths, starts, inverted):
+        self.beginResetModel()
+        self.matrix = matrix
+        self.lengths = lengths
+        self.starts = starts
+        self.inverted = inverted
+        self.endResetModel()
+
+    def rowCount(self, parent=None):
+        return len(self.lengths)
+
+    def columnCount(self, parent=None):
+        return len(self.headers)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or role != Qt.DisplayRole:
+            return QVariant()
+        row, col = index.row(), index.column()
+        if col == 0:
+            return str(row)
+        if col == 1:
+            return f"{int(self.starts[row]):,}"
+        if col == 2:
+            return str(int(self.lengths[row]))
+        if col == 3:
+            return "inv" if self.inverted[row] else ""
+        size = (int(self.lengths[row]) + 7) // 8
+        text = self.matrix[row, :min(size, self.HEX_BYTES)].tobytes().hex().upper()
+        return text + " ..." if size > self.HEX_BYTES else text
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.headers[section]
+        return QVariant()
 
 class InspectorTab(BaseSignalTab):
     def __init__(self, context):
@@ -122,9 +412,23 @@ class InspectorTab(BaseSignalTab):
         self.active_mapping_mode = 'absolute'
         self.active_mapping_dict = {}
         
+        # The packed bit buffer is the workbench model. The bit view renders it and
+        # applies typed edits to it directly.
+        self.bit_buffer = enc.BitBuffer()
+        
         self.is_syncing = False
-        self.stashed_bits = "" 
+        self.stashed_bits = None
         
+        # Cached (positions, errors, inverted) of the last pattern search.
+        self.pattern_hits = None
+        
+        # Packet analyses (checksums, descramblers) run off the GUI thread.
+        self.running_tasks = []
+        self.packet_task = None
+        self.descramblers = []
+        self.chain_task = None
+        
+        # Hex refresh after typed edits is debounced.
         self.hex_timer = QTimer()
         self.hex_timer.setSingleShot(True)
         self.hex_timer.setInterval(500)
@@ -158,15 +462,11 @@ class InspectorTab(BaseSignalTab):
         self.grp_bits_layout = QVBoxLayout()
         self.grp_bits.setLayout(self.grp_bits_layout)
         
-        self.txt_bits = QPlainTextEdit()
-        self.txt_bits.setFont(QFont("Monospace", 10))
-        self.txt_bits.setStyleSheet("background-color: #1e1e1e; color: #00FF00;")
+        self.bit_view = BitView()
+        self.bit_view.edited.connect(self.on_bits_edited)
+        self.bit_view.cursorMoved.connect(self.sync_highlight_to_hex)
+        self.grp_bits_layout.addWidget(self.bit_view)
         
-        self.txt_bits.textChanged.connect(self.hex_timer.start)
-        self.txt_bits.cursorPositionChanged.connect(self.sync_highlight_to_hex)
-        self.grp_bits_layout.addWidget(self.txt_bits)
-        
-        self.highlighter = ByteHighlighter(self.txt_bits.document())
         self.splitter.addWidget(self.grp_bits)
         
         # Hex View
@@ -174,21 +474,43 @@ class InspectorTab(BaseSignalTab):
         self.grp_hex_layout = QVBoxLayout()
         self.grp_hex.setLayout(self.grp_hex_layout)
         
-        self.table_hex = QTableWidget()
-        self.table_hex.setColumnCount(18) 
-        headers = ["Offset"] + [f"{i:02X}" for i in range(16)] + ["ASCII"]
-        self.table_hex.setHorizontalHeaderLabels(headers)
+        self.hex_model = HexTableModel(self)
+        self.table_hex = QTableView()
+        self.table_hex.setModel(self.hex_model)
         self.table_hex.verticalHeader().setVisible(False)
         self.table_hex.setEditTriggers(QAbstractItemView.NoEditTriggers)
         self.table_hex.setSelectionMode(QAbstractItemView.SingleSelection)
-        self.table_hex.cellClicked.connect(self.sync_highlight_to_bits)
+        self.table_hex.clicked.connect(lambda index: self.sync_highlight_to_bits(index.row(), index.column()))
         
+        # Fixed row heights and sampled column sizing keep layout independent of the row count.
+        self.table_hex.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.table_hex.horizontalHeader().setResizeContentsPrecision(64)
         self.table_hex.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
         self.table_hex.horizontalHeader().setSectionResizeMode(17, QHeaderView.Stretch)
         
         self.grp_hex_layout.addWidget(self.table_hex)
         self.splitter.addWidget(self.grp_hex)
         
+        # Packet Table
+        self.grp_packets = QGroupBox("Framed Packets")
+        self.grp_packets_layout = QVBoxLayout()
+        self.grp_packets.setLayout(self.grp_packets_layout)
+        
+        self.packet_model = PacketTableModel(self)
+        self.table_packets = QTableView()
+        self.table_packets.setModel(self.packet_model)
+        self.table_packets.verticalHeader().setVisible(False)
+        self.table_packets.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.table_packets.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table_packets.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table_packets.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.table_packets.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        self.table_packets.horizontalHeader().setStretchLastSection(True)
+        self.table_packets.clicked.connect(lambda index: self.select_packet(index.row()))
+        
+        self.grp_packets_layout.addWidget(self.table_packets)
+        self.splitter.addWidget(self.grp_packets)
+        
         # RIGHT: Controls
         self.sidebar = QGroupBox("Analysis Controls")
         self.sidebar.setMinimumWidth(250)
@@ -257,7 +579,8 @@ class InspectorTab(BaseSignalTab):
         self.logic_layout.addSpacing(10)
         self.logic_layout.addWidget(QLabel("Line Encoding:"))
         self.cb_encoding = QComboBox()
-        self.cb_encoding.addItems(["Manchester (IEEE)", "Manchester (Thomas)"])
+        self.cb_encoding.addItems(enc.LINE_CODES)
+        self.cb_encoding.setToolTip("Both bit pair alignments are tried and the one with fewer violations is kept.")
         self.logic_layout.addWidget(self.cb_encoding)
         
         self.btn_decode_line = QPushButton("Apply Line Decoding")
@@ -267,6 +590,33 @@ class InspectorTab(BaseSignalTab):
         self.sidebar_layout.addWidget(self.grp_logic)
         self.sidebar_layout.addSpacing(10)
         
+        # Decoding Chain Search
+        self.grp_chains = QGroupBox("Auto Decode")
+        self.chains_layout = QVBoxLayout()
+        self.grp_chains.setLayout(self.chains_layout)
+        
+        self.lbl_chains_help = QLabel("Tries every mapping, invert and line code combination. "
+                                      "Uses the search pattern as the sync word when set.")
+        self.lbl_chains_help.setWordWrap(True)
+        self.lbl_chains_help.setStyleSheet("color: #757575; font-size: 11px;")
+        self.chains_layout.addWidget(self.lbl_chains_help)
+        
+        self.btn_chains = QPushButton("Search Decoding Chains")
+        self.btn_chains.clicked.connect(self.search_decoding_chains)
+        self.chains_layout.addWidget(self.btn_chains)
+        
+        self.list_chains = QListWidget()
+        self.list_chains.setMaximumHeight(150)
+        self.list_chains.itemDoubleClicked.connect(lambda item: self.apply_decoding_chain())
+        self.chains_layout.addWidget(self.list_chains)
+        
+        self.btn_apply_chain = QPushButton("Apply Chain")
+        self.btn_apply_chain.clicked.connect(self.apply_decoding_chain)
+        self.chains_layout.addWidget(self.btn_apply_chain)
+        
+        self.sidebar_layout.addWidget(self.grp_chains)
+        self.sidebar_layout.addSpacing(10)
+        
         # Pattern Search
         self.grp_pattern = QGroupBox("Pattern Search & Align")
         self.pat_layout = QVBoxLayout()
@@ -284,18 +634,206 @@ class InspectorTab(BaseSignalTab):
         self.txt_search.setPlaceholderText("Enter Pattern...")
         self.pat_layout.addWidget(self.txt_search)
         
+        row_err = QHBoxLayout()
+        row_err.addWidget(QLabel("Max Bit Errors:"))
+        self.spin_max_errors = QSpinBox()
+        self.spin_max_errors.setRange(0, 32)
+        row_err.addWidget(self.spin_max_errors)
+        self.pat_layout.addLayout(row_err)
+        
+        row_variants = QHBoxLayout()
+        self.chk_search_inverted = QCheckBox("Inverted")
+        self.chk_search_inverted.setChecked(True)
+        self.chk_search_inverted.setToolTip("Also match the bit-inverted pattern.")
+        self.chk_search_diff = QCheckBox("Differential")
+        self.chk_search_diff.setToolTip("Match bit transitions (NRZ-I), independent of polarity.")
+        row_variants.addWidget(self.chk_search_inverted)
+        row_variants.addWidget(self.chk_search_diff)
+        self.pat_layout.addLayout(row_variants)
+        
+        # Any change to the search invalidates the cached hit list.
+        self.rb_hex.toggled.connect(self.clear_pattern_hits)
+        self.txt_search.textChanged.connect(self.clear_pattern_hits)
+        self.spin_max_errors.valueChanged.connect(self.clear_pattern_hits)
+        self.chk_search_inverted.stateChanged.connect(self.clear_pattern_hits)
+        self.chk_search_diff.stateChanged.connect(self.clear_pattern_hits)
+        
         row_pat = QHBoxLayout()
         self.btn_find = QPushButton("Find Next")
         self.btn_find.clicked.connect(self.find_pattern)
+        self.btn_find_all = QPushButton("Find All")
+        self.btn_find_all.clicked.connect(self.find_all_patterns)
         self.btn_align = QPushButton("Align (Cut Prev)")
         self.btn_align.clicked.connect(self.align_pattern)
         row_pat.addWidget(self.btn_find)
+        row_pat.addWidget(self.btn_find_all)
         row_pat.addWidget(self.btn_align)
         self.pat_layout.addLayout(row_pat)
         
+        self.lbl_hits = QLabel("Hits: --")
+        self.lbl_hits.setStyleSheet("color: #757575; font-size: 11px;")
+        self.pat_layout.addWidget(self.lbl_hits)
+        
+        self.list_hits = QListWidget()
+        self.list_hits.setMaximumHeight(150)
+        self.list_hits.itemClicked.connect(self.select_hit)
+        self.pat_layout.addWidget(self.list_hits)
+        
         self.sidebar_layout.addWidget(self.grp_pattern)
         self.sidebar_layout.addSpacing(10)
         
+        # Packet Framing
+        self.grp_framing = QGroupBox("Packet Framing")
+        self.frame_layout = QVBoxLayout()
+        self.grp_framing.setLayout(self.frame_layout)
+        
+        self.lbl_framing_help = QLabel("Splits the stream at every hit of the search pattern.")
+        self.lbl_framing_help.setWordWrap(True)
+        self.lbl_framing_help.setStyleSheet("color: #757575; font-size: 11px;")
+        self.frame_layout.addWidget(self.lbl_framing_help)
+        
+        self.cb_framing = QComboBox()
+        self.cb_framing.addItems(enc.FRAMING_MODES)
+        self.cb_framing.currentTextChanged.connect(self.update_framing_controls)
+        self.frame_layout.addWidget(self.cb_framing)
+        
+        row_len = QHBoxLayout()
+        row_len.addWidget(QLabel("Length (bits):"))
+        self.spin_frame_len = QSpinBox()
+        self.spin_frame_len.setRange(1, 1 << 20)
+        self.spin_frame_len.setValue(256)
+        self.spin_frame_len.setToolTip("Packet length after the sync word.")
+        row_len.addWidget(self.spin_frame_len)
+        self.frame_layout.addLayout(row_len)
+        
+        row_max = QHBoxLayout()
+        row_max.addWidget(QLabel("Max Length (bits):"))
+        self.spin_frame_max = QSpinBox()
+        self.spin_frame_max.setRange(8, 1 << 20)
+        self.spin_frame_max.setValue(4096)
+        row_max.addWidget(self.spin_frame_max)
+        self.frame_layout.addLayout(row_max)
+        
+        # Length field: position after the sync word, width, bits per count and fixed extra bits.
+        row_field = QHBoxLayout()
+        self.spin_field_offset = QSpinBox()
+        self.spin_field_offset.setRange(0, 4096)
+        self.spin_field_offset.setToolTip("Length field offset after the sync word (bits).")
+        self.spin_field_bits = QSpinBox()
+        self.spin_field_bits.setRange(1, 32)
+        self.spin_field_bits.setValue(8)
+        self.spin_field_bits.setToolTip("Length field width (bits, MSB first).")
+        row_field.addWidget(QLabel("Field @"))
+        row_field.addWidget(self.spin_field_offset)
+        row_field.addWidget(QLabel("W"))
+        row_field.addWidget(self.spin_field_bits)
+        self.frame_layout.addLayout(row_field)
+        
+        row_unit = QHBoxLayout()
+        self.spin_field_unit = QSpinBox()
+        self.spin_field_unit.setRange(1, 64)
+        self.spin_field_unit.setValue(8)
+        self.spin_field_unit.setToolTip("Bits per length count (8 for a byte count).")
+        self.spin_field_adjust = QSpinBox()
+        self.spin_field_adjust.setRange(-4096, 4096)
+        self.spin_field_adjust.setToolTip("Extra bits after the counted payload (e.g. a CRC).")
+        row_unit.addWidget(QLabel("Unit"))
+        row_unit.addWidget(self.spin_field_unit)
+        row_unit.addWidget(QLabel("+"))
+        row_unit.addWidget(self.spin_field_adjust)
+        self.frame_layout.addLayout(row_unit)
+        
+        self.chk_frame_sync = QCheckBox("Include Sync Word")
+        self.chk_frame_sync.setChecked(True)
+        self.frame_layout.addWidget(self.chk_frame_sync)
+        
+        self.btn_frame = QPushButton("Frame Packets")
+        self.btn_frame.clicked.connect(self.frame_packets)
+        self.frame_layout.addWidget(self.btn_frame)
+        
+        self.lbl_packets = QLabel("Packets: --")
+        self.lbl_packets.setStyleSheet("color: #757575; font-size: 11px;")
+        self.frame_layout.addWidget(self.lbl_packets)
+        
+        self.sidebar_layout.addWidget(self.grp_framing)
+        self.sidebar_layout.addSpacing(10)
+        self.update_framing_controls()
+        
+        # Checksum Analysis
+        self.grp_checksum = QGroupBox("Checksum Analysis")
+        self.checksum_layout = QVBoxLayout()
+        self.grp_checksum.setLayout(self.checksum_layout)
+        
+        row_crc = QHBoxLayout()
+        row_crc.addWidget(QLabel("CRC Width:"))
+        self.cb_crc_width = QComboBox()
+        self.cb_crc_width.addItems(["All"] + [str(w) for w in enc.CRC_WIDTHS])
+        row_crc.addWidget(self.cb_crc_width)
+        self.checksum_layout.addLayout(row_crc)
+        
+        row_skip = QHBoxLayout()
+        row_skip.addWidget(QLabel("Skip Bytes:"))
+        self.spin_crc_skip = QSpinBox()
+        self.spin_crc_skip.setRange(0, 256)
+        self.spin_crc_skip.setToolTip("Leading packet bytes not covered by the checksum (e.g. the sync word).")
+        row_skip.addWidget(self.spin_crc_skip)
+        self.checksum_layout.addLayout(row_skip)
+        
+        self.btn_crc = QPushButton("Search CRC")
+        self.btn_crc.setToolTip("Finds CRC parameters matching the last bytes of each framed packet.")
+        self.btn_crc.clicked.connect(self.search_crc)
+        self.checksum_layout.addWidget(self.btn_crc)
+        
+        self.btn_sums = QPushButton("Search Simple Checksums")
+        self.btn_sums.setToolTip("Tests sums, XORs, one's complement and Fletcher checks at every field position and byte range.")
+        self.btn_sums.clicked.connect(self.search_simple_checksums)
+        self.checksum_layout.addWidget(self.btn_sums)
+        
+        self.sidebar_layout.addWidget(self.grp_checksum)
+        self.sidebar_layout.addSpacing(10)
+        
+        # Descrambler
+        self.grp_descramble = QGroupBox("Descrambler / Whitening")
+        self.descramble_layout = QVBoxLayout()
+        self.grp_descramble.setLayout(self.descramble_layout)
+        
+        row_dskip = QHBoxLayout()
+        row_dskip.addWidget(QLabel("Skip Bits:"))
+        self.spin_descramble_skip = QSpinBox()
+        self.spin_descramble_skip.setRange(0, 4096)
+        self.spin_descramble_skip.setToolTip("Leading packet bits that are not whitened (e.g. the sync word).")
+        row_dskip.addWidget(self.spin_descramble_skip)
+        self.descramble_layout.addLayout(row_dskip)
+        
+        self.txt_known = QLineEdit()
+        self.txt_known.setPlaceholderText("Known Plaintext (Hex, Optional)")
+        self.txt_known.setToolTip("Bytes known to be in every packet, e.g. zero padding. Solved with Berlekamp-Massey.")
+        self.descramble_layout.addWidget(self.txt_known)
+        
+        row_known = QHBoxLayout()
+        row_known.addWidget(QLabel("At Byte:"))
+        self.spin_known_offset = QSpinBox()
+        self.spin_known_offset.setRange(0, 4096)
+        self.spin_known_offset.setToolTip("Offset of the known plaintext, in bytes after the skipped bits.")
+        row_known.addWidget(self.spin_known_offset)
+        self.descramble_layout.addLayout(row_known)
+        
+        self.btn_descramble = QPushButton("Search Descrambler")
+        self.btn_descramble.clicked.connect(self.search_descrambler)
+        self.descramble_layout.addWidget(self.btn_descramble)
+        
+        self.list_descramblers = QListWidget()
+        self.list_descramblers.setMaximumHeight(120)
+        self.list_descramblers.itemDoubleClicked.connect(lambda item: self.apply_descrambler())
+        self.descramble_layout.addWidget(self.list_descramblers)
+        
+        self.btn_apply_descrambler = QPushButton("Apply to Packets")
+        self.btn_apply_descrambler.clicked.connect(self.apply_descrambler)
+        self.descramble_layout.addWidget(self.btn_apply_descrambler)
+        
+        self.sidebar_layout.addWidget(self.grp_descramble)
+        self.sidebar_layout.addSpacing(10)
+        
         # Export
         self.sidebar_layout.addWidget(QLabel("<b>Export:</b>"))
         self.btn_save_bin = QPushButton("Save .BIN (Raw Bytes)")
@@ -355,120 +893,157 @@ class InspectorTab(BaseSignalTab):
             return
             
         if self.active_mapping_mode == 'absolute':
-            bit_str = enc.map_symbols_to_bits(self.local_symbols, self.active_mapping_dict)
+            buffer = enc.map_symbols_to_bits(self.local_symbols, self.active_mapping_dict)
             
         elif self.active_mapping_mode == 'differential':
             diff_syms = enc.decode_differential(self.local_symbols, self.modulus)
-            bit_str = enc.map_symbols_to_bits(diff_syms, self.active_mapping_dict)
+            buffer = enc.map_symbols_to_bits(diff_syms, self.active_mapping_dict)
             
-        self.txt_bits.blockSignals(True)
-        self.txt_bits.setPlainText(bit_str)
-        self.txt_bits.blockSignals(False)
-        self.update_hex_view()
+        self.set_bit_buffer(buffer)
         
         self.lbl_input_status.setVisible(True)
-        self.lbl_input_status.setText("Workbench populated with mapped bits.")
+        erased = buffer.erasure_count()
+        if erased:
+            self.lbl_input_status.setText(f"Workbench populated with {len(buffer):,} bits ({erased:,} unmapped).")
+        else:
+            self.lbl_input_status.setText(f"Workbench populated with {len(buffer):,} mapped bits.")
         self.lbl_input_status.setStyleSheet("color: #1565C0;")
 
+    def set_bit_buffer(self, buffer):
+        # Replaces the workbench model and refreshes the bit and hex views from it.
+        self.bit_buffer = buffer
+        self.hex_timer.stop()
+        self.bit_view.set_buffer(buffer)
+        self.update_hex_view()
+        self.clear_pattern_hits()
+
+    def on_bits_edited(self):
+        self.bit_buffer = self.bit_view.buffer
+        self.hex_timer.start()
+        self.clear_pattern_hits()
+
     def update_view_settings(self):
         size = self.spin_font.value()
         is_light = self.chk_light_mode.isChecked()
         
-        font = QFont("Monospace", size)
-        self.txt_bits.setFont(font)
-        
-        if is_light:
-            self.txt_bits.setStyleSheet("background-color: #FFFFFF; color: #000000;")
-        else:
-            self.txt_bits.setStyleSheet("background-color: #1e1e1e; color: #00FF00;")
-            
-        self.highlighter.set_mode(is_light)
+        self.bit_view.setFont(QFont("Monospace", size))
+        self.bit_view.set_light_mode(is_light)
 
     def stash_state(self):
-        self.stashed_bits = self.txt_bits.toPlainText()
+        self.stashed_bits = self.bit_buffer.copy()
         self.btn_restore.setEnabled(True)
         self.lbl_input_status.setVisible(True)
         self.lbl_input_status.setText("Workbench state saved.")
         self.lbl_input_status.setStyleSheet("color: #2E7D32; font-weight: bold;")
 
     def restore_state(self):
-        if self.stashed_bits or self.stashed_bits == "":
-            self.txt_bits.setPlainText(self.stashed_bits)
+        if self.stashed_bits is not None:
+            self.set_bit_buffer(self.stashed_bits.copy())
             self.lbl_input_status.setVisible(True)
             self.lbl_input_status.setText("Workbench state restored.")
             self.lbl_input_status.setStyleSheet("color: #1565C0; font-weight: bold;")
 
     def action_invert(self):
-        text = self.txt_bits.toPlainText()
-        if not text: return
-        self.txt_bits.setPlainText(enc.invert_bit_string(text))
+        buffer = self.bit_buffer
+        if len(buffer) == 0: return
+        self.set_bit_buffer(buffer.invert())
 
     def action_line_decode(self):
-        text = self.txt_bits.toPlainText()
-        if not text: return
+        buffer = self.bit_buffer
+        if len(buffer) == 0: return
+        
+        scheme = self.cb_encoding.currentText()
+        bits, violations, phase = enc.decode_line_code(buffer, scheme)
         
-        enc_mode = self.cb_encoding.currentText()
-        scheme = 'IEEE' if 'IEEE' in enc_mode else 'Thomas'
+        # Violations are shown as "E" in the workbench.
+        count = enc.count_bits(violations)
+        if count:
+            bits.erasures = violations
+        self.set_bit_buffer(bits)
         
-        decoded_text = enc.decode_manchester_string(text, scheme)
-        self.txt_bits.setPlainText(decoded_text)
+        self.lbl_input_status.setVisible(True)
+        self.lbl_input_status.setText(f"{scheme}: {len(bits):,} bits, pair offset {phase}, {count:,} violations.")
+        self.lbl_input_status.setStyleSheet("color: #1565C0;")
+
+    def search_decoding_chains(self):
+        # Ranks every decoding chain on the loaded symbols in a background task.
+        if self.local_symbols is None or self.chain_task is not None: return
+        sync = None
+        if self.txt_search.text().strip():
+            sync = self.parse_search_pattern()
+            if sync is None: return
+        
+        task = BackgroundTask(enc.search_decoding_chains, self.local_symbols, self.modulus, sync, 
+                              self.spin_max_errors.value())
+        task.result_ready.connect(lambda results: self.on_chains_finished(task, results))
+        task.failed.connect(lambda msg: self.on_chains_failed(task, msg))
+        task.finished.connect(lambda: self.running_tasks.remove(task))
+        self.running_tasks.append(task)
+        self.chain_task = task
+        
+        self.btn_chains.setEnabled(False)
+        self.btn_chains.setText("Searching...")
+        task.start()
+
+    def on_chains_finished(self, task, results):
+        if task is not self.chain_task: return
+        self.chain_task = None
+        self.btn_chains.setEnabled(True)
+        self.btn_chains.setText("Search Decoding Chains")
+        
+        self.list_chains.clear()
+        for chain, hits, rate, entropy in results:
+            text = f"{enc.describe_chain(chain)}  |  {hits} hits, {rate:.1%} viol, {entropy:.2f} bits/byte"
+            item = QListWidgetItem(text)
+            item.setData(Qt.UserRole, chain)
+            self.list_chains.addItem(item)
+        if results:
+            self.list_chains.setCurrentRow(0)
+
+    def on_chains_failed(self, task, msg):
+        if task is not self.chain_task: return
+        self.chain_task = None
+        self.btn_chains.setEnabled(True)
+        self.btn_chains.setText("Search Decoding Chains")
+        QMessageBox.critical(self, "Auto Decode", msg)
+
+    def apply_decoding_chain(self):
+        # Loads the selected chain's output into the workbench and adopts its mapping.
+        item = self.list_chains.currentItem()
+        if item is None or self.local_symbols is None: return
+        chain = item.data(Qt.UserRole)
+        differential, preset, _, code, _ = chain
+        
+        self.active_mapping_mode = 'differential' if differential else 'absolute'
+        self.active_mapping_dict = enc.generate_mapping_dict(self.modulus, preset)
+        self.lbl_map_status.setText(f"Mode: {self.active_mapping_mode.capitalize()} ({preset.capitalize()} Preset)")
+        
+        bits, violations = enc.apply_decoding_chain(self.local_symbols, self.modulus, chain)
+        count = enc.count_bits(violations) if violations is not None else 0
+        if count:
+            bits.erasures = violations
+        self.set_bit_buffer(bits)
+        
+        self.lbl_input_status.setVisible(True)
+        self.lbl_input_status.setText(f"{enc.describe_chain(chain)}: {len(bits):,} bits, {count:,} violations.")
+        self.lbl_input_status.setStyleSheet("color: #1565C0;")
 
     def update_hex_view(self):
         if not hasattr(self, 'table_hex'): return
 
-        bits = self.txt_bits.toPlainText().replace("\n", "").replace(" ", "")
-        padding = (8 - len(bits) % 8) % 8
-        bits_padded = bits + "0" * padding
-        
-        byte_data = []
-        for i in range(0, len(bits_padded), 8):
-            byte_str = bits_padded[i:i+8]
-            try:
-                byte_data.append(int(byte_str, 2))
-            except:
-                pass 
-        
-        self.table_hex.setUpdatesEnabled(False)
-        self.table_hex.blockSignals(True)
-        self.table_hex.clearContents()
-        self.table_hex.setRowCount(0)
-        self.table_hex.setRowCount((len(byte_data) + 15) // 16)
-        
-        for row in range(self.table_hex.rowCount()):
-            offset_item = QTableWidgetItem(f"{row*16:08X}")
-            offset_item.setBackground(QColor("#333333"))
-            self.table_hex.setItem(row, 0, offset_item)
-            
-            ascii_str = ""
-            for col in range(16):
-                idx = row * 16 + col
-                if idx < len(byte_data):
-                    val = byte_data[idx]
-                    self.table_hex.setItem(row, col + 1, QTableWidgetItem(f"{val:02X}"))
-                    if 32 <= val <= 126: ascii_str += chr(val)
-                    else: ascii_str += "."
-                else:
-                    self.table_hex.setItem(row, col + 1, QTableWidgetItem(""))
-            
-            self.table_hex.setItem(row, 17, QTableWidgetItem(ascii_str))
-            
-        self.table_hex.blockSignals(False)
-        self.table_hex.setUpdatesEnabled(True)
+        self.hex_model.set_bytes(self.bit_buffer.tobytes())
 
-    def sync_highlight_to_hex(self):
+    def sync_highlight_to_hex(self, pos):
         if self.is_syncing: return
         self.is_syncing = True
         
-        cursor = self.txt_bits.textCursor()
-        pos = cursor.position()
-        
         byte_idx = pos // 8
         row = byte_idx // 16
         col = (byte_idx % 16) + 1 
         
-        if row < self.table_hex.rowCount():
+        if row < self.hex_model.rowCount():
             self.table_hex.blockSignals(True)
-            self.table_hex.setCurrentCell(row, col)
+            self.table_hex.setCurrentIndex(self.hex_model.index(row, col))
             self.table_hex.blockSignals(False)
             
         self.is_syncing = False
@@ -483,23 +1058,17 @@ class InspectorTab(BaseSignalTab):
         bit_start = byte_idx * 8
         bit_end = bit_start + 8
         
-        cursor = self.txt_bits.textCursor()
-        cursor.setPosition(bit_end)
-        cursor.setPosition(bit_start, QTextCursor.KeepAnchor)
-        
-        self.txt_bits.blockSignals(True) 
-        self.txt_bits.setTextCursor(cursor)
-        self.txt_bits.setFocus()
-        self.txt_bits.blockSignals(False)
+        self.bit_view.set_selection(bit_start, bit_end)
+        self.bit_view.setFocus()
         
         self.is_syncing = False
 
-    def find_pattern(self):
+    def parse_search_pattern(self):
+        # Returns the search box contents as a BitBuffer, or None after warning the user.
         pattern = self.txt_search.text().replace(" ", "")
-        if not pattern: return
+        if not pattern: return None
         
         is_hex = self.rb_hex.isChecked()
-        text = self.txt_bits.toPlainText()
         
         if is_hex:
             try:
@@ -510,52 +1079,278 @@ class InspectorTab(BaseSignalTab):
                 pattern = bin_pattern
             except:
                 QMessageBox.warning(self, "Error", "Invalid Hex Pattern")
-                return
+                return None
+        elif pattern.strip('01'):
+            QMessageBox.warning(self, "Error", "Invalid Binary Pattern")
+            return None
+            
+        return enc.BitBuffer.from_string(pattern)
+
+    def run_pattern_search(self):
+        # Correlates the pattern over the whole workbench with the current error budget.
+        # Returns the cached (positions, errors, inverted, length) or None.
+        if self.pattern_hits is None:
+            pattern = self.parse_search_pattern()
+            if pattern is None: return None
+            positions, errors, inverted = enc.find_pattern_hits(
+                self.bit_buffer, pattern, 
+                max_errors=self.spin_max_errors.value(),
+                include_inverted=self.chk_search_inverted.isChecked(),
+                differential=self.chk_search_diff.isChecked()
+            )
+            self.pattern_hits = (positions, errors, inverted, len(pattern))
+        return self.pattern_hits
 
-        cursor = self.txt_bits.textCursor()
-        curr_pos = max(cursor.position(), cursor.anchor()) if cursor.hasSelection() else cursor.position()
-        idx = text.find(pattern, curr_pos)
+    def clear_pattern_hits(self):
+        self.pattern_hits = None
+        self.list_hits.clear()
+        self.lbl_hits.setText("Hits: --")
+
+    def find_pattern(self):
+        hits = self.run_pattern_search()
+        if hits is None: return
+        positions, _, _, length = hits
         
-        if idx == -1: idx = text.find(pattern, 0)
+        start, stop = self.bit_view.selection()
+        curr_pos = start + 1 if stop > start else self.bit_view.cursor
+        k = np.searchsorted(positions, curr_pos)
+        
+        if k == len(positions): k = 0
             
-        if idx != -1:
-            cursor.setPosition(idx + len(pattern))
-            cursor.setPosition(idx, QTextCursor.KeepAnchor)
-            self.txt_bits.setTextCursor(cursor)
-            self.txt_bits.setFocus()
+        if len(positions):
+            self.bit_view.set_selection(int(positions[k]), int(positions[k]) + length)
+            self.bit_view.setFocus()
         else:
             QMessageBox.information(self, "Search", "Pattern not found.")
 
+    def find_all_patterns(self):
+        # Lists every hit (position, bit errors, polarity) for the current search.
+        self.list_hits.clear()
+        hits = self.run_pattern_search()
+        if hits is None: return
+        positions, errors, inverted, _ = hits
+        
+        exact = int(np.count_nonzero(errors == 0))
+        self.lbl_hits.setText(f"Hits: {len(positions):,} ({exact:,} exact, {int(inverted.sum()):,} inverted)")
+        
+        # Listing is capped, the hit array itself is complete.
+        shown = min(len(positions), 5000)
+        for pos, err, inv in zip(positions[:shown].tolist(), errors[:shown].tolist(), inverted[:shown].tolist()):
+            item = QListWidgetItem(f"bit {pos:,}  |  {err} err{'  |  inverted' if inv else ''}")
+            item.setData(Qt.UserRole, pos)
+            self.list_hits.addItem(item)
+        if shown < len(positions):
+            self.list_hits.addItem(f"... {len(positions) - shown:,} more")
+
+    def select_hit(self, item):
+        pos = item.data(Qt.UserRole)
+        if pos is None or self.pattern_hits is None: return
+        self.bit_view.set_selection(pos, pos + self.pattern_hits[3])
+        self.bit_view.setFocus()
+
     def align_pattern(self):
-        cursor = self.txt_bits.textCursor()
-        if not cursor.hasSelection():
+        if not self.bit_view.has_selection():
             self.find_pattern()
-            cursor = self.txt_bits.textCursor()
             
-        if cursor.hasSelection():
-            start = cursor.selectionStart()
+        if self.bit_view.has_selection():
+            start, _ = self.bit_view.selection()
             if start > 0:
-                full_text = self.txt_bits.toPlainText()
-                new_text = full_text[start:]
-                self.txt_bits.setPlainText(new_text)
+                self.set_bit_buffer(self.bit_buffer.slice(start))
+
+    def update_framing_controls(self):
+        mode = self.cb_framing.currentText()
+        self.spin_frame_len.setEnabled(mode == 'Fixed Length')
+        for spin in (self.spin_field_offset, self.spin_field_bits, self.spin_field_unit, self.spin_field_adjust):
+            spin.setEnabled(mode == 'Length Field')
+
+    def frame_packets(self):
+        # Frames the workbench at every search hit and publishes the packets to the context.
+        hits = self.run_pattern_search()
+        if hits is None:
+            QMessageBox.warning(self, "Framing", "Enter a sync word in the search box first.")
+            return
+        positions, _, inverted, sync_len = hits
+        
+        matrix, lengths, starts = enc.frame_packets(
+            self.bit_buffer, positions, sync_len,
+            mode=self.cb_framing.currentText(),
+            length_bits=self.spin_frame_len.value(),
+            inverted=inverted,
+            include_sync=self.chk_frame_sync.isChecked(),
+            field_offset=self.spin_field_offset.value(),
+            field_bits=self.spin_field_bits.value(),
+            unit_bits=self.spin_field_unit.value(),
+            adjust_bits=self.spin_field_adjust.value(),
+            max_bits=self.spin_frame_max.value()
+        )
+        # Polarity of each kept packet, looked up from the hit it starts at.
+        head = 0 if self.chk_frame_sync.isChecked() else sync_len
+        polarity = inverted[np.searchsorted(positions, starts - head)] if len(starts) else np.zeros(0, dtype=bool)
+        
+        self.publish_packets(matrix, lengths, starts, polarity)
+        self.descramblers = []
+        self.list_descramblers.clear()
+        
+        if len(lengths):
+            self.lbl_packets.setText(f"Packets: {len(lengths):,} ({int(lengths.min())}-{int(lengths.max())} bits)")
+        else:
+            self.lbl_packets.setText("Packets: 0")
+
+    def publish_packets(self, matrix, lengths, starts, polarity):
+        # Stores framed packets in the context and shows them in the packet table.
+        self.context.packet_matrix = matrix
+        self.context.packet_lengths = lengths
+        self.context.packet_starts = starts
+        self.packet_model.set_packets(matrix, lengths, starts, polarity)
+
+    def select_packet(self, row):
+        if row >= len(self.packet_model.lengths): return
+        start = int(self.packet_model.starts[row])
+        stop = min(start + int(self.packet_model.lengths[row]), len(self.bit_buffer))
+        if start < stop:
+            self.bit_view.set_selection(start, stop)
+            self.bit_view.setFocus()
+
+    def start_packet_task(self, group, on_result, func, *args):
+        # Runs an analysis of the framed packets in a background task, one at a time.
+        # The group is disabled while it runs and on_result receives the return value.
+        if self.packet_task is not None: return
+        lengths = self.context.packet_lengths
+        if lengths is None or len(lengths) < 2:
+            QMessageBox.warning(self, "Packets", "Frame at least two packets first.")
+            return
+        
+        task = BackgroundTask(func, self.context.packet_matrix, lengths, *args)
+        task.result_ready.connect(lambda results: self.on_packet_task_finished(task, group, on_result, results))
+        task.failed.connect(lambda msg: self.on_packet_task_failed(task, group, msg))
+        task.finished.connect(lambda: self.running_tasks.remove(task))
+        self.running_tasks.append(task)
+        self.packet_task = task
+        
+        group.setEnabled(False)
+        group.setTitle(group.title() + " (Searching...)")
+        task.start()
+
+    def on_packet_task_finished(self, task, group, on_result, results):
+        if task is not self.packet_task: return
+        self.on_packet_task_done(group)
+        on_result(results)
+
+    def on_packet_task_failed(self, task, group, msg):
+        if task is not self.packet_task: return
+        self.on_packet_task_done(group)
+        QMessageBox.critical(self, "Packets", msg)
+
+    def on_packet_task_done(self, group):
+        self.packet_task = None
+        group.setEnabled(True)
+        group.setTitle(group.title().replace(" (Searching...)", ""))
+
+    def search_crc(self):
+        text = self.cb_crc_width.currentText()
+        widths = enc.CRC_WIDTHS if text == "All" else (int(text),)
+        self.start_packet_task(self.grp_checksum, self.show_crc_results, self.compute_crc_search, 
+                               widths, self.spin_crc_skip.value())
+
+    @staticmethod
+    def compute_crc_search(matrix, lengths, widths, skip_bytes):
+        # Returns (width, result) pairs over all widths, best first.
+        results = [(w, r) for w in widths for r in enc.search_crc(matrix, lengths, w, skip_bytes=skip_bytes)]
+        results.sort(key=lambda item: -item[1][0] / item[1][1])
+        return results
+
+    def show_crc_results(self, results):
+        if not results:
+            QMessageBox.information(self, "Checksum", "No CRC matched the packets.")
+            return
+        
+        lines = []
+        for width, (matches, total, poly, init, refin, refout, xorout, little) in results[:10]:
+            digits = width // 4
+            order = "little" if little and width > 8 else "big"
+            lines.append(f"CRC-{width}: poly 0x{poly:0{digits}X}, init 0x{init:0{digits}X}, "
+                         f"refin {refin}, refout {refout}, xorout 0x{xorout:0{digits}X}, "
+                         f"{order}-endian field  ({matches}/{total} packets)")
+        if len(np.unique(self.context.packet_lengths // 8)) == 1:
+            lines.append("\nAll packets have the same length, so init and xorout are not unique.")
+        QMessageBox.information(self, "Checksum", "\n".join(lines))
+
+    def search_simple_checksums(self):
+        self.start_packet_task(self.grp_checksum, self.show_checksum_results, enc.search_checksums)
+
+    def show_checksum_results(self, results):
+        if not results:
+            QMessageBox.information(self, "Checksum", "No simple checksum matched the packets.")
+            return
+        
+        lines = []
+        for matches, total, kind, start, stop, field, little in results[:10]:
+            order = ", little-endian" if little else ""
+            lines.append(f"{kind} of bytes {start}-{stop - 1} at byte {field}{order}  ({matches}/{total} packets)")
+        if len(results) > 10:
+            lines.append(f"... {len(results) - 10} more")
+        lines.append("\nByte offsets are from the packet start; only packets of the most common length are tested.")
+        QMessageBox.information(self, "Checksum", "\n".join(lines))
+
+    def search_descrambler(self):
+        known = None
+        text = self.txt_known.text().replace(" ", "")
+        if text:
+            try:
+                known = np.unpackbits(np.frombuffer(bytes.fromhex(text), dtype=np.uint8))
+            except ValueError:
+                QMessageBox.warning(self, "Error", "Invalid Hex Plaintext")
+                return
+        self.start_packet_task(self.grp_descramble, self.show_descramblers, enc.search_descramblers,
+                               self.spin_descramble_skip.value(), known, 8 * self.spin_known_offset.value())
+
+    def show_descramblers(self, results):
+        baseline, candidates = results
+        self.descramblers = candidates
+        self.list_descramblers.clear()
+        if not candidates:
+            QMessageBox.information(self, "Descrambler", "No descrambler found.")
+            return
+        
+        self.list_descramblers.addItem(f"As received: {baseline:.2f} bits/byte")
+        for entropy, kind, poly, seed, lsb_first, _ in candidates:
+            text = f"{entropy:.2f} bits/byte  |  {kind} {enc.format_poly(poly)}"
+            if seed is not None:
+                text += f"  seed 0x{seed:X}"
+            if lsb_first:
+                text += "  (LSB first)"
+            item = QListWidgetItem(text)
+            item.setData(Qt.UserRole, len(self.list_descramblers) - 1)
+            self.list_descramblers.addItem(item)
+        self.list_descramblers.setCurrentRow(1)
+
+    def apply_descrambler(self):
+        # Descrambles the framed packets with the selected candidate.
+        item = self.list_descramblers.currentItem()
+        index = item.data(Qt.UserRole) if item is not None else None
+        if index is None or self.context.packet_matrix is None: return
+        
+        _, kind, poly, _, _, keystream = self.descramblers[index]
+        matrix = enc.descramble_packets(self.context.packet_matrix, self.context.packet_lengths, 
+                                        kind, poly, keystream, self.spin_descramble_skip.value())
+        self.publish_packets(matrix, self.context.packet_lengths, self.context.packet_starts, self.packet_model.inverted)
+        self.descramblers = []
+        self.list_descramblers.clear()
+        self.lbl_packets.setText(self.lbl_packets.text() + f", descrambled ({kind} {enc.format_poly(poly)})")
 
     def export_data(self, fmt):
-        data_text = self.txt_bits.toPlainText().replace("\n", "")
+        buffer = self.bit_buffer
         fname, _ = QFileDialog.getSaveFileName(self, f"Save {fmt.upper()}", f"captured_packet.{fmt}")
         if not fname: return
         
         try:
             if fmt == 'txt':
                 with open(fname, 'w') as f:
-                    f.write(data_text)
+                    f.write(buffer.to_string())
             elif fmt == 'bin':
-                padding = (8 - len(data_text) % 8) % 8
-                bits_padded = data_text + "0" * padding
-                byte_array = bytearray()
-                for i in range(0, len(bits_padded), 8):
-                    byte_array.append(int(bits_padded[i:i+8], 2))
+                # Zero padded to whole bytes; erased bits are written as 0.
                 with open(fname, 'wb') as f:
-                    f.write(byte_array)
+                    f.write(buffer.tobytes())
             QMessageBox.information(self, "Saved", f"File saved to {fname}")
         except Exception as e:
             QMessageBox.critical(self, "Error", str(e))
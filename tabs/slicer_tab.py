@@ -7,27 +7,51 @@ from PyQt5.QtCore import Qt, QTimer
 
 # Import the base class.
 from core.base_tab import BaseSignalTab
+from core.worker import BackgroundTask
 # Import dsp utilities.
 import utils.dsp_lib as dsp
 
 class SlicerTab(BaseSignalTab):
+    # Index 0 is the manually seeded PLL, the rest run without a seed.
+    SYNC_ENGINES = ("PLL (Manual Seed)", "Gardner", "Mueller-Muller")
+    # Symbols folded into the eye diagram per timer tick, and the symbols it spans.
+    EYE_CHUNK = 1 << 18
+    EYE_SPAN = 2.0
+    
     def __init__(self, context):
         super().__init__(context, "Bit Recovery")
         
         # Local state.
         self.centered_analog_data = None
+        self.analog_pyramid = []
+        self.zero_crossings = None
+        self.estimated_rate = 0.0
         self.adjusted_thresholds = []
         self.local_sr = 1.0
         
         self.symbol_buffer = None
+        self.soft_buffer = None
         self.last_symbol_count = 1
         
         # Auto-Sync State
         self.auto_clock_centers = None
         self.auto_clock_edges = None
         
+        # Burst state: detected [start, stop) sample bounds and, once clocked,
+        # the symbol count of each burst.
+        self.bursts = None
+        self.burst_lengths = None
+        self.burst_task = None
+        self.running_tasks = []
+        
+        # Eye diagram state: the clock being folded (in samples), how far the fold has
+        # got, and the running 2-D histogram.
+        self.eye_centers = None
+        self.eye_cursor = 0
+        self.eye_counts = None
+        self.eye_range = (-1.0, 1.0)
+        
         # Visual items.
-        self.tick_lines = []
         self.digital_color_name = 'Orange'
 
         # Timer for debouncing heavy array slicing and tick updates
@@ -35,6 +59,20 @@ class SlicerTab(BaseSignalTab):
         self.update_timer.setSingleShot(True)
         self.update_timer.timeout.connect(self.refresh_plot_data)
         
+        # The eye is rebuilt from scratch once the clock settles, then folded in chunks
+        # so the UI stays responsive on long captures.
+        self.eye_rebuild_timer = QTimer()
+        self.eye_rebuild_timer.setSingleShot(True)
+        self.eye_rebuild_timer.timeout.connect(self.rebuild_eye_diagram)
+        self.eye_timer = QTimer()
+        self.eye_timer.timeout.connect(self.accumulate_eye_chunk)
+        
+        # Re-runs the active auto clock after the loop gain stops changing. The whole
+        # clock moves with the gain, so the eye is then rebuilt rather than updated.
+        self.resync_timer = QTimer()
+        self.resync_timer.setSingleShot(True)
+        self.resync_timer.timeout.connect(self.rerun_auto_clock)
+        
         self.init_ui()
 
     def init_ui(self):
@@ -48,9 +86,9 @@ class SlicerTab(BaseSignalTab):
         self.plot_main.setLabel('bottom', 'Time', units='s')
         self.plot_main.setLabel('left', 'Amplitude') 
         self.plot_main.showGrid(x=True, y=True, alpha=0.3)
-        # Optimization
-        self.plot_main.setClipToView(True)
-        self.plot_main.setDownsampling(auto=True, mode='peak')
+        # Downsampling is handled by our own min/max envelope pyramid.
+        self.plot_main.setClipToView(False)
+        self.plot_main.setDownsampling(auto=False)
         self.plot_main.setMouseEnabled(x=True, y=False)
         self.plot_main.setBackground('#1e1e1e')
         
@@ -61,6 +99,17 @@ class SlicerTab(BaseSignalTab):
         self.zero_line = pg.InfiniteLine(pos=0, angle=0, pen=pg.mkPen('#555555', width=1, style=Qt.DashLine))
         self.plot_main.addItem(self.zero_line)
         
+        # Clock edges are drawn as one batched curve of vertical segments, and the
+        # sampling instants as one scatter. Both are refreshed in place.
+        self.curve_ticks = pg.PlotDataItem(pen=pg.mkPen('#FF5555', style=Qt.DashLine, width=2), connect='pairs')
+        self.plot_main.addItem(self.curve_ticks, ignoreBounds=True)
+        self.scatter_samples = pg.ScatterPlotItem(size=6, pen=None, brush=pg.mkBrush('#00BFFF'))
+        self.plot_main.addItem(self.scatter_samples)
+        
+        # Detected bursts, drawn as bars along the top of the view.
+        self.curve_bursts = pg.PlotDataItem(pen=pg.mkPen('#32CD32', width=6), connect='pairs')
+        self.plot_main.addItem(self.curve_bursts, ignoreBounds=True)
+        
         # Clock Region (The interactive manual box).
         self.clock_region = pg.LinearRegionItem(brush=pg.mkBrush(255, 255, 255, 30))
         self.clock_region.setZValue(100)
@@ -87,7 +136,19 @@ class SlicerTab(BaseSignalTab):
         self.stop_line.setVisible(False) 
         self.plot_main.addItem(self.stop_line)
         
-        self.viz_layout.addWidget(self.plot_main)
+        self.viz_layout.addWidget(self.plot_main, stretch=3)
+        
+        # Eye diagram (hidden until enabled in the visual settings).
+        self.plot_eye = pg.PlotWidget()
+        self.plot_eye.setLabel('bottom', 'Symbol Phase', units='sym')
+        self.plot_eye.setLabel('left', 'Amplitude')
+        self.plot_eye.setMouseEnabled(x=False, y=False)
+        self.plot_eye.setBackground('#1e1e1e')
+        self.img_eye = pg.ImageItem()
+        self.img_eye.setLookupTable(pg.colormap.get('inferno').getLookupTable(nPts=256))
+        self.plot_eye.addItem(self.img_eye)
+        self.plot_eye.setVisible(False)
+        self.viz_layout.addWidget(self.plot_eye, stretch=2)
         
         # Mini map
         self.plot_mini = pg.PlotWidget()
@@ -130,6 +191,31 @@ class SlicerTab(BaseSignalTab):
         self.spin_symbols.valueChanged.connect(self.check_auto_enable) 
         row_sym.addWidget(self.spin_symbols)
         self.sidebar_layout.addLayout(row_sym)
+        
+        row_sampler = QHBoxLayout()
+        row_sampler.addWidget(QLabel("Sampler:"))
+        self.cb_sampler = QComboBox()
+        self.cb_sampler.addItems(dsp.SAMPLER_METHODS)
+        self.cb_sampler.setToolTip("How the analog value is read between samples at each clock center.")
+        self.cb_sampler.currentTextChanged.connect(self.extract_symbols)
+        self.cb_sampler.currentTextChanged.connect(self.update_clock_ticks)
+        row_sampler.addWidget(self.cb_sampler)
+        self.sidebar_layout.addLayout(row_sampler)
+        
+        self.lbl_rate_est = QLabel("Est. Symbol Rate: --")
+        self.lbl_rate_est.setStyleSheet("font-size: 11px; color: #888; font-weight: bold;")
+        self.sidebar_layout.addWidget(self.lbl_rate_est)
+        
+        self.btn_seed_estimate = QPushButton("Seed Box From Estimate")
+        self.btn_seed_estimate.setToolTip("Resize the clock box to the estimated symbol period, keeping its start.")
+        self.btn_seed_estimate.setEnabled(False)
+        self.btn_seed_estimate.clicked.connect(self.seed_clock_from_estimate)
+        self.sidebar_layout.addWidget(self.btn_seed_estimate)
+        
+        self.btn_optimize_phase = QPushButton("Optimize Sampling Phase")
+        self.btn_optimize_phase.setToolTip("Shift the clock to the phase whose samples sit furthest from the thresholds.")
+        self.btn_optimize_phase.clicked.connect(self.optimize_sampling_phase)
+        self.sidebar_layout.addWidget(self.btn_optimize_phase)
         self.sidebar_layout.addSpacing(10)
         
         self.btn_autoscale = QPushButton("Auto Scale Y-Axis")
@@ -162,6 +248,11 @@ class SlicerTab(BaseSignalTab):
         self.chk_light_mode.stateChanged.connect(self.toggle_light_mode)
         self.vis_layout.addWidget(self.chk_light_mode)
         
+        self.chk_eye = QCheckBox("Show Eye Diagram")
+        self.chk_eye.setToolTip("Folds the signal on the current clock into a density plot.")
+        self.chk_eye.stateChanged.connect(self.toggle_eye_diagram)
+        self.vis_layout.addWidget(self.chk_eye)
+        
         self.vis_layout.addSpacing(10)
         self.vis_layout.addWidget(QLabel("Trace Color:"))
         self.cb_color = QComboBox()
@@ -173,16 +264,39 @@ class SlicerTab(BaseSignalTab):
         self.sidebar_layout.addSpacing(20)
         
         # Section 3: Auto Sync.
-        self.grp_auto = QGroupBox("3. Auto-Sync (PLL)")
+        self.grp_auto = QGroupBox("3. Auto-Sync")
         self.auto_layout = QVBoxLayout()
         self.grp_auto.setLayout(self.auto_layout)
         
+        row_engine = QHBoxLayout()
+        row_engine.addWidget(QLabel("Engine:"))
+        self.cb_sync_engine = QComboBox()
+        self.cb_sync_engine.addItems(self.SYNC_ENGINES)
+        self.cb_sync_engine.setToolTip("PLL extends a manually aligned seed.\n"
+                                       "Gardner and Mueller-Muller recover the clock from a rough SPS alone.")
+        self.cb_sync_engine.currentIndexChanged.connect(self.on_sync_engine_changed)
+        row_engine.addWidget(self.cb_sync_engine)
+        self.auto_layout.addLayout(row_engine)
+        
+        row_rough = QHBoxLayout()
+        row_rough.addWidget(QLabel("Rough SPS:"))
+        self.spin_rough_sps = QDoubleSpinBox()
+        self.spin_rough_sps.setRange(2.0, 1e6)
+        self.spin_rough_sps.setDecimals(2)
+        self.spin_rough_sps.setValue(10.0)
+        self.spin_rough_sps.setToolTip("Approximate samples per symbol. Within a few percent is enough.")
+        self.spin_rough_sps.setEnabled(False)
+        row_rough.addWidget(self.spin_rough_sps)
+        self.auto_layout.addLayout(row_rough)
+        
         row_tol = QHBoxLayout()
         row_tol.addWidget(QLabel("Loop Gain (\u03B1):"))
         self.spin_alpha = QDoubleSpinBox()
         self.spin_alpha.setRange(0.01, 0.99)
         self.spin_alpha.setValue(0.25) 
         self.spin_alpha.setSingleStep(0.05)
+        self.spin_alpha.setToolTip("Changing the gain re-runs an active Auto-Sync or burst clocking.")
+        self.spin_alpha.valueChanged.connect(self.on_alpha_changed)
         row_tol.addWidget(self.spin_alpha)
         self.auto_layout.addLayout(row_tol)
         
@@ -212,6 +326,38 @@ class SlicerTab(BaseSignalTab):
         self.auto_layout.addWidget(self.lbl_auto_status)
         
         self.sidebar_layout.addWidget(self.grp_auto)
+        self.sidebar_layout.addSpacing(10)
+        
+        # Section 4: Bursts.
+        self.grp_bursts = QGroupBox("4. Bursts")
+        self.bursts_layout = QVBoxLayout()
+        self.grp_bursts.setLayout(self.bursts_layout)
+        
+        row_metric = QHBoxLayout()
+        row_metric.addWidget(QLabel("Activity:"))
+        self.cb_burst_metric = QComboBox()
+        self.cb_burst_metric.addItems(dsp.BURST_METRICS)
+        self.cb_burst_metric.setToolTip("Smoothness suits FSK/PSK outputs, Variance suits ASK/OOK.")
+        row_metric.addWidget(self.cb_burst_metric)
+        self.bursts_layout.addLayout(row_metric)
+        
+        row_burst_btns = QHBoxLayout()
+        self.btn_detect_bursts = QPushButton("Detect")
+        self.btn_detect_bursts.clicked.connect(self.detect_bursts)
+        row_burst_btns.addWidget(self.btn_detect_bursts)
+        
+        self.btn_clock_bursts = QPushButton("Clock All Bursts")
+        self.btn_clock_bursts.setToolTip("Seedless timing recovery on every burst in parallel, using the Rough SPS.")
+        self.btn_clock_bursts.setStyleSheet("background-color: #e8f5e9; font-weight: bold;")
+        self.btn_clock_bursts.clicked.connect(self.clock_all_bursts)
+        row_burst_btns.addWidget(self.btn_clock_bursts)
+        self.bursts_layout.addLayout(row_burst_btns)
+        
+        self.lbl_bursts = QLabel("Bursts: --")
+        self.lbl_bursts.setStyleSheet("color: #666; font-size: 11px;")
+        self.bursts_layout.addWidget(self.lbl_bursts)
+        
+        self.sidebar_layout.addWidget(self.grp_bursts)
         
         self.sidebar_layout.addSpacing(10)
         self.lbl_debug = QLabel("Drag the white box edges to manually align ticks with symbol zero-crossings.")
@@ -245,7 +391,36 @@ class SlicerTab(BaseSignalTab):
             self.context.thresholds
         )
         
-        # Reset Auto-Sync state
+        # Index the zero crossings once so the PLL only does lookups.
+        self.zero_crossings = dsp.find_zero_crossings(self.centered_analog_data)
+        
+        # Estimate the symbol rate from the clock line and seed the rough SPS with it,
+        # falling back to the last known symbol rate.
+        self.estimated_rate = dsp.estimate_symbol_rate(self.centered_analog_data, self.local_sr)
+        if self.estimated_rate > 0:
+            est_sps = self.local_sr / self.estimated_rate
+            self.lbl_rate_est.setText(f"Est. Symbol Rate: {self.estimated_rate:.2f} Hz ({est_sps:.2f} SPS)")
+            self.spin_rough_sps.setValue(est_sps)
+        else:
+            self.lbl_rate_est.setText("Est. Symbol Rate: no clock line found")
+            if self.context.symbol_rate > 1.0:
+                self.spin_rough_sps.setValue(self.local_sr / self.context.symbol_rate)
+        self.btn_seed_estimate.setEnabled(self.estimated_rate > 0)
+        
+        # Fix the eye's amplitude axis to the bulk of the signal so spikes do not squash it.
+        step = max(1, len(self.centered_analog_data) // 1000000)
+        lo, hi = np.percentile(self.centered_analog_data[::step], [0.1, 99.9])
+        margin = max(hi - lo, 1e-9) * 0.15
+        self.eye_range = (float(lo - margin), float(hi + margin))
+        
+        # Reset burst and Auto-Sync state
+        self.bursts = None
+        self.burst_task = None
+        self.lbl_bursts.setText("Bursts: --")
+        if "Amplitude" in self.context.demod_mode:
+            self.cb_burst_metric.setCurrentText("Variance")
+        else:
+            self.cb_burst_metric.setCurrentText("Smoothness")
         self.clear_auto_sync()
         
         # Restore color preference.
@@ -257,11 +432,12 @@ class SlicerTab(BaseSignalTab):
         }.items() if v == user_color), 'Orange'))
         if idx >= 0: self.cb_color.setCurrentIndex(idx)
         
-        # Update Mini Map (Statically decimated for speed)
+        # Update Mini Map from the envelope pyramid so spikes are not dropped.
         total_points = len(self.centered_analog_data)
-        mini_step = max(1, total_points // 5000)
-        y_data_mini = self.centered_analog_data[::mini_step]
-        x_axis_mini = np.arange(len(y_data_mini)) * (mini_step / self.local_sr)
+        self.analog_pyramid = dsp.build_envelope_pyramid(self.centered_analog_data)
+        y_data_mini, x0, dx = dsp.get_envelope(self.centered_analog_data, self.analog_pyramid, 
+                                               0, total_points, 10000)
+        x_axis_mini = (x0 + dx * np.arange(len(y_data_mini))) / self.local_sr
         self.curve_mini.setData(x_axis_mini, y_data_mini) 
         
         current_range = self.plot_mini.viewRange()[0]
@@ -290,6 +466,9 @@ class SlicerTab(BaseSignalTab):
              
              self.plot_main.setXRange(0, zoom_t, padding=0)
              
+             # Start from the estimated symbol period when there is one.
+             self.seed_clock_from_estimate()
+             
              self.check_auto_enable()
              self.stop_line.setValue(actual_duration)
         
@@ -313,6 +492,7 @@ class SlicerTab(BaseSignalTab):
     def refresh_plot_data(self):
         self.update_main_plot()
         self.update_clock_ticks()
+        self.update_burst_marks()
 
     def update_main_plot(self):
         if self.centered_analog_data is None: return
@@ -334,18 +514,18 @@ class SlicerTab(BaseSignalTab):
         
         if i_stop <= i_start: return
         
-        # Only extract the exact segment we need
-        view_y = self.centered_analog_data[i_start:i_stop]
-        view_x = np.arange(i_start, i_stop) / sr
-        
-        # Decide if we pass raw points or let PyQtGraph apply peak-downsampling
-        num_points = len(view_y)
+        # Decide if we pass raw points or a display width min/max envelope
+        num_points = i_stop - i_start
         if num_points > self.spin_plot_thresh.value():
-            self.plot_main.setDownsampling(auto=True, mode='peak')
+            max_points = max(1000, 2 * int(self.plot_main.getViewBox().width()))
             self.lbl_active_points.setText(f"Visible Points: {num_points:,}  [Downsampled]")
         else:
-            self.plot_main.setDownsampling(auto=False)
+            max_points = num_points
             self.lbl_active_points.setText(f"Visible Points: {num_points:,}  [1:1]")
+        
+        view_y, x0, dx = dsp.get_envelope(self.centered_analog_data, self.analog_pyramid, 
+                                          i_start, i_stop, max_points)
+        view_x = (x0 + dx * np.arange(len(view_y))) / sr
             
         self.curve_digital.setData(view_x, view_y)
 
@@ -355,6 +535,14 @@ class SlicerTab(BaseSignalTab):
             
         # Commit to context
         self.context.symbols = np.copy(self.symbol_buffer)
+        self.context.soft_symbols = np.copy(self.soft_buffer)
+        
+        # Per-burst symbol arrays when the bursts were clocked separately.
+        if self.burst_lengths is not None:
+            splits = np.cumsum(self.burst_lengths)[:-1]
+            self.context.burst_symbols = [p.astype(np.int8) for p in np.split(self.symbol_buffer, splits)]
+        else:
+            self.context.burst_symbols = []
         
         # Calculate overall symbol rate (baud).
         if self.auto_clock_centers is not None and len(self.auto_clock_centers) > 1:
@@ -370,28 +558,20 @@ class SlicerTab(BaseSignalTab):
         return True, f"Staged {len(self.context.symbols)} symbols."
 
     def extract_symbols(self):
-        # Extracts specific points in time from the analog wave and runs them through the slicer
+        # Samples the analog wave at the clock centers and runs them through the slicer
         if self.centered_analog_data is None: return
         
-        sr = self.local_sr
-        
-        # If Auto-Sync is locked, use its combined timestamps exactly
-        if self.auto_clock_centers is not None:
-            timestamps = self.auto_clock_centers.tolist()
-        else:
-            # Otherwise, calculate timestamps manually from the box
-            min_t, max_t = self.clock_region.getRegion()
-            num_symbols = self.spin_symbols.value()
-            sym_width = (max_t - min_t) / num_symbols
-            timestamps = [min_t + (sym_width * (i + 0.5)) for i in range(num_symbols)]
-            
-        # Sample and digitize via DSP lib
-        self.symbol_buffer = dsp.sample_and_slice(
+        # Sample between samples and digitize via DSP lib
+        self.soft_buffer, self.symbol_buffer = dsp.sample_symbols(
             self.centered_analog_data, 
-            timestamps, 
-            sr, 
-            self.adjusted_thresholds
+            self.get_clock_centers(), 
+            self.local_sr, 
+            self.adjusted_thresholds,
+            method=self.cb_sampler.currentText()
         )
+        
+        if self.chk_eye.isChecked():
+            self.eye_rebuild_timer.start(100)
 
     def update_clock_box_size(self):
         # Adjusts the region width when symbol count changes manually.
@@ -414,49 +594,96 @@ class SlicerTab(BaseSignalTab):
         self.last_symbol_count = new_count
         self.check_auto_enable()
 
+    def seed_clock_from_estimate(self):
+        # Sizes the manual clock box to whole estimated symbols, keeping its start.
+        if self.estimated_rate <= 0 or self.auto_clock_centers is not None:
+            return
+            
+        count = max(self.spin_symbols.value(), 8)
+        min_t, _ = self.clock_region.getRegion()
+        
+        self.clock_region.blockSignals(True)
+        self.clock_region.setRegion([min_t, min_t + count / self.estimated_rate])
+        self.clock_region.blockSignals(False)
+        
+        self.spin_symbols.blockSignals(True)
+        self.spin_symbols.setValue(count)
+        self.spin_symbols.blockSignals(False)
+        self.last_symbol_count = count
+        
+        self.check_auto_enable()
+        self.update_clock_ticks()
+        self.extract_symbols()
+
+    def optimize_sampling_phase(self):
+        # Sweeps the sampling phase over one symbol and moves the clock to the best one.
+        if self.centered_analog_data is None: return
+        
+        centers = self.get_clock_centers()
+        if len(centers) < 2:
+            QMessageBox.warning(self, "Sampling Phase", "Align at least 2 symbols first.")
+            return
+            
+        best, offsets, scores = dsp.sweep_sampling_phase(
+            self.centered_analog_data, centers, self.local_sr, self.adjusted_thresholds,
+            method=self.cb_sampler.currentText()
+        )
+        before = scores[np.argmin(np.abs(offsets))]
+        
+        if self.auto_clock_centers is not None:
+            # Each center moves by the offset times its own period; edges follow their neighbours.
+            shift = best * dsp.local_symbol_periods(centers)
+            self.auto_clock_edges = self.auto_clock_edges + np.interp(self.auto_clock_edges, centers, shift)
+            self.auto_clock_centers = centers + shift
+            self.refresh_plot_data()
+            self.extract_symbols()
+        else:
+            min_t, max_t = self.clock_region.getRegion()
+            shift = best * (max_t - min_t) / self.spin_symbols.value()
+            self.clock_region.setRegion([min_t + shift, max_t + shift])
+            
+        self.lbl_debug.setText(f"Sampling phase moved {best:+.3f} symbol "
+                               f"(mean margin {before:.3g} \u2192 {scores.max():.3g}).")
+
+    def get_clock_centers(self):
+        # Returns the symbol sampling times (s) for the current manual or auto clock.
+        if self.auto_clock_centers is not None:
+            return self.auto_clock_centers
+        min_t, max_t = self.clock_region.getRegion()
+        num_symbols = self.spin_symbols.value()
+        sym_width = (max_t - min_t) / num_symbols
+        return min_t + sym_width * (np.arange(num_symbols) + 0.5)
+
     def update_clock_ticks(self):
-        # Draws the vertical clock lines based on Manual + Auto states.
+        # Draws the clock edges and sample points based on Manual + Auto states.
         if self.centered_analog_data is None: return
         
         # Combine edges to draw.
         if self.auto_clock_edges is not None:
-            edges_to_draw = self.auto_clock_edges
+            edges = self.auto_clock_edges
         else:
             min_x, max_x = self.clock_region.getRegion()
             num_symbols = self.spin_symbols.value()
             sym_width = (max_x - min_x) / num_symbols
-            if num_symbols > 1:
-                edges_to_draw = [min_x + ((i + 1) * sym_width) for i in range(num_symbols - 1)]
-            else:
-                edges_to_draw = []
+            edges = min_x + sym_width * np.arange(1, num_symbols)
+        centers = self.get_clock_centers()
             
-        # Clear old lines.
-        while len(self.tick_lines) > 0:
-            self.plot_main.removeItem(self.tick_lines.pop())
-            
-        if not edges_to_draw: return
-        
-        tick_pen = pg.mkPen('#FF5555', style=Qt.DashLine, width=2)
-        view_min, view_max = self.plot_main.viewRange()[0]
-        
-        # Convert to numpy array for fast filtering
-        edges_arr = np.array(edges_to_draw)
-        
-        # Fallback sym_width approximation to pad view range
-        pad_width = edges_arr[1] - edges_arr[0] if len(edges_arr) > 1 else 0.001
-        
-        # Filter edges to only what is currently in the viewport to prevent lag
-        visible_edges = edges_arr[(edges_arr >= view_min - pad_width) & (edges_arr <= view_max + pad_width)]
-        
-        # Max lines on screen check to protect UI thread
-        if len(visible_edges) > 300:
-            visible_edges = visible_edges[::len(visible_edges)//300]
-            
-        for x_pos in visible_edges:
-            l = pg.InfiniteLine(angle=90, movable=False, pen=tick_pen)
-            l.setValue(x_pos)
-            self.plot_main.addItem(l)
-            self.tick_lines.append(l)
+        (view_min, view_max), (y_min, y_max) = self.plot_main.viewRange()
+        
+        # Only the edges in the viewport (plus a symbol either side) are sent to the curve.
+        pad_width = edges[1] - edges[0] if len(edges) > 1 else 0.001
+        lo, hi = np.searchsorted(edges, [view_min - pad_width, view_max + pad_width])
+        visible_edges = edges[lo:hi]
+        
+        # Vertical segments spanning the view, drawn as disconnected pairs.
+        self.curve_ticks.setData(np.repeat(visible_edges, 2), 
+                                 np.tile([y_min, y_max], len(visible_edges)))
+        
+        lo, hi = np.searchsorted(centers, [view_min - pad_width, view_max + pad_width])
+        visible_centers = centers[lo:hi]
+        values = dsp.interpolate_samples(self.centered_analog_data, visible_centers * self.local_sr, 
+                                         self.cb_sampler.currentText())
+        self.scatter_samples.setData(visible_centers, values)
 
     def run_auto_sync(self):
         if self.centered_analog_data is None: return
@@ -468,51 +695,201 @@ class SlicerTab(BaseSignalTab):
         
         sr = self.local_sr
         limit = self.stop_line.value() if self.chk_stop_limit.isChecked() else None
+        engine = self.cb_sync_engine.currentIndex()
+        
+        if engine == 0:
+            # Use DSP lib with PLL algorithm
+            success, centers, manual_boundary = dsp.find_clock_sync(
+                self.centered_analog_data, 
+                sr, 
+                start_time, 
+                current_width, 
+                current_count, 
+                self.spin_alpha.value(),
+                limit,
+                crossings=self.zero_crossings
+            )
+        else:
+            # Timing error detector loop over the whole burst, no manual seed needed.
+            centers = dsp.recover_symbol_timing(
+                self.centered_analog_data,
+                sr,
+                self.spin_rough_sps.value(),
+                detector=self.cb_sync_engine.currentText(),
+                alpha=self.spin_alpha.value(),
+                limit_time=limit,
+                crossings=self.zero_crossings
+            )
+            success = len(centers) > 1
+            manual_boundary = None
+        
+        if success and len(centers) > 1:
+            mode_name = "PLL" if engine == 0 else self.cb_sync_engine.currentText()
+            self.apply_auto_clock(centers, dsp.centers_to_edges(centers), 
+                                  f"Status: {mode_name} Mode (Total Sym: {len(centers)})", manual_boundary)
+        elif engine != 0:
+            QMessageBox.warning(self, "Auto-Sync", "Timing recovery found no symbols. Check the rough SPS.")
+
+    def on_alpha_changed(self):
+        # Only an active automatic clock depends on the loop gain.
+        if self.auto_clock_centers is not None:
+            self.resync_timer.start(300)
+
+    def rerun_auto_clock(self):
+        # Recovers the clock again with the current loop gain, keeping the mode.
+        if self.auto_clock_centers is None: return
+        if self.burst_lengths is not None:
+            self.clock_all_bursts()
+        else:
+            self.run_auto_sync()
+
+    def apply_auto_clock(self, centers, edges, status_text, manual_boundary=None):
+        # Switches the tab to an automatically recovered clock and locks the manual controls.
+        self.auto_clock_centers = centers
+        self.auto_clock_edges = edges
         
-        # Use DSP lib with PLL algorithm
-        success, centers, manual_boundary = dsp.find_clock_sync(
-            self.centered_analog_data, 
-            sr, 
-            start_time, 
-            current_width, 
-            current_count, 
-            self.spin_alpha.value(),
-            limit
-        )
+        # Lock the UI
+        self.clock_region.setMovable(False)
+        for line in self.clock_region.lines:
+            line.setMovable(False)
         
-        if success and len(centers) > 0:
-            self.auto_clock_centers = centers
-            # Reconstruct the edges from the centers for visualization
-            self.auto_clock_edges = [centers[0] - (centers[1]-centers[0])/2] # First edge
-            for i in range(len(centers) - 1):
-                self.auto_clock_edges.append((centers[i] + centers[i+1]) / 2.0)
-            self.auto_clock_edges.append(centers[-1] + (centers[-1]-centers[-2])/2) # Last edge
-            
-            # Lock the UI
-            self.clock_region.setMovable(False)
-            for line in self.clock_region.lines:
-                line.setMovable(False)
-            
-            self.spin_symbols.setEnabled(False)
-            self.btn_auto_sync.setEnabled(False)
-            self.btn_clear_auto.setEnabled(True)
-            self.chk_lock_pos.setEnabled(False)
-            
-            # Show Red Boundary Line
+        self.spin_symbols.setEnabled(False)
+        self.btn_auto_sync.setEnabled(False)
+        self.btn_clear_auto.setEnabled(True)
+        self.chk_lock_pos.setEnabled(False)
+        self.cb_sync_engine.setEnabled(False)
+        
+        # Show Red Boundary Line where the manual seed ends
+        if manual_boundary is not None:
             self.auto_start_line.setValue(manual_boundary)
             self.auto_start_line.setVisible(True)
+        
+        self.lbl_auto_status.setText(status_text)
+        self.lbl_auto_status.setStyleSheet("color: #2E7D32; font-weight: bold;")
+        
+        self.refresh_plot_data()
+        self.extract_symbols()
+
+    def detect_bursts(self):
+        # Segments the signal into bursts with the selected activity measure.
+        if self.centered_analog_data is None: return
+        
+        # Blocks of a few symbols average out the transitions inside a burst.
+        block_size = int(max(16, min(1 << 14, 3 * self.spin_rough_sps.value())))
+        self.bursts = dsp.detect_bursts(self.centered_analog_data, block_size=block_size,
+                                        metric=self.cb_burst_metric.currentText())
+        self.lbl_bursts.setText(f"Bursts: {len(self.bursts)} detected")
+        self.update_burst_marks()
+
+    def clock_all_bursts(self):
+        # Recovers the clock on every burst in a background process pool.
+        if self.centered_analog_data is None or self.burst_task is not None: return
+        if self.bursts is None:
+            self.detect_bursts()
+        if len(self.bursts) == 0:
+            QMessageBox.warning(self, "Bursts", "No bursts detected.")
+            return
             
-            total = len(centers)
-            self.lbl_auto_status.setText(f"Status: PLL Mode (Total Sym: {total})")
-            self.lbl_auto_status.setStyleSheet("color: #2E7D32; font-weight: bold;")
+        self.clear_auto_sync()
+        detector = self.cb_sync_engine.currentText() if self.cb_sync_engine.currentIndex() != 0 else "Gardner"
+        
+        task = BackgroundTask(dsp.recover_bursts, self.centered_analog_data, self.local_sr, self.bursts,
+                              self.spin_rough_sps.value(), detector=detector, 
+                              alpha=self.spin_alpha.value())
+        task.result_ready.connect(lambda results: self.on_bursts_clocked(task, results))
+        task.failed.connect(lambda msg: self.on_bursts_failed(task, msg))
+        task.finished.connect(lambda: self.running_tasks.remove(task))
+        self.running_tasks.append(task)
+        self.burst_task = task
+        
+        self.btn_clock_bursts.setEnabled(False)
+        self.lbl_bursts.setText(f"Bursts: clocking {len(self.bursts)}...")
+        task.start()
+
+    def on_bursts_clocked(self, task, results):
+        # Ignore results from a pass that was dropped by a reload.
+        if task is not self.burst_task: return
+        self.burst_task = None
+        self.btn_clock_bursts.setEnabled(True)
+        
+        # The symbols are sampled afterwards on the joined clock, with the current sampler.
+        results = [c for c in results if len(c) > 1]
+        if not results:
+            self.lbl_bursts.setText("Bursts: no symbols recovered")
+            return
+        
+        centers = np.concatenate(results)
+        edges = np.concatenate([dsp.centers_to_edges(c) for c in results])
+        self.apply_auto_clock(centers, edges, 
+                              f"Status: Burst Mode ({len(results)} bursts, {len(centers)} sym)")
+        self.burst_lengths = [len(c) for c in results]
+        self.lbl_bursts.setText(f"Bursts: {len(results)} clocked")
+
+    def on_bursts_failed(self, task, msg):
+        if task is not self.burst_task: return
+        self.burst_task = None
+        self.btn_clock_bursts.setEnabled(True)
+        self.lbl_bursts.setText(f"Bursts Error: {msg}")
+
+    def update_burst_marks(self):
+        # Draws a bar along the top of the view over each detected burst.
+        if self.bursts is None or len(self.bursts) == 0:
+            self.curve_bursts.setData([], [])
+            return
+        
+        y_min, y_max = self.plot_main.viewRange()[1]
+        y_bar = y_max - 0.03 * (y_max - y_min)
+        self.curve_bursts.setData(self.bursts.ravel() / self.local_sr, 
+                                  np.full(self.bursts.size, y_bar))
+
+    def toggle_eye_diagram(self):
+        show = self.chk_eye.isChecked()
+        self.plot_eye.setVisible(show)
+        if show:
+            self.rebuild_eye_diagram()
+        else:
+            self.eye_timer.stop()
+            self.eye_counts = None
+
+    def rebuild_eye_diagram(self):
+        # Restarts the fold on the current clock (manual or auto).
+        if self.centered_analog_data is None or not self.chk_eye.isChecked(): return
+        
+        # Follow the colormap picked on the spectrogram tab.
+        if self.context.viz_lut is not None:
+            self.img_eye.setLookupTable(self.context.viz_lut)
+        
+        self.eye_centers = self.get_clock_centers() * self.local_sr
+        self.eye_cursor = 0
+        self.eye_counts = None
+        self.eye_timer.start(0)
+
+    def accumulate_eye_chunk(self):
+        # Folds the next chunk of symbols into the eye histogram and redraws it.
+        if self.eye_centers is None or self.eye_cursor >= len(self.eye_centers):
+            self.eye_timer.stop()
+            return
             
-            self.refresh_plot_data()
-            self.extract_symbols()
+        chunk = self.eye_centers[self.eye_cursor:self.eye_cursor + self.EYE_CHUNK]
+        counts = dsp.compute_eye_histogram(self.centered_analog_data, chunk, self.eye_range, 
+                                           span=self.EYE_SPAN)
+        self.eye_counts = counts if self.eye_counts is None else self.eye_counts + counts
+        self.eye_cursor += len(chunk)
+        if self.eye_cursor >= len(self.eye_centers):
+            self.eye_timer.stop()
+        
+        # Log density keeps rare transition traces visible next to the dense rails.
+        density = np.log1p(self.eye_counts.astype(np.float32))
+        self.img_eye.setImage(density, autoLevels=False, levels=(0, max(float(density.max()), 1e-6)))
+        lo, hi = self.eye_range
+        self.img_eye.setRect(pg.QtCore.QRectF(-self.EYE_SPAN / 2, lo, self.EYE_SPAN, hi - lo))
+        self.plot_eye.setTitle(f"Eye: {self.eye_cursor:,} / {len(self.eye_centers):,} symbols")
 
     def clear_auto_sync(self):
         # Resets back to manual mode.
         self.auto_clock_centers = None
         self.auto_clock_edges = None
+        self.burst_lengths = None
         
         self.auto_start_line.setVisible(False)
         
@@ -520,6 +897,7 @@ class SlicerTab(BaseSignalTab):
         self.spin_symbols.setEnabled(True)
         self.btn_clear_auto.setEnabled(False)
         self.chk_lock_pos.setEnabled(True)
+        self.cb_sync_engine.setEnabled(True)
         
         self.toggle_lock_position() # Apply correct lock state for lines
         
@@ -555,6 +933,12 @@ class SlicerTab(BaseSignalTab):
         if self.auto_clock_centers is not None:
             return
             
+        # The seedless engines only need the rough SPS.
+        if self.cb_sync_engine.currentIndex() != 0:
+            self.btn_auto_sync.setEnabled(self.centered_analog_data is not None)
+            self.btn_auto_sync.setText("Auto-Sync")
+            return
+            
         count = self.spin_symbols.value()
         if count >= 4:
             self.btn_auto_sync.setEnabled(True)
@@ -563,6 +947,18 @@ class SlicerTab(BaseSignalTab):
             self.btn_auto_sync.setEnabled(False)
             self.btn_auto_sync.setText("Auto-Sync (Align 4+)")
 
+    def on_sync_engine_changed(self, index):
+        # Leaving the PLL starts the seedless engines from the manual box's SPS.
+        was_manual = not self.spin_rough_sps.isEnabled()
+        if index != 0 and was_manual and self.centered_analog_data is not None:
+            min_t, max_t = self.clock_region.getRegion()
+            box_sps = (max_t - min_t) * self.local_sr / self.spin_symbols.value()
+            if self.spin_symbols.value() >= 4 and box_sps >= 2.0:
+                self.spin_rough_sps.setValue(box_sps)
+                
+        self.spin_rough_sps.setEnabled(index != 0)
+        self.check_auto_enable()
+
     def toggle_lock_position(self):
         if self.auto_clock_centers is not None:
             return # Blocked by Auto-Sync
@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+
+import utils.dsp_lib as dsp
+
+def _levels_signal(levels, probs, noise, n=400_000, seed=0):
+    rng = np.random.default_rng(seed)
+    symbols = rng.choice(len(levels), n, p=probs)
+    return (np.asarray(levels, dtype=np.float64)[symbols] + rng.normal(0, noise, n)).astype(np.float32)
+
+@pytest.mark.parametrize("levels, probs", [
+    ([-3, -1, 1, 3], [0.55, 0.15, 0.15, 0.15]),
+    ([-3, -1, 1, 3], [0.1, 0.1, 0.1, 0.7]),
+    ([-7, -5, -3, -1, 1, 3, 5, 7], [0.3] + [0.1] * 7),
+    ([-1, 1], [0.95, 0.05]),
+])
+def test_estimate_thresholds_unequal_probabilities(levels, probs):
+    data = _levels_signal(levels, probs, noise=0.25)
+    counts, edges = dsp.compute_value_histogram(data)
+    thresholds, centers = dsp.estimate_thresholds(counts, edges, len(levels))
+    
+    expected = 0.5 * (np.array(levels[1:]) + np.array(levels[:-1]))
+    assert np.allclose(thresholds, expected, atol=0.2)
+    assert np.allclose(centers, levels, atol=0.1)
+
+def _ook_bursts(num_bursts, sps, gap=3000, bits=200, noise=0.05, seed=0):
+    # Unfiltered OOK magnitude, centered on the slicing threshold like the slicer's data.
+    rng = np.random.default_rng(seed)
+    parts, truth, pos = [], [], 0
+    for _ in range(num_bursts):
+        parts.append(np.zeros(gap))
+        symbols = rng.integers(0, 2, bits)
+        symbols[0] = symbols[-1] = 1
+        parts.append(np.repeat(symbols.astype(np.float64), sps))
+        truth.append((pos + gap, pos + gap + bits * sps))
+        pos += gap + bits * sps
+    parts.append(np.zeros(gap))
+    data = np.concatenate(parts) + rng.normal(0, noise, pos + gap) - 0.5
+    return data.astype(np.float32), np.array(truth)
+
+@pytest.mark.parametrize("metric", dsp.BURST_METRICS)
+def test_detect_bursts_gapless_signal(metric):
+    rng = np.random.default_rng(0)
+    data = (rng.choice([-1.0, 1.0], 20_000).repeat(20) + rng.normal(0, 0.05, 400_000)).astype(np.float32)
+    bursts = dsp.detect_bursts(data, block_size=60, metric=metric)
+    
+    assert len(bursts) == 1
+    assert bursts[0, 1] - bursts[0, 0] >= 0.99 * len(data)
+
+@pytest.mark.parametrize("sps", [8, 20, 50])
+def test_detect_bursts_ook(sps):
+    data, truth = _ook_bursts(30, sps)
+    bursts = dsp.detect_bursts(data, block_size=3 * sps, metric='Variance')
+    
+    assert len(bursts) == 30
+    overlap = np.minimum(bursts[:, 1], truth[:, 1]) - np.maximum(bursts[:, 0], truth[:, 0])
+    assert np.all(overlap > 0.8 * (truth[:, 1] - truth[:, 0]))
+
+def test_eye_histogram_ignores_gaps_between_bursts():
+    # Two constant bursts with a silent gap: folding on their clock must never read the gap.
+    data = np.zeros(48_000, dtype=np.float32)
+    data[:4000] = data[44_000:] = 1.0
+    centers = np.concatenate((np.arange(490) * 8 + 3.5, 44_000 + np.arange(490) * 8 + 3.5))
+    counts = dsp.compute_eye_histogram(data, centers, (-1.5, 1.5), y_bins=30)
+    
+    level_row = int((1.0 + 1.5) / 3.0 * 30)
+    assert counts.sum() == counts[:, level_row].sum()
@@ -0,0 +1,25 @@
+import numpy as np
+import pytest
+
+import utils.encoding_lib as enc
+
+def _bit_buffer(bits):
+    return enc.BitBuffer(np.packbits(bits), len(bits))
+
+@pytest.mark.parametrize("length, max_errors", [(4, 0), (8, 1), (12, 2), (32, 3), (41, 9), (64, 12)])
+def test_find_pattern_hits_matches_brute_force(length, max_errors):
+    rng = np.random.default_rng(length)
+    bits = rng.integers(0, 2, 3000).astype(np.uint8)
+    pattern = rng.integers(0, 2, length).astype(np.uint8)
+    bits[100:100 + length] = pattern
+    bits[2000:2000 + length] = pattern ^ 1
+    
+    positions, errors, inverted = enc.find_pattern_hits(_bit_buffer(bits), _bit_buffer(pattern), max_errors,
+                                                        chunk_bytes=37)
+    
+    windows = np.lib.stride_tricks.sliding_window_view(bits, length)
+    dist = np.count_nonzero(windows != pattern, axis=1)
+    expected = np.flatnonzero((dist <= max_errors) | (dist >= length - max_errors))
+    assert np.array_equal(positions, expected)
+    assert np.array_equal(inverted, dist[expected] > max_errors)
+    assert np.array_equal(errors, np.where(inverted, length - dist[expected], dist[expected]))
@@ -1,3 +1,8 @@
+import bisect
+import concurrent.futures
+import multiprocessing
+from fractions import Fraction
+
 import numpy as np
 import scipy.signal
 
@@ -210,6 +215,77 @@ def demodulate_dpsk(data, k_offset):
     # Extract the absolute phase angle
     return np.abs(np.angle(mult))
 
+def demodulate_all(data, sr, k_offset, chunk_size=1 << 20):
+    # Fused AM / FM / DPSK demodulation in a single chunked pass over the IQ data.
+    # Returns (am, fm, dpsk) matching demodulate_am, demodulate_fm and demodulate_dpsk.
+    n = len(data)
+    k_offset = max(1, int(k_offset))
+    
+    am = np.empty(n, dtype=np.float32)
+    fm = np.empty(n, dtype=np.float32)
+    dpsk = np.zeros(n, dtype=np.float32)
+    if n == 0:
+        return am, fm, dpsk
+    
+    scale = sr / (2 * np.pi)
+    
+    for start in range(0, n, chunk_size):
+        stop = min(n, start + chunk_size)
+        
+        # One extra sample so the forward difference spans the chunk boundary.
+        block = data[start:min(n, stop + 1)]
+        am[start:stop] = np.abs(block[:stop - start])
+        
+        # Sample-to-sample conjugate product, shared by FM and 1-sample DPSK.
+        phase = np.angle(block[1:] * np.conj(block[:-1]))
+        fm[start:start + len(phase)] = phase * scale
+        
+        if k_offset == 1:
+            # The product at n is the DPSK output at n + 1.
+            dpsk[start + 1:start + 1 + len(phase)] = np.abs(phase)
+        else:
+            lo = max(start, k_offset)
+            if lo < stop:
+                delayed_prod = data[lo:stop] * np.conj(data[lo - k_offset:stop - k_offset])
+                dpsk[lo:stop] = np.abs(np.angle(delayed_prod))
+    
+    # Keep array size consistent with the FM demodulator.
+    fm[-1] = fm[-2] if n > 1 else 0.0
+    
+    return am, fm, dpsk
+
+def resample_to_sps(data, sr, symbol_rate, target_sps, max_denominator=1000):
+    # Low-pass filters and resamples a demodulated signal so each symbol spans ~target_sps samples.
+    # Only ever decimates. Returns (resampled_data, new_sr).
+    if symbol_rate <= 0 or target_sps <= 0:
+        return data, sr
+        
+    current_sps = sr / symbol_rate
+    if current_sps <= target_sps:
+        return data, sr
+    out_type = _float_type(data)
+    
+    # Coarse integer stage. Block averaging is O(N) and leaves 4x headroom
+    # above the target rate for the sharper polyphase stage to clean up.
+    coarse = int(current_sps // (4 * target_sps))
+    if coarse > 1:
+        block_starts = np.arange(0, len(data), coarse)
+        block_sizes = np.diff(np.append(block_starts, len(data)))
+        data = np.add.reduceat(data, block_starts) / block_sizes
+        sr = sr / coarse
+        current_sps = sr / symbol_rate
+    
+    # Rational approximation of the rate change for the polyphase resampler.
+    ratio = Fraction(target_sps / current_sps).limit_denominator(max_denominator)
+    up, down = ratio.numerator, ratio.denominator
+    if up == 0:
+        up, down = 1, max_denominator
+    
+    # resample_poly applies its own anti-aliasing FIR at the new Nyquist rate.
+    resampled = scipy.signal.resample_poly(data, up, down)
+    
+    return resampled.astype(out_type, copy=False), sr * up / down
+
 def slice_signal(analog_data, thresholds):
     # Converts analog float data to integer symbols based on thresholds.
     # Returns int array (0, 1, 2, 3, etc).
@@ -222,11 +298,251 @@ def slice_signal(analog_data, thresholds):
         
     return np.digitize(analog_data, thresh)
 
-def apply_matched_filter(data, filter_type, length, beta=0.35):
+def compute_value_histogram(data, num_bins=8192, value_range=None, chunk_size=1 << 18):
+    # Builds a fixed-bin histogram of the analog values by streaming over the array in chunks.
+    # Returns (counts, edges) with len(edges) == num_bins + 1.
+    if value_range is None:
+        lo, hi = float(np.min(data)), float(np.max(data))
+    else:
+        lo, hi = float(value_range[0]), float(value_range[1])
+    if hi - lo < 1e-12:
+        hi = lo + 1.0
+
+    edges = np.linspace(lo, hi, num_bins + 1)
+    counts = np.zeros(num_bins, dtype=np.int64)
+
+    # Keep the arithmetic in the native float type to avoid upcasting every chunk.
+    ftype = data.dtype.type if np.issubdtype(data.dtype, np.floating) else np.float64
+    offset = ftype(lo)
+    scale = ftype(num_bins / (hi - lo))
+
+    # Uniform bins let us compute the bin index directly and count with bincount.
+    for start in range(0, len(data), chunk_size):
+        chunk = data[start:start + chunk_size]
+        idx = ((chunk - offset) * scale).astype(np.int32)
+        np.clip(idx, 0, num_bins - 1, out=idx)
+        counts += np.bincount(idx, minlength=num_bins)
+
+    return counts, edges
+
+def compute_level_stats(counts, edges, thresholds):
+    # Summarises each symbol level (the span between adjacent thresholds) from a value histogram.
+    # Returns a dict of arrays indexed by symbol: 'median', 'spread' (IQR) and 'count'.
+    thresh = np.sort(np.asarray(thresholds, dtype=np.float64))
+    cdf = np.concatenate(([0], np.cumsum(counts))).astype(np.float64)
+    total = cdf[-1]
+
+    # Cumulative count at every level boundary (interpolated within a bin).
+    bounds = np.concatenate(([0.0], np.interp(thresh, edges, cdf), [total]))
+    level_counts = np.diff(bounds)
+
+    # Quantiles of each level are read back off the inverse CDF.
+    def quantile(q):
+        return np.interp(bounds[:-1] + q * level_counts, cdf, edges)
+
+    median = quantile(0.5)
+    spread = quantile(0.75) - quantile(0.25)
+
+    # Empty levels fall back to the middle of their threshold interval.
+    thresh = np.clip(thresh, edges[0], edges[-1])
+    lower = np.concatenate(([edges[0]], thresh))
+    upper = np.concatenate((thresh, [edges[-1]]))
+    empty = level_counts < 0.5
+    median[empty] = 0.5 * (lower[empty] + upper[empty])
+    spread[empty] = 0.0
+
+    return {
+        'median': median,
+        'spread': spread,
+        'count': np.round(level_counts).astype(np.int64),
+    }
+
+def estimate_thresholds(counts, edges, num_levels, max_iter=100):
+    # Finds num_levels symbol clusters in a value histogram with a weighted 1-D k-means.
+    # Returns (thresholds, centers) as sorted numpy arrays.
+    num_levels = max(2, int(num_levels))
+    weights = counts.astype(np.float64)
+    values = 0.5 * (edges[:-1] + edges[1:])
+    total = np.sum(weights)
+    if total <= 0:
+        centers = np.linspace(edges[0], edges[-1], num_levels + 2)[1:-1]
+        return 0.5 * (centers[1:] + centers[:-1]), centers
+
+    # Seed with the optimal split of a coarsened histogram (multilevel Otsu), so levels
+    # with unequal probabilities are not pulled towards the common ones.
+    centers = _otsu_centers(weights, values, num_levels)
+
+    # Lloyd iterations run on the bins, so the cost is independent of the sample count.
+    for _ in range(max_iter):
+        bounds = 0.5 * (centers[1:] + centers[:-1])
+        labels = np.searchsorted(bounds, values)
+        mass = np.bincount(labels, weights=weights, minlength=num_levels)
+        moment = np.bincount(labels, weights=weights * values, minlength=num_levels)
+
+        new_centers = np.where(mass > 0, moment / np.maximum(mass, 1e-12), centers)
+        new_centers = np.sort(new_centers)
+        if np.allclose(new_centers, centers, rtol=0, atol=1e-9 * (edges[-1] - edges[0])):
+            centers = new_centers
+            break
+        centers = new_centers
+
+    # Place each boundary where the neighbouring clusters are equally likely,
+    # weighting by their spread so a noisy level gets a wider decision region.
+    bounds = 0.5 * (centers[1:] + centers[:-1])
+    labels = np.searchsorted(bounds, values)
+    mass = np.maximum(np.bincount(labels, weights=weights, minlength=num_levels), 1e-12)
+    var = np.bincount(labels, weights=weights * (values - centers[labels]) ** 2, minlength=num_levels) / mass
+    std = np.sqrt(var) + 1e-12
+
+    thresholds = (centers[:-1] * std[1:] + centers[1:] * std[:-1]) / (std[:-1] + std[1:])
+    return thresholds, centers
+
+def _otsu_centers(weights, values, num_levels, coarse_bins=256):
+    # Multilevel Otsu: splits a histogram into num_levels contiguous classes with the least
+    # within-class variance, solved exactly by dynamic programming over coarse bins.
+    # Returns the weighted mean of each class.
+    group = max(1, int(np.ceil(len(weights) / coarse_bins)))
+    pad = -len(weights) % group
+    w = np.concatenate((weights, np.zeros(pad))).reshape(-1, group)
+    x = np.concatenate((values, np.full(pad, values[-1]))).reshape(-1, group)
+    w_sum = w.sum(axis=1)
+    wx_sum = (w * x).sum(axis=1)
+    wxx_sum = (w * x * x).sum(axis=1)
+    
+    # Cost of a class spanning coarse bins [i, j) from prefix sums.
+    cw = np.concatenate(([0.0], np.cumsum(w_sum)))
+    cwx = np.concatenate(([0.0], np.cumsum(wx_sum)))
+    cwxx = np.concatenate(([0.0], np.cumsum(wxx_sum)))
+    mass = cw[None, :] - cw[:, None]
+    moment = cwx[None, :] - cwx[:, None]
+    cost = (cwxx[None, :] - cwxx[:, None]) - moment ** 2 / np.maximum(mass, 1e-12)
+    n = len(w_sum)
+    cost[np.tril_indices(n + 1)] = np.inf
+    
+    # best[j] is the least cost of splitting bins [0, j) into k classes.
+    best = cost[0].copy()
+    choices = []
+    for _ in range(num_levels - 1):
+        total = best[:, None] + cost
+        choices.append(np.argmin(total, axis=0))
+        best = total[choices[-1], np.arange(n + 1)]
+    
+    cuts = [n]
+    for choice in reversed(choices):
+        cuts.append(int(choice[cuts[-1]]))
+    cuts = cuts[::-1]
+    if not np.isfinite(best[n]):
+        # Fewer occupied bins than levels; spread the centers over the range instead.
+        return np.linspace(values[0], values[-1], num_levels + 2)[1:-1]
+    
+    starts = np.array([0] + cuts[:-1])
+    stops = np.array(cuts)
+    centers = (cwx[stops] - cwx[starts]) / np.maximum(cw[stops] - cw[starts], 1e-12)
+    return np.sort(centers)
+
+def build_envelope_pyramid(data, base_block=16, factor=4, min_blocks=2048):
+    # Precomputes a min/max level-of-detail pyramid for waveform plotting.
+    # Returns a list of (block_size, mins, maxs) tuples, finest level first.
+    pyramid = []
+    if data is None or len(data) < base_block * 2:
+        return pyramid
+
+    # First level reduces the raw samples.
+    mins, maxs = _reduce_min_max(data, data, base_block)
+    block = base_block
+    pyramid.append((block, mins, maxs))
+
+    # Each coarser level reduces the previous one until it is screen sized.
+    while len(mins) > min_blocks:
+        mins, maxs = _reduce_min_max(mins, maxs, factor)
+        block *= factor
+        pyramid.append((block, mins, maxs))
+
+    return pyramid
+
+def _reduce_min_max(mins, maxs, group):
+    # Collapses every group of samples into a single min and max.
+    # A trailing partial group is kept so the envelope covers the full array.
+    n = len(mins)
+    usable = (n // group) * group
+    out_min = mins[:usable]
+    out_max = maxs[:usable]
+
+    if group & (group - 1) == 0:
+        # Pairwise halving is much faster than a short-axis reduction.
+        step = group
+        while step > 1:
+            pairs = out_min.reshape(-1, 2)
+            out_min = np.minimum(pairs[:, 0], pairs[:, 1])
+            pairs = out_max.reshape(-1, 2)
+            out_max = np.maximum(pairs[:, 0], pairs[:, 1])
+            step //= 2
+    else:
+        out_min = out_min.reshape(-1, group).min(axis=1)
+        out_max = out_max.reshape(-1, group).max(axis=1)
+
+    if usable < n:
+        out_min = np.append(out_min, mins[usable:].min())
+        out_max = np.append(out_max, maxs[usable:].max())
+
+    return out_min, out_max
+
+def get_envelope(data, pyramid, i_start, i_stop, max_points):
+    # Fetches a display sized min/max envelope of data[i_start:i_stop].
+    # Returns (y, x0, dx) where point k sits at sample index x0 + k * dx.
+    i_start = max(0, int(i_start))
+    i_stop = min(len(data), int(i_stop))
+    count = i_stop - i_start
+
+    # Small enough to draw 1:1.
+    if count <= max_points or max_points < 2:
+        return data[i_start:i_stop], float(i_start), 1.0
+
+    # Each bucket contributes a min and a max point.
+    num_buckets = max_points // 2
+    samples_per_bucket = count / num_buckets
+
+    # Pick the coarsest level that still resolves a single bucket.
+    block, src_min, src_max = 1, data, data
+    for level_block, level_min, level_max in (pyramid or []):
+        if level_block > samples_per_bucket:
+            break
+        block, src_min, src_max = level_block, level_min, level_max
+
+    j_start = i_start // block
+    j_stop = -(-i_stop // block)
+    group = -(-(j_stop - j_start) // num_buckets)
+
+    mins, maxs = _reduce_min_max(src_min[j_start:j_stop], src_max[j_start:j_stop], group)
+
+    # Interleave so the trace sweeps through both extremes of each bucket.
+    y = np.empty(len(mins) * 2, dtype=mins.dtype)
+    y[0::2] = mins
+    y[1::2] = maxs
+
+    bucket_width = group * block
+    x0 = j_start * block + bucket_width * 0.25
+    dx = bucket_width * 0.5
+
+    return y, x0, dx
+
+def apply_matched_filter(data, filter_type, length, beta=0.35, window=None):
     # Generates and applies a matched filter to the input data array.
+    # If window=(i_start, i_stop) is given, only that span is filtered (with a guard band
+    # so the edges match the full result) and just data[i_start:i_stop] is returned.
     # Returns the filtered numpy array.
 
     length = int(length)
+    
+    if window is not None:
+        i_start = max(0, int(window[0]))
+        i_stop = min(len(data), int(window[1]))
+        guard = length // 2 + 1
+        g_start = max(0, i_start - guard)
+        g_stop = min(len(data), i_stop + guard)
+        filtered = apply_matched_filter(data[g_start:g_stop], filter_type, length, beta)
+        return filtered[i_start - g_start : i_stop - g_start]
+    
     # Too small to filter
     if length < 2:
         return data
@@ -236,7 +552,8 @@ def apply_matched_filter(data, filter_type, length, beta=0.35):
         length += 1
         
     if filter_type == "Moving Average":
-        taps = np.ones(length) / length
+        # Flat taps reduce to a running sum, O(N) for any length.
+        return _moving_average_same(data, length)
         
     elif filter_type == "Gaussian":
         std = length / 6.0 
@@ -251,58 +568,207 @@ def apply_matched_filter(data, filter_type, length, beta=0.35):
         return data
 
     # Apply filter
-    filtered_data = np.convolve(data, taps, mode='same')
+    filtered_data = _convolve_same(data, taps)
     return filtered_data
 
+def _moving_average_same(data, length):
+    # Running-sum moving average, equivalent to np.convolve(data, ones/length, mode='same').
+    half = length // 2
+    
+    # Zero padding matches the implicit edges of convolve, the extra leading zero seeds the sum.
+    padded = np.concatenate((np.zeros(half + 1), data, np.zeros(half)))
+    csum = np.cumsum(padded)
+    
+    filtered = (csum[length:] - csum[:-length]) / length
+    return filtered.astype(_float_type(data), copy=False)
+
+def _float_type(data):
+    # Keeps single precision inputs in single precision to halve memory and FFT work.
+    return data.dtype if data.dtype in (np.float32, np.float64) else np.float64
+
+def _convolve_same(data, taps):
+    # Centered ('same') convolution using whichever of direct or overlap-add FFT is cheaper.
+    n = len(data)
+    l = len(taps)
+    
+    # Rough operation counts. Overlap-add works on blocks a few times the filter length.
+    direct_cost = n * l
+    fft_cost = n * 12 * np.log2(4 * l)
+    
+    taps = taps.astype(_float_type(data), copy=False)
+    if direct_cost <= fft_cost or n < l:
+        return scipy.signal.convolve(data, taps, mode='same', method='direct')
+    return scipy.signal.oaconvolve(data, taps, mode='same')
+
 def _generate_rrc(length, beta):
     # Generates Root-Raised Cosine (RRC) filter taps.
     # Length: Number of taps (should be odd).
     # Beta: Rolloff factor (0.0 to 1.0).
 
-    taps = np.zeros(length)
     # T represents the symbol duration, which we equate to the filter length
     T = length
     
     # Time vector centered at 0
-    t_vec = np.arange(-length // 2 + 1, length // 2 + 1)
+    t = np.arange(-length // 2 + 1, length // 2 + 1).astype(np.float64)
     
-    for i, t in enumerate(t_vec):
-        if t == 0.0:
-            taps[i] = 1.0 - beta + (4 * beta / np.pi)
-        
-        elif beta != 0 and t == T / (4 * beta):
-            taps[i] = (beta / np.sqrt(2)) * (((1 + 2 / np.pi) * (np.sin(np.pi / (4 * beta)))) + 
-                                             ((1 - 2 / np.pi) * (np.cos(np.pi / (4 * beta)))))
-        
-        elif beta != 0 and t == -T / (4 * beta):
-            taps[i] = (beta / np.sqrt(2)) * (((1 + 2 / np.pi) * (np.sin(np.pi / (4 * beta)))) + 
-                                             ((1 - 2 / np.pi) * (np.cos(np.pi / (4 * beta)))))
-        
-        else:
-            num = np.sin(np.pi * t * (1 - beta) / T) + 4 * beta * (t / T) * np.cos(np.pi * t * (1 + beta) / T)
-            den = np.pi * (t / T) * (1 - (4 * beta * t / T) ** 2)
-            taps[i] = num / den
+    # Singular points of the general expression.
+    is_zero = (t == 0.0)
+    if beta != 0:
+        is_edge = (t == T / (4 * beta)) | (t == -T / (4 * beta))
+    else:
+        is_edge = np.zeros(length, dtype=bool)
+    is_general = ~(is_zero | is_edge)
+    
+    taps = np.zeros(length)
+    taps[is_zero] = 1.0 - beta + (4 * beta / np.pi)
+    
+    if beta != 0:
+        taps[is_edge] = (beta / np.sqrt(2)) * (((1 + 2 / np.pi) * (np.sin(np.pi / (4 * beta)))) + 
+                                               ((1 - 2 / np.pi) * (np.cos(np.pi / (4 * beta)))))
+    
+    tg = t[is_general]
+    num = np.sin(np.pi * tg * (1 - beta) / T) + 4 * beta * (tg / T) * np.cos(np.pi * tg * (1 + beta) / T)
+    den = np.pi * (tg / T) * (1 - (4 * beta * tg / T) ** 2)
+    taps[is_general] = num / den
             
     # Normalize
     return taps / np.sqrt(np.sum(taps**2))
 
+def find_zero_crossings(analog_data, chunk_size=1 << 22):
+    # Indexes every zero crossing of a DC-centered signal in one chunked pass.
+    # Returns (crossing_idx, crossing_pos): the int64 index of the sample before each
+    # crossing and the float64 sub-sample crossing position (linear interpolation).
+    n = len(analog_data)
+    idx_parts = []
+    pos_parts = []
+    
+    for start in range(0, max(0, n - 1), chunk_size):
+        # Overlap by one sample so crossings on chunk boundaries are not lost.
+        chunk = analog_data[start:min(n, start + chunk_size + 1)]
+        sign = np.signbit(chunk)
+        c = np.flatnonzero(sign[1:] != sign[:-1])
+        
+        y0 = np.abs(chunk[c].astype(np.float64))
+        y1 = np.abs(chunk[c + 1].astype(np.float64))
+        span = y0 + y1
+        frac = np.divide(y0, span, out=np.zeros_like(y0), where=span != 0)
+        
+        idx_parts.append(c.astype(np.int64) + start)
+        pos_parts.append(c + start + frac)
+    
+    if not idx_parts:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float64)
+    return np.concatenate(idx_parts), np.concatenate(pos_parts)
+
+# Estimates the symbol rate from the spectral line of the squared derivative.
+# Transitions in the demod signal put a discrete tone at the symbol rate (and its
+# harmonics) into |x'|^2. The search runs at several block-average decimations so
+# heavily oversampled signals are not buried in differentiated noise, and each level
+# averages a bounded number of segments spread across the capture.
+# Returns the symbol rate in Hz, or 0.0 if no clock line stands out.
+def estimate_symbol_rate(analog_data, sr, fft_size=1 << 14, decimations=(1, 8, 64, 512), 
+                         samples_per_level=1 << 23, min_ratio=10.0):
+    candidates = []
+    for i, dec in enumerate(decimations):
+        # Each level covers 2.5 to 64 samples per symbol at its own rate; the last
+        # level takes everything slower.
+        max_sps = 64 if i < len(decimations) - 1 else None
+        rate, ratio = _find_clock_line(analog_data, sr, dec, fft_size, samples_per_level, max_sps)
+        if ratio >= min_ratio:
+            candidates.append((ratio, rate, dec))
+    
+    # A clock too fast for a coarse level folds back into its band. Reject coarse lines
+    # that are aliases of a line a finer level already found.
+    for ratio, rate, dec in sorted(candidates, reverse=True):
+        fs_dec = sr / dec
+        is_alias = False
+        for _, other, other_dec in candidates:
+            if other_dec >= dec:
+                continue
+            for folded in ((other - rate) % fs_dec, (other + rate) % fs_dec):
+                if min(folded, fs_dec - folded) < 0.01 * fs_dec:
+                    is_alias = True
+        if not is_alias:
+            return rate
+            
+    return 0.0
+
+# Searches one decimation level for the clock line.
+# Returns (rate, line-to-background ratio), or (0.0, 0.0) if none was found.
+def _find_clock_line(analog_data, sr, dec, fft_size, samples_per_level, max_sps, min_sps=2.5):
+    n = len(analog_data) // dec
+    if n < 1024:
+        return 0.0, 0.0
+    
+    # Keep at least 8 half-overlapped segments, since a single periodogram is too noisy
+    # to tell a line from chance.
+    fft_size = int(min(fft_size, 1 << int(np.floor(np.log2((n - 1) / 4.5)))))
+    num_segments = min(2 * (n - 1) // fft_size - 1, max(8, samples_per_level // (fft_size * dec)))
+    starts = np.linspace(0, n - 1 - fft_size, num_segments).astype(np.int64) * dec
+    window = np.hanning(fft_size).astype(np.float32)
+    power = np.zeros(fft_size // 2 + 1)
+    
+    for start in starts:
+        seg = analog_data[start:start + (fft_size + 1) * dec].astype(np.float32)
+        if dec > 1:
+            seg = seg.reshape(-1, dec).mean(axis=1)
+        seg = np.diff(seg)
+        seg *= seg
+        seg -= seg.mean()
+        spec = np.fft.rfft(seg * window)
+        
+        # Normalize each segment by its own background so noisy gaps between bursts
+        # cannot swamp the segments that carry the clock.
+        seg_power = spec.real ** 2 + spec.imag ** 2
+        power += seg_power / (np.median(seg_power) + 1e-30)
+    
+    # Lines stand out against the local background of the continuous spectrum.
+    background = scipy.signal.medfilt(power, 31) + 1e-30
+    ratio = power / background
+    
+    lo = 4 if max_sps is None else max(4, int(fft_size / max_sps))
+    hi = min(len(power) - 2, int(fft_size / min_sps))
+    if hi <= lo:
+        return 0.0, 0.0
+    band = ratio[lo:hi]
+    peak_ratio = band.max()
+    if peak_ratio < 4.0:
+        return 0.0, 0.0
+    
+    # Harmonics can be as strong as the fundamental, so take the lowest strong line.
+    k = lo + int(np.flatnonzero(band >= 0.5 * peak_ratio)[0])
+    k = k - 1 + int(np.argmax(power[k - 1:k + 2]))
+    
+    # Parabolic interpolation on log power for a sub-bin peak.
+    a, b, c = np.log(power[k - 1:k + 2] + 1e-30)
+    denom = a - 2 * b + c
+    offset = 0.5 * (a - c) / denom if denom != 0 else 0.0
+    return float((k + offset) * sr / (fft_size * dec)), float(ratio[k])
+
 # Extracts clock timings using a proportional phase-locked loop (PLL) on zero-crossings.
 # Assumes analog_data is already DC-centered (CFO corrected).
-def find_clock_sync(analog_data, sr, start_time, current_width, current_count, alpha=0.25, limit_time=None):
+def find_clock_sync(analog_data, sr, start_time, current_width, current_count, alpha=0.25, limit_time=None, 
+                    crossings=None):
     # Extracts clock timings using a proportional phase-locked loop (PLL) on zero-crossings.
     # Assumes analog_data is already DC-centered (CFO corrected).
+    # crossings: optional precomputed output of find_zero_crossings(analog_data).
 
     # Establish the manual seed
     sps_time = current_width / current_count
     manual_boundary = start_time + current_width
-    
-    clock_centers = []
 
     beta = alpha / 10.0
     
     # Generate the manual symbol centers (half an SPS offset from the edges)
-    for i in range(current_count):
-        clock_centers.append(start_time + (i + 0.5) * sps_time)
+    manual_centers = start_time + (np.arange(current_count) + 0.5) * sps_time
+    clock_centers = []
+    
+    # Every step of the loop is a lookup into the crossing index instead of a window scan.
+    if crossings is None:
+        crossings = find_zero_crossings(analog_data)
+    crossing_idx = crossings[0].tolist()
+    crossing_pos = crossings[1].tolist()
+    num_crossings = len(crossing_idx)
         
     # Setup PLL
     cursor_edge_t = manual_boundary
@@ -311,8 +777,6 @@ def find_clock_sync(analog_data, sr, start_time, current_width, current_count, a
     limit_idx = len(analog_data)
     if limit_time is not None:
         limit_idx = min(limit_idx, int(limit_time * sr))
-        
-    added_symbols = 0
     
     # Run the loop
     while True:
@@ -331,27 +795,20 @@ def find_clock_sync(analog_data, sr, start_time, current_width, current_count, a
         
         if w_start >= w_stop:
             break
+        
+        # Nearest indexed crossing on either side of the expected edge that lies in the window.
+        # Ties go to the earlier crossing.
+        j = bisect.bisect_left(crossing_idx, expected_edge_idx)
+        best = -1
+        if j > 0 and crossing_idx[j - 1] >= w_start:
+            best = j - 1
+        if j < num_crossings and crossing_idx[j] <= w_stop - 2:
+            if best < 0 or crossing_idx[j] - expected_edge_idx < expected_edge_idx - crossing_idx[best]:
+                best = j
             
-        # Find zero crossings
-        chunk = analog_data[w_start:w_stop]
-        crossings = np.where(np.diff(np.signbit(chunk)))[0]
-        
-        if len(crossings) > 0:
-            # Find the crossing closest to our expected edge
-            relative_target = expected_edge_idx - w_start
-            best_idx = (np.abs(crossings - relative_target)).argmin()
-            
-            # Linear interpolation of zero crossing
-            c_idx = crossings[best_idx]
-            y0 = chunk[c_idx]
-            y1 = chunk[c_idx + 1]
-            span = abs(y0) + abs(y1)
-            
-            frac_offset = 0.0 if span == 0 else abs(y0) / span
-            
-            # Add frac_offset to get the exact continuous index
-            actual_edge_idx_float = w_start + c_idx + frac_offset 
-            actual_edge_t = actual_edge_idx_float / sr
+        if best >= 0:
+            # Interpolated continuous index of the crossing
+            actual_edge_t = crossing_pos[best] / sr
             
             # Proportional error calculation
             error_t = actual_edge_t - expected_edge_t
@@ -373,9 +830,296 @@ def find_clock_sync(analog_data, sr, start_time, current_width, current_count, a
         center_t = cursor_edge_t - (current_sps_t / 2.0)
         clock_centers.append(center_t)
         
-        added_symbols += 1
+    return True, np.concatenate((manual_centers, clock_centers)), manual_boundary
+
+# Recovers symbol timing without a manual seed using a Gardner or Mueller-Muller error detector.
+# sps only needs to be roughly right; the loop tracks both phase and period.
+def recover_symbol_timing(analog_data, sr, sps, detector='Gardner', alpha=0.25, start_time=0.0, 
+                          limit_time=None, block_symbols=32, max_deviation=0.1, crossings=None):
+    # Strobes are placed a block of symbols at a time and sampled with a linear
+    # fractional interpolator. Each block's mean timing error is fed back into a PI loop
+    # and the block is re-sampled at the corrected positions, so the loop costs a
+    # handful of array ops per block instead of a Python step per symbol.
+    # Returns the clock centers in seconds.
+    n = len(analog_data)
+    limit_idx = n
+    if limit_time is not None:
+        limit_idx = min(limit_idx, int(limit_time * sr))
+    start_idx = max(0.0, start_time * sr)
+    
+    if sps < 2 or limit_idx - start_idx < 2 * sps:
+        return np.zeros(0)
+    
+    nominal_sps = float(sps)
+    # Critically damped second-order loop: the period gain is the square of the phase gain over 4.
+    kp = alpha / 2.0
+    ki = kp * kp / 4.0
+    grid = np.arange(block_symbols, dtype=np.float64)
+    
+    # Acquire phase and period from the zero crossings near the start, so the tracking
+    # loop only has to follow slow drift.
+    if crossings is None:
+        acq_stop = int(min(limit_idx, start_idx + 256 * nominal_sps))
+        _, cross_pos = find_zero_crossings(analog_data[int(start_idx):acq_stop])
+        cross_pos = cross_pos + int(start_idx)
+    else:
+        lo, hi = np.searchsorted(crossings[1], [start_idx, start_idx + 256 * nominal_sps])
+        cross_pos = crossings[1][lo:hi]
+        
+    edge, period = _fit_crossing_grid(cross_pos, start_idx, nominal_sps)
+    if abs(period - nominal_sps) > max_deviation * nominal_sps:
+        period = nominal_sps
+    first = start_idx + ((edge + period / 2.0 - start_idx) % period)
+    
+    centers = []
+    prev_y = None
+    
+    while first < limit_idx - 1:
+        count = min(block_symbols, int((limit_idx - 1 - first) / period) + 1)
+        positions = first + grid[:count] * period
+        
+        y = _interp_linear(analog_data, positions)
+        y_prev = np.empty_like(y)
+        y_prev[1:] = y[:-1]
+        y_prev[0] = y[0] if prev_y is None else prev_y
+        rms = np.sqrt(np.mean(y * y))
+        
+        # Positive error means the strobes are late.
+        if rms == 0:
+            error = 0.0
+        elif detector == 'Gardner':
+            y_mid = _interp_linear(analog_data, positions - period / 2.0)
+            weight = np.abs(y - y_prev)
+            error = np.sum((y - y_prev) * y_mid) / (np.sum(weight) * rms + 1e-12)
+        else:
+            d = np.sign(y)
+            d_prev = np.sign(y_prev)
+            weight = np.abs(d - d_prev)
+            error = np.sum(d * y_prev - d_prev * y) / (np.sum(weight) * rms + 1e-12)
+        error = max(-1.0, min(1.0, error))
+        
+        # Correct this block's strobes and re-sample them before moving on.
+        if error != 0.0:
+            positions = positions - kp * error * period
+            y = _interp_linear(analog_data, positions)
+        
+        # Walk the period toward the measured drift, within the allowed deviation.
+        period -= ki * error * period
+        period = min(max(period, nominal_sps * (1 - max_deviation)), nominal_sps * (1 + max_deviation))
+        
+        positions = positions[positions < limit_idx - 1]
+        if len(positions) == 0:
+            break
+        centers.append(positions)
+        prev_y = y[len(positions) - 1]
+        first = positions[-1] + period
+        
+    if not centers:
+        return np.zeros(0)
+    return np.concatenate(centers) / sr
+
+# Fits a regular edge grid (edge + n * period) to crossing positions near the start.
+# A first period comes from short crossing intervals (whole multiples of the symbol
+# period), then a least-squares fit over a widening span refines period and edge.
+# Returns (edge, period), falling back to the inputs when there are too few crossings.
+def _fit_crossing_grid(cross_pos, origin, period, spans=(16, 32, 64, 128, 256)):
+    if len(cross_pos) == 0:
+        return origin, period
+    
+    intervals = np.diff(cross_pos)
+    n = np.round(intervals / period)
+    ok = (n >= 1) & (n <= 4) & (np.abs(intervals - n * period) < period / 4.0)
+    if np.count_nonzero(ok) >= 3:
+        period = np.sum(intervals[ok]) / np.sum(n[ok])
+    
+    # Circular mean of the crossing phase is a noise-tolerant first edge estimate.
+    first_span = cross_pos[cross_pos < origin + spans[0] * period]
+    if len(first_span) == 0:
+        first_span = cross_pos
+    angles = 2 * np.pi * (first_span - origin) / period
+    edge = origin + (np.angle(np.mean(np.exp(1j * angles))) / (2 * np.pi)) * period
+    
+    for span in spans:
+        sel = cross_pos[cross_pos < origin + span * period]
+        n = np.round((sel - edge) / period)
+        
+        # Crossings pulled far off the grid by ISI or noise would skew the fit.
+        residual = sel - (edge + n * period)
+        inliers = np.abs(residual) < period / 4.0
+        used = n[inliers]
+        if len(np.unique(used)) < 3 or used.max() - used.min() < span / 2:
+            continue
+        period, edge = np.polyfit(used, sel[inliers], 1)
         
-    return True, np.array(clock_centers), manual_boundary
+    return edge, period
+
+# Linearly interpolates data at fractional sample positions (clamped to the array).
+def _interp_linear(data, positions):
+    idx = np.clip(positions.astype(np.int64), 0, len(data) - 2)
+    frac = positions - idx
+    if data.dtype.kind == 'f':
+        frac = frac.astype(data.dtype)
+    y0 = data[idx]
+    return y0 + (data[idx + 1] - y0) * frac
+
+# Rebuilds the symbol edges (boundaries between consecutive clock centers) for display.
+# Returns len(centers) + 1 edges, extrapolating half a symbol at both ends.
+def centers_to_edges(centers):
+    centers = np.asarray(centers, dtype=np.float64)
+    if len(centers) < 2:
+        return centers.copy()
+    edges = np.empty(len(centers) + 1)
+    edges[1:-1] = (centers[:-1] + centers[1:]) / 2.0
+    edges[0] = centers[0] - (centers[1] - centers[0]) / 2.0
+    edges[-1] = centers[-1] + (centers[-1] - centers[-2]) / 2.0
+    return edges
+
+def compute_eye_histogram(analog_data, centers, value_range, bins_per_symbol=64, y_bins=128, span=2.0,
+                          points_per_symbol=8, chunk_symbols=1 << 16):
+    # Folds the signal on the symbol clock into a 2-D density (eye diagram).
+    # centers are symbol centers in (fractional) samples. Each symbol is read (linearly interpolated)
+    # at points_per_symbol phases across its own period (the shorter gap to a neighbour, so the
+    # gaps between bursts do not stretch it), with a per-symbol dither so that many
+    # traces together fill every column. The single-symbol fold is then tiled out to span symbols.
+    # Chunks of centers can be passed in separately and the counts summed.
+    # Returns int64 counts of shape (round(span * bins_per_symbol), y_bins), x from -span/2 to +span/2.
+    centers = np.asarray(centers, dtype=np.float64)
+    folded = np.zeros((bins_per_symbol + 2) * (y_bins + 2), dtype=np.int64)
+    n = len(analog_data)
+    
+    lo, hi = float(value_range[0]), float(value_range[1])
+    if hi - lo < 1e-12:
+        hi = lo + 1.0
+    y_scale = np.float32(y_bins / (hi - lo))
+    
+    periods = local_symbol_periods(centers)
+    grid = np.arange(points_per_symbol, dtype=np.float32) / points_per_symbol - np.float32(0.5)
+    
+    for start in range(0, len(centers), chunk_symbols):
+        pos = centers[start:start + chunk_symbols]
+        
+        # Golden-ratio dither per symbol spreads the phases evenly over the traces.
+        dither = ((np.arange(start, start + len(pos)) * 0.6180339887) % 1.0 / points_per_symbol).astype(np.float32)
+        phase = grid[None, :] + dither[:, None]
+        
+        # Integer base per symbol keeps the per-point offsets small enough for float32.
+        base = np.floor(pos)
+        rel = (pos - base).astype(np.float32)[:, None] + periods[start:start + chunk_symbols, None].astype(np.float32) * phase
+        step = np.floor(rel)
+        idx = base.astype(np.intp)[:, None] + step.astype(np.intp)
+        np.clip(idx, 0, n - 2, out=idx)
+        y0 = analog_data[idx]
+        vals = y0 + (analog_data[idx + 1] - y0) * (rel - step)
+        
+        # Out-of-range points land in a guard row/column that is cropped afterwards.
+        y = ((vals - np.float32(lo)) * y_scale).astype(np.intp)
+        np.clip(y + 1, 0, y_bins + 1, out=y)
+        x = ((phase + np.float32(0.5)) * np.float32(bins_per_symbol)).astype(np.intp)
+        np.clip(x + 1, 0, bins_per_symbol + 1, out=x)
+        x *= y_bins + 2
+        x += y
+        folded += np.bincount(x.ravel(), minlength=folded.size)
+        
+    folded = folded.reshape(bins_per_symbol + 2, y_bins + 2)[1:-1, 1:-1]
+    
+    # Column c sits at phase (c + 0.5) / bins_per_symbol - span / 2, which wraps into the fold.
+    cols = np.arange(int(round(span * bins_per_symbol)))
+    fold_idx = np.floor(((cols + 0.5) / bins_per_symbol - span / 2.0 + 0.5) % 1.0 * bins_per_symbol).astype(np.intp)
+    return folded[np.clip(fold_idx, 0, bins_per_symbol - 1)]
+
+def _split_two_clusters(values):
+    # Splits values at the two-cluster threshold of their histogram.
+    # Returns (threshold, separation), the separation being the distance between the
+    # cluster means in units of the pooled within-cluster standard deviation.
+    counts, edges = compute_value_histogram(values, num_bins=256)
+    threshold = estimate_thresholds(counts, edges, 2)[0][0]
+    low = values[values <= threshold]
+    high = values[values > threshold]
+    if len(low) == 0 or len(high) == 0:
+        return threshold, 0.0
+    spread = np.sqrt((np.sum(np.square(low - low.mean())) + np.sum(np.square(high - high.mean()))) / len(values))
+    return threshold, (high.mean() - low.mean()) / (spread + 1e-12)
+
+# Activity metrics understood by detect_bursts, in UI order.
+BURST_METRICS = ('Smoothness', 'Variance')
+
+def detect_bursts(analog_data, block_size=64, metric='Smoothness', min_gap_blocks=8, min_burst_blocks=8,
+                  min_separation=4.0, chunk_size=1 << 20):
+    # Splits a demod signal into bursts using a per-block activity measure.
+    # Variance is the block variance, high while an ASK/OOK burst toggles its carrier.
+    # Smoothness is power over derivative power, high while a clean FSK/PSK burst
+    # holds its levels and low in noise.
+    # The active/idle boundary is the two-cluster split of the log activity histogram.
+    # If the clusters are closer than min_separation pooled standard deviations, the
+    # signal has no idle level and comes back as a single burst spanning all of it.
+    # Returns an int64 array of shape (num_bursts, 2) with [start, stop) sample indices.
+    num_blocks = len(analog_data) // block_size
+    if num_blocks < 2:
+        return np.zeros((0, 2), dtype=np.int64)
+    
+    activity = np.empty(num_blocks)
+    rows_per_chunk = max(1, chunk_size // block_size)
+    for row in range(0, num_blocks, rows_per_chunk):
+        stop_row = min(num_blocks, row + rows_per_chunk)
+        blocks = analog_data[row * block_size:stop_row * block_size].reshape(-1, block_size)
+        if metric == 'Variance':
+            activity[row:stop_row] = np.var(blocks, axis=1, dtype=np.float64)
+        else:
+            power = np.mean(np.square(blocks, dtype=np.float64), axis=1)
+            slope = np.mean(np.square(np.diff(blocks, axis=1), dtype=np.float64), axis=1)
+            activity[row:stop_row] = np.log10(power + 1e-30) - np.log10(slope + 1e-30)
+    
+    # A short moving average keeps single noisy blocks from flipping the decision.
+    # Variance is averaged before the log, so a single block holding the only transition
+    # in a run of equal OOK symbols is not drowned by its flat neighbours.
+    activity = np.convolve(activity, np.ones(3) / 3.0, mode='same')
+    if metric == 'Variance':
+        activity = np.log10(activity + 1e-30)
+    
+    # A gapless signal has a single activity cluster, which any split would cut in two.
+    threshold, separation = _split_two_clusters(activity)
+    if separation < min_separation:
+        return np.array([[0, len(analog_data)]], dtype=np.int64)
+    active = activity > threshold
+    
+    # Run boundaries of the active mask.
+    change = np.diff(np.concatenate(([0], active.astype(np.int8), [0])))
+    starts = np.flatnonzero(change == 1)
+    stops = np.flatnonzero(change == -1)
+    if len(starts) == 0:
+        return np.zeros((0, 2), dtype=np.int64)
+    
+    # Bridge short dropouts, then drop runs too short to be a burst.
+    keep = (starts[1:] - stops[:-1]) >= min_gap_blocks
+    starts = starts[np.concatenate(([True], keep))]
+    stops = stops[np.concatenate((keep, [True]))]
+    long_enough = (stops - starts) >= min_burst_blocks
+    
+    # The smoothing spreads each run by about a block on either side; take that back
+    # so the bursts start and end on active blocks.
+    bursts = np.stack((starts[long_enough] + 1, stops[long_enough] - 1), axis=1)
+    return bursts.astype(np.int64) * block_size
+
+def recover_bursts(analog_data, sr, bursts, sps, detector='Gardner', alpha=0.25, max_workers=None):
+    # Runs seedless timing recovery on each burst, in parallel when worthwhile.
+    # Workers are spawned rather than forked so they never inherit GUI threads.
+    # Only the clock is recovered; the caller samples the symbols on the joined clock.
+    # Returns a list of symbol center arrays per burst, in seconds from the start of analog_data.
+    tasks = [(analog_data[start:stop], sr, sps, detector, alpha) for start, stop in bursts]
+    
+    if len(tasks) < 4 or sum(len(t[0]) for t in tasks) < (1 << 20):
+        results = [_recover_burst(task) for task in tasks]
+    else:
+        ctx = multiprocessing.get_context('spawn')
+        with concurrent.futures.ProcessPoolExecutor(max_workers=max_workers, mp_context=ctx) as pool:
+            results = list(pool.map(_recover_burst, tasks, chunksize=max(1, len(tasks) // 32)))
+    
+    return [centers + start / sr for (start, _), centers in zip(bursts, results)]
+
+def _recover_burst(task):
+    # Process pool worker for recover_bursts; works on a single burst.
+    segment, sr, sps, detector, alpha = task
+    return recover_symbol_timing(segment, sr, sps, detector=detector, alpha=alpha)
 
 def remove_dc_bias(analog_data, thresholds):
     # Centers the analog data around 0.0 using the middle threshold (CFO correction).
@@ -395,12 +1139,17 @@ def remove_dc_bias(analog_data, thresholds):
 
 def sample_and_slice(analog_data, timestamps, sr, thresholds):
     #Samples analog data at specific timestamps and digitizes into integer symbols.
+    # Kept for callers that want the nearest-sample behavior; see sample_symbols.
+    return sample_symbols(analog_data, timestamps, sr, thresholds, method='Nearest')[1]
 
-    # Convert timestamps to indices, safely clipped to array bounds
-    indices = np.clip(np.array(timestamps) * sr, 0, len(analog_data) - 1).astype(int)
-    
-    # Sample the continuous wave
-    analog_samples = analog_data[indices]
+# Interpolation methods understood by interpolate_samples, in UI order.
+SAMPLER_METHODS = ('Linear', 'Cubic', 'Farrow', 'Nearest')
+
+def sample_symbols(analog_data, timestamps, sr, thresholds, method='Linear'):
+    # Samples analog data at float timestamps (s) between samples and digitizes them.
+    # Returns (soft, symbols): the interpolated analog values and the integer symbols.
+    positions = np.asarray(timestamps, dtype=np.float64) * sr
+    soft = interpolate_samples(analog_data, positions, method)
     
     # Slice based on thresholds
     if not thresholds:
@@ -408,4 +1157,98 @@ def sample_and_slice(analog_data, timestamps, sr, thresholds):
     else:
         thresh = thresholds
         
-    return np.digitize(analog_samples, thresh)
+    return soft, np.digitize(soft, thresh)
+
+def sweep_sampling_phase(analog_data, timestamps, sr, thresholds, num_offsets=32, method='Linear',
+                         tolerance=0.02, chunk_symbols=1 << 16):
+    # Samples every symbol at num_offsets phases across its own period in one gather per chunk
+    # and scores each phase by the mean distance of the samples from the nearest threshold.
+    # The period of each symbol is the shorter gap to a neighbour, so gaps between bursts
+    # do not stretch it. Flat-topped symbols score alike over a plateau, so the best offset
+    # is the middle of the (circular) run of phases within tolerance of the top score.
+    # Returns (best, offsets, scores): offsets in symbols from -0.5 to 0.5 and the score of each.
+    timestamps = np.asarray(timestamps, dtype=np.float64)
+    offsets = np.arange(num_offsets) / num_offsets - 0.5
+    scores = np.zeros(num_offsets)
+    if len(timestamps) < 2:
+        return 0.0, offsets, scores
+        
+    thresh = np.sort(np.asarray(thresholds if thresholds else [0.0], dtype=np.float64))
+    periods = local_symbol_periods(timestamps) * sr
+    
+    for start in range(0, len(timestamps), chunk_symbols):
+        pos = timestamps[start:start + chunk_symbols] * sr
+        grid = pos[:, None] + periods[start:start + chunk_symbols, None] * offsets
+        values = interpolate_samples(analog_data, grid.ravel(), method).reshape(grid.shape)
+        
+        # Distance to the nearest threshold: only the two around each value can be closest.
+        slot = np.searchsorted(thresh, values)
+        above = thresh[np.minimum(slot, len(thresh) - 1)]
+        below = thresh[np.maximum(slot - 1, 0)]
+        margin = np.minimum(np.abs(values - above), np.abs(values - below))
+        scores += margin.sum(axis=0)
+    scores /= len(timestamps)
+    
+    # Walk out from the top score both ways while the neighbours stay on the plateau.
+    peak = int(np.argmax(scores))
+    floor = scores[peak] - tolerance * (scores[peak] - scores.min())
+    left = right = 0
+    while left < num_offsets - 1 and scores[(peak - left - 1) % num_offsets] >= floor:
+        left += 1
+    while right < num_offsets - 1 - left and scores[(peak + right + 1) % num_offsets] >= floor:
+        right += 1
+    best = offsets[peak] + (right - left) / (2.0 * num_offsets)
+    best = (best + 0.5) % 1.0 - 0.5
+    
+    return best, offsets, scores
+
+def local_symbol_periods(timestamps):
+    # Per-symbol period as the shorter gap to either neighbour.
+    # Returns an array the length of timestamps (zeros if there are fewer than two).
+    timestamps = np.asarray(timestamps, dtype=np.float64)
+    if len(timestamps) < 2:
+        return np.zeros(len(timestamps))
+    gaps = np.diff(timestamps)
+    return np.minimum(np.append(gaps[0], gaps), np.append(gaps, gaps[-1]))
+
+def interpolate_samples(data, positions, method='Linear'):
+    # Evaluates data at fractional sample positions, clamped to the array.
+    # Nearest truncates like the original slicer, Linear uses two samples, Cubic is a
+    # Catmull-Rom spline and Farrow a cubic Lagrange interpolator in Farrow form.
+    # Returns float values with the dtype of data.
+    n = len(data)
+    positions = np.clip(np.asarray(positions, dtype=np.float64), 0, n - 1)
+    
+    if method == 'Nearest' or n < 2:
+        return data[positions.astype(np.int64)]
+    if method == 'Linear' or n < 4:
+        return _interp_linear(data, positions)
+    
+    # Four-point kernels use samples idx-1 .. idx+2 around the interval [idx, idx+1].
+    idx = np.clip(positions.astype(np.int64), 1, n - 3)
+    mu = positions - idx
+    if data.dtype.kind == 'f':
+        mu = mu.astype(data.dtype)
+    ym1 = data[idx - 1]
+    y0 = data[idx]
+    y1 = data[idx + 1]
+    y2 = data[idx + 2]
+    
+    if method == 'Cubic':
+        a = -0.5 * ym1 + 1.5 * y0 - 1.5 * y1 + 0.5 * y2
+        b = ym1 - 2.5 * y0 + 2.0 * y1 - 0.5 * y2
+        c = -0.5 * ym1 + 0.5 * y1
+    else:
+        # Farrow coefficients of the cubic Lagrange polynomial through the 4 samples.
+        a = (-ym1 + 3.0 * y0 - 3.0 * y1 + y2) / 6.0
+        b = 0.5 * ym1 - y0 + 0.5 * y1
+        c = -ym1 / 3.0 - 0.5 * y0 + y1 - y2 / 6.0
+        
+    # Horner evaluation in mu.
+    out = ((a * mu + b) * mu + c) * mu + y0
+    
+    # The first and last intervals lack a neighbor on one side, so fall back to linear there.
+    edge = (positions < 1) | (positions > n - 2)
+    if np.any(edge):
+        out[edge] = _interp_linear(data, positions[edge])
+    return out
@@ -1,3 +1,7 @@
+import concurrent.futures
+import hashlib
+import multiprocessing
+
 import numpy as np
 
 def invert_symbols(symbols, modulus):
@@ -39,53 +43,1123 @@ def generate_mapping_dict(num_levels, mode='binary'):
         
     return mapping
 
+# Text characters understood by the bit workbench: 0 and 1 are bits, whitespace is
+# layout and anything else (normally "E") marks an erased / unknown bit.
+_CHAR_CODES = np.full(256, 2, dtype=np.int8)
+_CHAR_CODES[ord('0')] = 0
+_CHAR_CODES[ord('1')] = 1
+for _c in ' \t\r\n':
+    _CHAR_CODES[ord(_c)] = -1
+
+def _parse_bit_codes(text):
+    # Converts text to codes: 0/1 for bits and 2 for erasures, with whitespace dropped.
+    raw = np.frombuffer(text.encode('ascii', errors='replace'), dtype=np.uint8)
+    codes = _CHAR_CODES[raw]
+    return codes[codes >= 0]
+
+class BitBuffer:
+    # Packed bit array used as the workbench data model.
+    # data holds the bits MSB-first (np.packbits layout) with the unused tail bits zeroed.
+    # erasures is an optional packed mask of the same layout for bits that are unknown
+    # (unmapped symbols, line code violations). Erased bits are stored as 0.
+    def __init__(self, data=None, length=0, erasures=None):
+        self.data = np.zeros(0, dtype=np.uint8) if data is None else data
+        self.length = int(length)
+        self.erasures = erasures
+        self._clear_tail()
+
+    @classmethod
+    def from_bits(cls, bits, erasures=None):
+        # Builds a buffer from an array of 0/1 values and an optional boolean erasure mask.
+        bits = np.asarray(bits, dtype=bool)
+        if erasures is not None:
+            erasures = np.asarray(erasures, dtype=bool)
+            if erasures.any():
+                bits = bits & ~erasures
+                return cls(np.packbits(bits), len(bits), np.packbits(erasures))
+        return cls(np.packbits(bits), len(bits))
+
+    @classmethod
+    def from_string(cls, text):
+        # Parses workbench text (whitespace ignored, non 0/1 characters become erasures).
+        codes = _parse_bit_codes(text)
+        return cls.from_bits(codes == 1, codes == 2)
+
+    def __len__(self):
+        return self.length
+
+    def _clear_tail(self):
+        # Keeps the padding bits of the last byte at zero so bytes compare and export cleanly.
+        spare = (-self.length) % 8
+        if spare:
+            mask = (0xFF << spare) & 0xFF
+            self.data[-1] &= mask
+            if self.erasures is not None:
+                self.erasures[-1] &= mask
+
+    def to_bits(self):
+        # Returns the bits as a uint8 array of 0/1 (erased bits read as 0).
+        return np.unpackbits(self.data, count=self.length)
+
+    def erasure_mask(self):
+        # Returns a boolean mask of erased bits, or None if there are none.
+        if self.erasures is None:
+            return None
+        return np.unpackbits(self.erasures, count=self.length).astype(bool)
+
+    def erasure_count(self):
+        if self.erasures is None:
+            return 0
+        return int(np.unpackbits(self.erasures, count=self.length).sum())
+
+    def to_string(self):
+        # Renders the buffer as workbench text ("0", "1" and "E").
+        chars = self.to_bits() + np.uint8(ord('0'))
+        mask = self.erasure_mask()
+        if mask is not None:
+            chars[mask] = ord('E')
+        return chars.tobytes().decode('ascii')
+
+    def tobytes(self):
+        # Packed bytes, zero padded at the end (erased bits export as 0).
+        return self.data.tobytes()
+
+    def copy(self):
+        erasures = None if self.erasures is None else self.erasures.copy()
+        return BitBuffer(self.data.copy(), self.length, erasures)
+
+    def invert(self):
+        # Returns a copy with every known bit flipped. Erasures stay erased.
+        data = np.invert(self.data)
+        if self.erasures is not None:
+            data &= np.invert(self.erasures)
+        erasures = None if self.erasures is None else self.erasures.copy()
+        return BitBuffer(data, self.length, erasures)
+
+    def slice(self, start, stop=None):
+        # Returns bits [start, stop) as a new buffer, with Python slice bounds semantics.
+        start, stop, _ = slice(start, stop).indices(self.length)
+        stop = max(start, stop)
+        erasures = None if self.erasures is None else _slice_packed(self.erasures, start, stop)
+        return BitBuffer(_slice_packed(self.data, start, stop), stop - start, erasures)
+
+    def splice(self, start, stop, insert=None):
+        # Returns a copy with bits [start, stop) replaced by the insert buffer (or removed).
+        parts = [self.slice(0, start)]
+        if insert is not None:
+            parts.append(insert)
+        parts.append(self.slice(stop))
+        return BitBuffer.concatenate(parts)
+
+    @staticmethod
+    def concatenate(buffers):
+        # Joins buffers end to end. Unaligned joins shift the packed bytes, never unpack them.
+        data = np.zeros(0, dtype=np.uint8)
+        erasures = None
+        length = 0
+        has_erasures = any(b.erasures is not None for b in buffers)
+        if has_erasures:
+            erasures = np.zeros(0, dtype=np.uint8)
+            
+        for b in buffers:
+            if len(b) == 0: continue
+            data = _append_packed(data, length, b.data)
+            if has_erasures:
+                other = b.erasures if b.erasures is not None else np.zeros_like(b.data)
+                erasures = _append_packed(erasures, length, other)
+            length += len(b)
+            
+        n_bytes = (length + 7) // 8
+        if erasures is not None:
+            erasures = erasures[:n_bytes]
+        return BitBuffer(data[:n_bytes], length, erasures)
+
+def _slice_packed(packed, start, stop):
+    # Cuts bits [start, stop) out of a packed array. Byte aligned starts are a plain byte
+    # copy, anything else combines each byte with the top bits of the next one.
+    first, last = start // 8, (stop + 7) // 8
+    if start % 8 == 0:
+        return packed[first:last].copy()
+    offset = start % 8
+    n_bytes = (stop - start + 7) // 8
+    head = packed[first:first + n_bytes]
+    tail = np.zeros(n_bytes, dtype=np.uint8)
+    nxt = packed[first + 1:first + 1 + n_bytes]
+    tail[:len(nxt)] = nxt
+    return (head << offset) | (tail >> (8 - offset))
+
+def _append_packed(packed, length, other):
+    # Appends the packed bits of other after the first length bits of packed.
+    # Both must have their padding bits zeroed. Returns the joined packed array.
+    packed = packed[:(length + 7) // 8]
+    shift = length % 8
+    if shift == 0:
+        return np.concatenate([packed, other])
+    out = np.empty(len(packed) + len(other), dtype=np.uint8)
+    out[:len(packed)] = packed
+    out[len(packed) - 1] |= other[0] >> shift
+    out[len(packed):] = other << (8 - shift)
+    out[len(packed):-1] |= other[1:] >> shift
+    return out
+
 def map_symbols_to_bits(symbols, mapping_dict):
-    # Maps integer symbols (or diff transitions) to bit strings using a dictionary.
-    # Returns a single concatenated string for the bit workbench.
+    # Maps integer symbols (or diff transitions) to bits using a dictionary of bit strings.
+    # Symbols missing from the dictionary become a single erased bit ("E").
+    # Returns a BitBuffer for the bit workbench.
+    if symbols is None or len(symbols) == 0 or not mapping_dict:
+        return BitBuffer()
+    symbols = np.asarray(symbols)
+    
+    # One table row per dictionary entry, plus a final row for unmapped symbols.
+    keys = np.array(sorted(mapping_dict), dtype=np.int64)
+    rows = [_parse_bit_codes(mapping_dict[k]) for k in keys] + [np.array([2], dtype=np.int8)]
+    lengths = np.array([len(r) for r in rows], dtype=np.int64)
+    table = np.zeros((len(rows), max(1, lengths.max())), dtype=np.int8)
+    for i, r in enumerate(rows):
+        table[i, :len(r)] = r
     
-    if symbols is None or len(symbols) == 0:
-        return ""
+    pos = np.minimum(np.searchsorted(keys, symbols), len(keys) - 1)
+    row = np.where(keys[pos] == symbols, pos, len(keys))
+    
+    if np.all(lengths[row[0]] == lengths[row]):
+        # Fixed width (the usual case): a plain gather.
+        codes = table[row, :lengths[row[0]]].ravel()
+    else:
+        counts = lengths[row]
+        starts = np.cumsum(counts) - counts
+        within = np.arange(counts.sum()) - np.repeat(starts, counts)
+        codes = table[np.repeat(row, counts), within]
         
-    # Initialize output array of object type (strings) with a fallback character.
-    # "E" indicates an unmapped symbol error.
-    full_text_arr = np.full(len(symbols), 'E', dtype=object)
+    return BitBuffer.from_bits(codes == 1, codes == 2)
+
+# Line codes understood by decode_line_code, in UI order.
+LINE_CODES = ('Manchester (IEEE)', 'Manchester (Thomas)', 'Differential Manchester')
+
+def _pair_tables():
+    # Lookup tables from two packed bytes (8 bit pairs, MSB first) to one output byte.
+    # FIRST/SECOND collect the first/second half of each pair, SAME flags pairs without
+    # a transition and ANY pairs with at least one bit set.
+    word = np.arange(1 << 16)
+    tables = [np.zeros(1 << 16, dtype=np.uint8) for _ in range(4)]
+    for k in range(8):
+        hi = (word >> (15 - 2 * k)) & 1
+        lo = (word >> (14 - 2 * k)) & 1
+        for table, bit in zip(tables, (hi, lo, hi == lo, hi | lo)):
+            table |= (bit.astype(np.uint8) << (7 - k)).astype(np.uint8)
+    return tables
+
+_PAIR_FIRST, _PAIR_SECOND, _PAIR_SAME, _PAIR_ANY = _pair_tables()
+
+def count_bits(packed):
+    # Number of set bits in a packed array (SWAR popcount over 64-bit words).
+    words = np.zeros((len(packed) + 7) // 8 * 8, dtype=np.uint8)
+    words[:len(packed)] = packed
+    x = words.view(np.uint64)
+    x = x - ((x >> np.uint64(1)) & np.uint64(0x5555555555555555))
+    x = (x & np.uint64(0x3333333333333333)) + ((x >> np.uint64(2)) & np.uint64(0x3333333333333333))
+    x = (x + (x >> np.uint64(4))) & np.uint64(0x0F0F0F0F0F0F0F0F)
+    return int(((x * np.uint64(0x0101010101010101)) >> np.uint64(56)).sum())
+
+def _shift_left_packed(data):
+    # Drops the first bit of a packed array (the next byte's MSB moves in at the end).
+    carry = np.zeros_like(data)
+    carry[:-1] = data[1:] >> 7
+    return (data << 1) | carry
+
+def _shift_right_packed(data):
+    # Inserts a zero bit at the front of a packed array.
+    carry = np.zeros_like(data)
+    carry[1:] = data[:-1] << 7
+    return (data >> 1) | carry
+
+def _clear_packed_tail(packed, length):
+    packed = packed[:(length + 7) // 8]
+    spare = (-length) % 8
+    if spare and len(packed):
+        packed[-1] &= (0xFF << spare) & 0xFF
+    return packed
+
+def _pair_words(packed):
+    # Views packed bytes as big-endian 16-bit words (8 pairs each), zero padding an odd byte.
+    if len(packed) % 2:
+        packed = np.append(packed, np.uint8(0))
+    return packed.view('>u2')
+
+def _choose_pair_phase(data, shifted, erasures, length):
+    # Flags every bit that equals its successor (or where either is erased): flags on even
+    # positions are phase 0 pairs without a transition, flags on odd positions phase 1 pairs.
+    # Returns the phase with fewer violations.
+    flags = np.invert(data ^ shifted)
+    if erasures is not None:
+        flags |= erasures | _shift_left_packed(erasures)
+    flags = _clear_packed_tail(flags, length - 1)
+    return int(count_bits(flags & 0x55) < count_bits(flags & 0xAA))
+
+def _decode_pairs(data, erasures, num_pairs, scheme):
+    # Decodes one pair phase of packed data. Returns packed (bits, violations).
+    words = _pair_words(data)
+    if scheme == 'Manchester (Thomas)':
+        # 01 = 1 and 10 = 0
+        bits = _PAIR_SECOND[words]
+    elif scheme == 'Differential Manchester':
+        # The mid-bit transition is the clock. A transition at the start of the bit
+        # (against the previous pair's second half) is a 0, no transition is a 1.
+        bits = np.invert(_PAIR_FIRST[words] ^ _shift_right_packed(_PAIR_SECOND[words]))
+    else:
+        # IEEE: 10 = 1 and 01 = 0
+        bits = _PAIR_FIRST[words]
+        
+    violations = _PAIR_SAME[words]
+    if erasures is not None:
+        violations |= _PAIR_ANY[_pair_words(erasures)]
+    if scheme == 'Differential Manchester' and len(violations):
+        # The first bit has no previous half to compare against.
+        violations[0] |= 0x80
+            
+    return _clear_packed_tail(bits, num_pairs), _clear_packed_tail(violations, num_pairs)
+
+def decode_line_code(buffer, scheme, phase=None):
+    # Decodes a two-bits-per-symbol line code on a packed BitBuffer with 16-bit lookup tables.
+    # Pairs without a mid-bit transition, or holding an erased bit, are flagged as violations.
+    # Unless phase (0 or 1) is given, the violations of both pair phases are counted in one
+    # pass and the phase with fewer is decoded.
+    # Returns (bits, violations, phase): a BitBuffer, a packed violation mask of the same
+    # layout, and the pair phase used.
+    if len(buffer) < 2:
+        return BitBuffer(), np.zeros(0, dtype=np.uint8), 0
+        
+    data, erasures = buffer.data, buffer.erasures
+    shifted = _shift_left_packed(data) if phase != 0 else None
+    if phase is None:
+        phase = _choose_pair_phase(data, shifted, erasures, len(buffer))
+    if phase == 1:
+        data = shifted
+        erasures = None if erasures is None else _shift_left_packed(erasures)
     
-    for sym, bit_str in mapping_dict.items():
-        mask = (symbols == sym)
-        full_text_arr[mask] = bit_str
+    num_pairs = (len(buffer) - phase) // 2
+    bits, violations = _decode_pairs(data, erasures, num_pairs, scheme)
+    return BitBuffer(bits, num_pairs), violations, phase
+
+_POPCOUNT16 = np.array([bin(i).count('1') for i in range(1 << 16)], dtype=np.uint8)
+
+def find_pattern_hits(buffer, pattern, max_errors=0, include_inverted=True, differential=False,
+                      chunk_bytes=1 << 21):
+    # Finds every bit offset where pattern (a BitBuffer) matches within max_errors bit errors.
+    # The first pattern bytes (up to four) are scored at every offset at once: a table maps the
+    # 16-bit word at a byte offset to the distance of one pattern byte at all 8 bit shifts, packed
+    # one shift per byte lane of a uint64, so summing the tables gives the prefix distance of 8
+    # offsets per addition. Only offsets that can still match in either polarity are scored on
+    # the rest of the pattern, 16 bits at a time through a popcount table. The inverted pattern's
+    # distance is len(pattern) minus the normal one, so both polarities come from one pass.
+    # differential matches bit transitions instead (NRZ-I style, polarity free); hit offsets
+    # still point at the first pattern bit.
+    # Returns (positions int64, errors int32, inverted bool), sorted by position.
+    empty = (np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int32), np.zeros(0, dtype=bool))
+    data = buffer.data
+    pattern_bits = pattern.to_bits()
+    if differential:
+        # Transition t[i] = b[i] ^ b[i-1]; the pattern's first transition sits one bit in.
+        data = _clear_packed_tail(data ^ _shift_right_packed(data), len(buffer))
+        pattern_bits = pattern_bits[1:] ^ pattern_bits[:-1]
+        include_inverted = False
+        
+    length = len(pattern_bits)
+    num_positions = len(buffer) - length + 1
+    if length == 0 or num_positions <= 0:
+        return empty
+        
+    # Prefix tables: lane s of entry w is the distance of the piece to bits s..s+8 of w.
+    # Large error budgets get a longer prefix (while the lanes cannot overflow), so that
+    # random data rarely gets within reach of a match: the budget stays a few standard
+    # deviations below the mean distance of 4 per piece.
+    max_pieces = min((length + 7) // 8, 31)
+    num_pieces = min(max_pieces, 4)
+    while num_pieces < max_pieces and 4 * num_pieces - 2.5 * np.sqrt(2 * num_pieces) <= max_errors:
+        num_pieces += 1
+    prefix_len = min(length, 8 * num_pieces)
+    windows = (np.arange(1 << 16, dtype=np.uint32)[:, None] >> (8 - np.arange(8, dtype=np.uint32))) & 0xFF
+    tables = []
+    for j in range(num_pieces):
+        piece = pattern_bits[8 * j:min(8 * j + 8, prefix_len)]
+        value = int(np.packbits(piece)[0])
+        mask = (0xFF << (8 - len(piece))) & 0xFF
+        tables.append(np.ascontiguousarray(_POPCOUNT16[(windows & mask) ^ value]).view('<u8').ravel())
+        
+    # Rest of the pattern split into 16-bit words (the last one masked to its real length).
+    rest = pattern_bits[prefix_len:]
+    num_segments = (len(rest) + 15) // 16
+    padded = np.zeros(num_segments * 16, dtype=np.uint8)
+    padded[:len(rest)] = rest
+    seg_values = np.packbits(padded).view('>u2').astype(np.uint32)
+    seg_masks = np.full(num_segments, 0xFFFF, dtype=np.uint32)
+    if len(rest) % 16:
+        seg_masks[-1] = (0xFFFF << (16 - len(rest) % 16)) & 0xFFFF
+        
+    # Shifting the lanes down by max_errors + 1 (wrapping) leaves one contiguous range to keep:
+    # normal matches wrap to the top and inverted ones land just below prefix_len.
+    low = prefix_len - 2 * max_errors - 1
+    num_bytes = (num_positions + 7) // 8
+    padded_data = np.concatenate([data, np.zeros(num_pieces + 2 * num_segments + 4, dtype=np.uint8)])
+    found = []
+    
+    for chunk_start in range(0, num_bytes, chunk_bytes):
+        count = min(chunk_bytes, num_bytes - chunk_start)
+        window = padded_data[chunk_start:chunk_start + count + num_pieces]
+        words = (window[:-1].astype(np.uint16) << 8) | window[1:]
+        score = tables[0][words[:count]]
+        for j in range(1, num_pieces):
+            score += tables[j][words[j:j + count]]
+        lanes = score.view(np.uint8)
+        
+        if include_inverted:
+            lanes -= np.uint8(max_errors + 1)
+            cand = np.flatnonzero(lanes >= low) if low > 0 else np.arange(len(lanes))
+            dist = (lanes[cand] + np.uint8(max_errors + 1)).astype(np.int32)
+        else:
+            cand = np.flatnonzero(lanes <= max_errors)
+            dist = lanes[cand].astype(np.int32)
+        pos = chunk_start * 8 + cand
+        keep = pos < num_positions
+        pos, dist = pos[keep], dist[keep]
+        
+        # Score the rest 16 bits at a time, dropping offsets that fall out of reach.
+        for j in range(num_segments):
+            bit = pos + prefix_len + 16 * j
+            byte = bit >> 3
+            word = ((padded_data[byte].astype(np.uint32) << 16) | (padded_data[byte + 1].astype(np.uint32) << 8) 
+                    | padded_data[byte + 2])
+            seg = ((word >> (8 - (bit & 7)).astype(np.uint32)) & seg_masks[j]) ^ seg_values[j]
+            dist += _POPCOUNT16[seg]
+            remaining = length - prefix_len - 16 * (j + 1)
+            reach = dist <= max_errors
+            if include_inverted:
+                reach |= dist + max(remaining, 0) >= length - max_errors
+            pos, dist = pos[reach], dist[reach]
+            
+        if include_inverted:
+            hit = (dist <= max_errors) | (dist >= length - max_errors)
+        else:
+            hit = dist <= max_errors
+        found.append((pos[hit], dist[hit]))
         
-    # Join into one massive string and return
-    return "".join(full_text_arr)
+    positions = np.concatenate([f[0] for f in found]).astype(np.int64)
+    dist = np.concatenate([f[1] for f in found]).astype(np.int32)
+    
+    inverted = dist > max_errors
+    errors = np.where(inverted, length - dist, dist).astype(np.int32)
+    if differential:
+        keep = positions > 0
+        positions, errors, inverted = positions[keep] - 1, errors[keep], inverted[keep]
+    return positions, errors, inverted
 
-def invert_bit_string(bit_string):
-    trans = str.maketrans('01', '10')
-    return bit_string.translate(trans)
+# Packet framing modes understood by frame_packets, in UI order.
+FRAMING_MODES = ('Fixed Length', 'Length Field', 'Next Sync')
 
-def decode_manchester_string(bit_string, scheme):
-    # Decodes a Manchester encoded bit string based on IEEE or GE Thomas conventions.
+def frame_packets(buffer, hits, sync_len, mode='Fixed Length', length_bits=256, inverted=None,
+                  include_sync=True, field_offset=0, field_bits=8, unit_bits=8, adjust_bits=0,
+                  max_bits=1 << 16):
+    # Splits the bitstream into packets starting at sync word hits (bit offsets, sorted).
+    # Fixed Length takes length_bits after the sync word. Length Field reads an unsigned
+    # MSB-first field of field_bits, field_offset bits after the sync word, and takes the field,
+    # then value * unit_bits + adjust_bits more. Next Sync runs up to the next hit.
+    # Hits inside an earlier packet are skipped and packets are cut at max_bits and the end
+    # of the buffer. Rows of inverted hits are flipped so every packet reads in true polarity.
+    # Returns (matrix, lengths, starts): packed rows (np.packbits layout, zero padded) of
+    # shape (packets, ceil(max length / 8)), the length of each packet in bits and the
+    # buffer offset of its first bit.
+    hits = np.asarray(hits, dtype=np.int64)
+    n = len(buffer)
+    empty = (np.zeros((0, 0), dtype=np.uint8), np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64))
+    if len(hits) == 0 or n == 0:
+        return empty
+    if inverted is None:
+        inverted = np.zeros(len(hits), dtype=bool)
+    inverted = np.asarray(inverted, dtype=bool)
+    bits = buffer.to_bits()
     
-    # Ensure even length
-    if len(bit_string) % 2 != 0:
-        bit_string = bit_string[:-1]
+    # Length of each candidate packet after its sync word.
+    if mode == 'Fixed Length':
+        body = np.full(len(hits), length_bits, dtype=np.int64)
+    elif mode == 'Next Sync':
+        body = np.append(hits[1:], n) - hits - sync_len
+    else:
+        field_pos = hits[:, None] + sync_len + field_offset + np.arange(field_bits)
+        field = bits[np.minimum(field_pos, n - 1)].astype(np.int64) ^ inverted[:, None]
+        value = field @ (1 << np.arange(field_bits - 1, -1, -1, dtype=np.int64))
+        body = field_offset + field_bits + value * unit_bits + adjust_bits
+        
+    head = 0 if include_sync else sync_len
+    lengths = np.clip(body + sync_len - head, 0, max_bits)
+    starts = hits + head
+    lengths = np.minimum(lengths, n - starts).clip(0)
     
-    # We process the string as chunks of 2.
-    # Simple list comprehension approach, easy in Python.
-    pairs = [bit_string[i:i+2] for i in range(0, len(bit_string), 2)]
-    decoded = []
+    # Greedy walk: the next packet starts at the first hit past the end of the current one.
+    keep = []
+    i = 0
+    while i < len(hits):
+        keep.append(i)
+        i = max(i + 1, int(np.searchsorted(hits, starts[i] + max(lengths[i], 1))))
+    keep = np.array(keep, dtype=np.int64)
+    starts, lengths, inverted = starts[keep], lengths[keep], inverted[keep]
     
-    if scheme == 'IEEE':
-        # 10 = 1 and 01 = 0
-        map_table = {'10': '1', '01': '0'}
-    elif scheme == 'Thomas':
-        # 01 = 1 and 10 = 0
-        map_table = {'01': '1', '10': '0'}
+    width = int(lengths.max()) if len(lengths) else 0
+    offsets = np.arange(width)
+    grid = bits[np.minimum(starts[:, None] + offsets, n - 1)] ^ inverted[:, None].astype(np.uint8)
+    grid[offsets >= lengths[:, None]] = 0
+    return np.packbits(grid, axis=1), lengths, starts
+
+# CRC widths understood by search_crc, in UI order.
+CRC_WIDTHS = (8, 16, 32)
+
+# 32-bit generator polynomials (normal form) tried by search_crc, since the full space
+# is too large: CRC-32, -32C, -32K, -32Q, XFER, -32D, AUTOSAR and CD-ROM-EDC.
+CRC32_POLYS = (0x04C11DB7, 0x1EDC6F41, 0x741B8CD7, 0x814141AB, 
+               0x000000AF, 0xA833982B, 0xF4ACFB13, 0x8001801B)
+
+def reflect_bits(values, width):
+    # Reverses the low width bits of each value (scalar or array).
+    values = np.asarray(values, dtype=np.int64)
+    out = np.zeros_like(values)
+    for k in range(width):
+        out |= ((values >> k) & 1) << (width - 1 - k)
+    return out
+
+def compute_crc(data, width, poly, init=0, refin=False, refout=False, xorout=0):
+    # Bitwise reference CRC of a byte string, with the usual catalogue parameters
+    # (normal form poly, init before reflection, xorout applied last).
+    mask = (1 << width) - 1
+    top = 1 << (width - 1)
+    reg = init
+    for b in bytes(data):
+        if refin:
+            b = int(reflect_bits(b, 8))
+        reg ^= b << (width - 8)
+        for _ in range(8):
+            reg = ((reg << 1) ^ poly) & mask if reg & top else (reg << 1) & mask
+    if refout:
+        reg = int(reflect_bits(reg, width))
+    return reg ^ xorout
+
+def _crc_tables(polys, width, reflected):
+    # Byte-at-a-time lookup tables for a batch of polynomials. Returns (polys, 256) int64.
+    # The table is linear in the byte, so only the eight single-bit entries are shifted
+    # out; the rest are XOR combinations of them.
+    polys = np.asarray(polys, dtype=np.int64)[:, None]
+    mask = (1 << width) - 1
+    bits = 1 << np.arange(8, dtype=np.int64)[None, :]
+    if reflected:
+        polys = reflect_bits(polys, width)
+        reg = np.repeat(bits, len(polys), axis=0)
+        for _ in range(8):
+            reg = (reg >> 1) ^ np.where(reg & 1, polys, 0)
     else:
-        # Fallback
-        return bit_string
+        top = 1 << (width - 1)
+        reg = np.repeat(bits << (width - 8), len(polys), axis=0)
+        for _ in range(8):
+            reg = ((reg << 1) & mask) ^ np.where(reg & top, polys, 0)
+    
+    table = np.zeros((len(polys), 1), dtype=np.int64)
+    for k in range(8):
+        table = np.concatenate((table, table ^ reg[:, k:k + 1]), axis=1)
+    return table
+
+def _crc_registers(tables, width, reflected, messages):
+    # Runs every table over every message (rows of a byte matrix, right aligned with zero
+    # padding) from a zero register with no final XOR. Leading zero bytes leave a zero
+    # register unchanged, so the padding is skipped for free.
+    # Returns the (tables, messages) registers in the storage order of the algorithm.
+    num_msgs, num_cols = messages.shape
+    reg = np.zeros((len(tables), num_msgs), dtype=np.int64)
+    flat = tables.ravel()
+    base = (np.arange(len(tables), dtype=np.int64) * 256)[:, None]
+    mask = (1 << width) - 1
+    
+    used = np.flatnonzero(messages.any(axis=0))
+    first = used[0] if len(used) else num_cols
+    for j in range(first, num_cols):
+        col = messages[:, j].astype(np.int64)[None, :]
+        if reflected:
+            reg = (reg >> 8) ^ flat[base + ((reg ^ col) & 0xFF)]
+        else:
+            reg = ((reg << 8) & mask) ^ flat[base + (((reg >> (width - 8)) ^ col) & 0xFF)]
+    return reg
+
+def _crc_messages(matrix, lengths, width, skip_bytes):
+    # Cuts whole-byte packets into CRC input (after skip_bytes, right aligned in a zero padded
+    # matrix) and the trailing CRC field. Packets too short to hold a message at least as
+    # long as the CRC are dropped.
+    # Returns (messages, sizes, field_big, field_little).
+    crc_bytes = width // 8
+    nbytes = np.asarray(lengths, dtype=np.int64) // 8
+    sizes = nbytes - skip_bytes - crc_bytes
+    keep = sizes >= crc_bytes
+    matrix, nbytes, sizes = matrix[keep], nbytes[keep], sizes[keep]
+    if len(sizes) == 0:
+        empty = np.zeros(0, dtype=np.int64)
+        return np.zeros((0, 0), dtype=np.uint8), empty, empty, empty
+    
+    rows = np.arange(len(sizes))[:, None]
+    width_cols = int(sizes.max())
+    src = skip_bytes + np.arange(width_cols)[None, :] - (width_cols - sizes[:, None])
+    messages = np.where(src >= skip_bytes, matrix[rows, np.maximum(src, 0)], 0).astype(np.uint8)
+    
+    field = matrix[rows, (nbytes - crc_bytes)[:, None] + np.arange(crc_bytes)].astype(np.int64)
+    shifts = 8 * np.arange(crc_bytes, dtype=np.int64)
+    field_big = (field << shifts[::-1]).sum(axis=1)
+    field_little = (field << shifts).sum(axis=1)
+    return messages, sizes, field_big, field_little
+
+def _crc_apply_init(messages, sizes, stored_init, width, reflected):
+    # Starting from a non-zero register is the same as starting from zero with the register
+    # XORed into the first message bytes (MSB first, or LSB first for reflected CRCs).
+    crc_bytes = width // 8
+    stored_init = np.asarray(stored_init, dtype=np.int64)
+    out = messages.copy()
+    rows = np.arange(len(sizes))
+    start = messages.shape[1] - sizes
+    for k in range(crc_bytes):
+        shift = 8 * k if reflected else 8 * (crc_bytes - 1 - k)
+        out[rows, start + k] ^= ((stored_init >> shift) & 0xFF).astype(np.uint8)
+    return out
+
+def _crc_filter(task):
+    # Process pool worker for search_crc.
+    # Returns how many of the differentials each polynomial satisfies, per field variant.
+    # A few differentials screen the whole batch first; only polynomials that match one of
+    # them are run over the rest.
+    polys, width, reflected, diffs, targets = task
+    tables = _crc_tables(polys, width, reflected)
+    screen = min(4, len(diffs))
+    regs = _crc_registers(tables, width, reflected, diffs[:screen])
+    counts = (regs[:, None, :] == targets[None, :, :screen]).sum(axis=2)
+    
+    rest = np.flatnonzero(counts.any(axis=1))
+    if len(rest) and screen < len(diffs):
+        regs = _crc_registers(tables[rest], width, reflected, diffs[screen:])
+        counts[rest] += (regs[:, None, :] == targets[None, :, screen:]).sum(axis=2)
+    return counts
+
+def _solve_gf2(equations, num_vars):
+    # Gaussian elimination over GF(2). equations is a list of (row bits, rhs bit).
+    # Returns one solution as an int (free variables zero), or None if inconsistent.
+    pivots = []
+    for row, rhs in equations:
+        for prow, prhs, bit in pivots:
+            if row >> bit & 1:
+                row ^= prow
+                rhs ^= prhs
+        if row == 0:
+            if rhs: return None
+            continue
+        bit = row.bit_length() - 1
+        pivots.append((row, rhs, bit))
+    value = 0
+    for row, rhs, bit in reversed(pivots):
+        lower = row & ~(1 << bit)
+        value |= (rhs ^ (bin(lower & value).count('1') & 1)) << bit
+    return value
+
+def search_crc(matrix, lengths, width=16, skip_bytes=0, polys=None, max_pairs=16, max_workers=None):
+    # Searches CRC parameters that explain the trailing width/8 bytes of each packet
+    # (packed rows as produced by frame_packets), computed over the bytes after skip_bytes.
+    # The XOR of two equal-length packets satisfies the CRC with zero init and final XOR,
+    # so polynomials and reflection are filtered on packet differentials first; init and
+    # final XOR are then solved for the survivors. Corrupted packets only cost matches.
+    # All 8 and 16-bit polynomials are tried, and CRC32_POLYS for 32 bits.
+    # Returns a list of (matches, packets, poly, init, refin, refout, xorout, little_endian),
+    # best first.
+    mask = (1 << width) - 1
+    if polys is None:
+        polys = CRC32_POLYS if width == 32 else range(1, 1 << width, 2)
+    polys = np.asarray(polys, dtype=np.int64)
+    
+    messages, sizes, field_big, field_little = _crc_messages(matrix, lengths, width, skip_bytes)
+    num = len(sizes)
+    if num < 2:
+        return []
+    
+    # Field variants: byte order, and whether the output is reflected relative to the input.
+    endians = (False,) if width == 8 else (False, True)
+    variants = [(little, flip) for little in endians for flip in (False, True)]
+    field_reflected = {little: reflect_bits(field_little if little else field_big, width) for little in endians}
+    def register_fields(little, flip):
+        # CRC field mapped into the register domain, up to the constant final XOR.
+        return field_reflected[little] if flip else (field_little if little else field_big)
+    
+    # Differential pairs: equal-length packets cancel init and final XOR. Without them, fall
+    # back to pairs against the first packet for the two usual init values.
+    order = np.argsort(sizes, kind='stable')
+    same = np.flatnonzero(sizes[order[1:]] == sizes[order[:-1]])
+    if len(same):
+        pairs = np.stack((order[same], order[same + 1]), axis=1)
+        init_cases = [None]
+    else:
+        pairs = np.stack((np.zeros(num - 1, dtype=np.int64), np.arange(1, num)), axis=1)
+        init_cases = [0, mask]
+    pairs = pairs[np.linspace(0, len(pairs) - 1, min(max_pairs, len(pairs))).astype(np.int64)]
+    needed = len(pairs) if len(pairs) <= 2 else max(2, len(pairs) // 2)
+    
+    tasks, labels = [], []
+    chunk = max(1, (1 << 22) // max(1, len(pairs) * messages.shape[1]))
+    for reflected in (False, True):
+        for init in init_cases:
+            msgs = messages if init is None else _crc_apply_init(messages, sizes, init, width, reflected)
+            diffs = msgs[pairs[:, 0]] ^ msgs[pairs[:, 1]]
+            targets = np.array([register_fields(*v)[pairs[:, 0]] ^ register_fields(*v)[pairs[:, 1]] for v in variants])
+            for start in range(0, len(polys), chunk):
+                tasks.append((polys[start:start + chunk], width, reflected, diffs, targets))
+                labels.append((reflected, start))
+    
+    work = sum(len(t[0]) * t[3].shape[1] for t in tasks)
+    if len(tasks) < 4 or work < (1 << 27):
+        counts = [_crc_filter(task) for task in tasks]
+    else:
+        ctx = multiprocessing.get_context('spawn')
+        with concurrent.futures.ProcessPoolExecutor(max_workers=max_workers, mp_context=ctx) as pool:
+            counts = list(pool.map(_crc_filter, tasks))
+    
+    survivors = set()
+    for (reflected, start), count in zip(labels, counts):
+        for p, v in zip(*np.nonzero(count >= needed)):
+            survivors.add((int(polys[start + p]), reflected, v))
+    
+    results = {}
+    for poly, reflected, v in survivors:
+        little, flip = variants[v]
+        fields = register_fields(little, flip)
+        table = _crc_tables([poly], width, reflected)
+        base = _crc_registers(table, width, reflected, messages)[0] ^ fields
         
-    for p in pairs:
-        # E for violation (00 or 11).
-        # Note: indicates shifted symbols (out-of-phase).
-        decoded.append(map_table.get(p, 'E'))
+        # Init candidates: the usual all-zeros and all-ones, plus solutions of the linear
+        # system that links packets of different lengths.
+        candidates = [0, mask]
+        distinct = np.unique(sizes)
+        if len(distinct) > 1:
+            unit = np.array([1 << k for k in range(width)], dtype=np.int64)
+            probe = np.zeros((len(distinct) * width, messages.shape[1]), dtype=np.uint8)
+            probe = _crc_apply_init(probe, np.repeat(distinct, width), np.tile(unit, len(distinct)), width, reflected)
+            columns = _crc_registers(table, width, reflected, probe)[0].reshape(len(distinct), width)
+            columns = columns[np.searchsorted(distinct, sizes)]
+            rng = np.random.default_rng(0)
+            for _ in range(4):
+                picks = rng.choice(num, size=min(num, width + 4), replace=False)
+                ref = picks[0]
+                equations = []
+                for i in picks[1:]:
+                    if sizes[i] == sizes[ref]: continue
+                    cols = (columns[i] ^ columns[ref]).tolist()
+                    rhs = int(base[i] ^ base[ref])
+                    for j in range(width):
+                        row = sum(((c >> j) & 1) << k for k, c in enumerate(cols))
+                        equations.append((row, (rhs >> j) & 1))
+                solved = _solve_gf2(equations, width)
+                if solved is not None and solved not in candidates:
+                    candidates.append(solved)
         
-    return "".join(decoded)
+        best = None
+        for stored in candidates:
+            if stored:
+                msgs = _crc_apply_init(messages, sizes, stored, width, reflected)
+                offsets = _crc_registers(table, width, reflected, msgs)[0] ^ fields
+            else:
+                offsets = base
+            values, counts = np.unique(offsets, return_counts=True)
+            k = int(np.argmax(counts))
+            xorout = int(reflect_bits(values[k], width)) if flip else int(values[k])
+            init = int(reflect_bits(stored, width)) if reflected else stored
+            # Ties (all packets the same length) go to the conventional 0 / all-ones values.
+            score = (int(counts[k]), xorout in (0, mask))
+            if best is None or score > best[0]:
+                best = (score, init, xorout)
+        
+        (matches, _), init, xorout = best
+        key = (poly, init, reflected, reflected ^ flip, xorout, little)
+        results[key] = max(results.get(key, 0), matches)
+    
+    ranked = [(matches, num) + key for key, matches in results.items()]
+    ranked.sort(key=lambda r: -r[0])
+    return ranked
+
+# Simple checksums understood by search_checksums, in UI order.
+CHECKSUM_TYPES = ('Sum-8', "Sum-8 Two's Complement", "Sum-8 One's Complement", 'XOR-8', 
+                  'Sum-16', 'Fletcher-16', 'Internet-16')
+
+def _checksum_prefixes(data):
+    # Running sums over a (packets, bytes) matrix that turn any range checksum into a
+    # difference of two columns. Returns a dict of (packets, bytes + 1) int64 arrays.
+    data = data.astype(np.int64)
+    rows, cols = data.shape
+    zero = np.zeros((rows, 1), dtype=np.int64)
+    prefixes = {
+        'sum': np.concatenate((zero, np.cumsum(data, axis=1)), axis=1),
+        'xor': np.concatenate((zero, np.bitwise_xor.accumulate(data, axis=1)), axis=1) if cols else zero,
+        'weighted': np.concatenate((zero, np.cumsum(data * np.arange(cols), axis=1)), axis=1),
+    }
+    # Big-endian 16-bit words starting on even and on odd byte offsets.
+    for parity in (0, 1):
+        pairs = data[:, parity:]
+        pairs = pairs[:, :pairs.shape[1] // 2 * 2]
+        words = (pairs[:, 0::2] << 8) | pairs[:, 1::2]
+        prefixes[parity] = np.concatenate((zero, np.cumsum(words, axis=1)), axis=1)
+    return prefixes
+
+def _checksum_values(kind, prefixes, rows, start, stop):
+    # Checksum of bytes [start, stop) for the given packet rows (broadcast together).
+    # Returns int64 values, or -1 where the checksum is undefined for the range.
+    total = prefixes['sum'][rows, stop] - prefixes['sum'][rows, start]
+    if kind == 'Sum-8':
+        return total & 0xFF
+    if kind == "Sum-8 Two's Complement":
+        return -total & 0xFF
+    if kind == "Sum-8 One's Complement":
+        return ~total & 0xFF
+    if kind == 'XOR-8':
+        return prefixes['xor'][rows, stop] ^ prefixes['xor'][rows, start]
+    if kind == 'Sum-16':
+        return total & 0xFFFF
+    if kind == 'Fletcher-16':
+        # The second Fletcher sum weights each byte by its distance from the range end.
+        weighted = prefixes['weighted'][rows, stop] - prefixes['weighted'][rows, start]
+        return (((stop * total - weighted) % 255) << 8) | (total % 255)
+    
+    # Internet checksum: one's complement sum of big-endian words, complemented. Only
+    # whole words are covered, so odd-length ranges are undefined.
+    start, stop = np.broadcast_arrays(start, stop)
+    parity = start & 1
+    words = np.where(parity == 0, 
+                     prefixes[0][rows, np.minimum(stop // 2, prefixes[0].shape[1] - 1)] - prefixes[0][rows, start // 2],
+                     prefixes[1][rows, np.minimum((stop - 1) // 2, prefixes[1].shape[1] - 1)] - prefixes[1][rows, (start - 1) // 2])
+    folded = words % 0xFFFF
+    folded = np.where((folded == 0) & (words > 0), 0xFFFF, folded)
+    return np.where((stop - start) % 2 == 0, ~folded & 0xFFFF, -1)
+
+def search_checksums(matrix, lengths, kinds=CHECKSUM_TYPES, max_bytes=256, min_fraction=0.5):
+    # Tests every simple checksum in kinds, at every field position and byte order, against
+    # every contiguous byte range that does not overlap the field. Runs on the packets of
+    # the most common byte length (first max_bytes bytes). Range checksums come from
+    # prefix sums, so each packet costs one vectorized comparison per field position. A
+    # few packets screen all hypotheses, and the survivors are scored on every packet.
+    # Fields that never change are skipped, since any constant range would explain them.
+    # Returns a list of (matches, packets, kind, start, stop, field_offset, little_endian)
+    # with byte offsets, best first.
+    nbytes = np.asarray(lengths, dtype=np.int64) // 8
+    if len(nbytes) < 2:
+        return []
+    sizes, counts = np.unique(nbytes, return_counts=True)
+    size = int(sizes[np.argmax(counts)])
+    group = np.flatnonzero(nbytes == size)
+    cols = min(size, max_bytes)
+    if len(group) < 2 or cols < 2:
+        return []
+    
+    data = matrix[group, :cols]
+    num = len(data)
+    prefixes = _checksum_prefixes(data)
+    start = np.arange(cols + 1)[:, None, None]
+    stop = np.arange(cols + 1)[None, :, None]
+    field = np.arange(cols)[None, None, :]
+    screen = min(num, 4)
+    needed = min(screen, 2)
+    
+    results = []
+    for kind in kinds:
+        width = 8 if kind in CHECKSUM_TYPES[:4] else 16
+        fbytes = width // 8
+        for little in ((False,) if width == 8 else (False, True)):
+            # Field value at every offset, padded with -2 where it would run off the end.
+            values = data.astype(np.int64)
+            if width == 16:
+                hi, lo = (values[:, 1:], values[:, :-1]) if little else (values[:, :-1], values[:, 1:])
+                values = np.concatenate(((hi << 8) | lo, np.full((num, 1), -2)), axis=1)
+            varying = values.min(axis=0) != values.max(axis=0)
+            
+            valid = ((start < stop) & ((stop <= field) | (start >= field + fbytes)) 
+                     & (field + fbytes <= cols) & varying[None, None, :])
+            hits = np.zeros(valid.shape, dtype=np.int8)
+            for row in range(screen):
+                sums = _checksum_values(kind, prefixes, row, start[:, :, 0], stop[:, :, 0])
+                hits += (sums[:, :, None] == values[row][None, None, :]) & valid
+            a, b, f = np.nonzero(hits >= needed)
+            if len(a) == 0: continue
+            
+            rows = np.arange(num)[:, None]
+            sums = _checksum_values(kind, prefixes, rows, a[None, :], b[None, :])
+            matches = (sums == values[rows, f[None, :]]).sum(axis=0)
+            for k in np.flatnonzero(matches >= max(2, min_fraction * num)):
+                results.append((int(matches[k]), num, kind, int(a[k]), int(b[k]), int(f[k]), little))
+    
+    # More matching packets first, then wider checksums, fields right after their range,
+    # and wider ranges.
+    results.sort(key=lambda r: (-r[0], r[2] in CHECKSUM_TYPES[:4], r[5] != r[4], -(r[4] - r[3])))
+    return results
+
+# Descrambler kinds reported by search_descramblers.
+DESCRAMBLER_KINDS = ('Additive', 'Self-Synchronizing')
+
+# Common whitening and scrambler characteristic polynomials (bit k is the x^k term):
+# x^7+x^4+1 (802.11, BLE), x^7+x^6+1, x^9+x^5+1 (PN9, CC1101, SX12xx), x^9+x^4+1 (802.15.4g),
+# x^15+x^14+1 (PN15, DVB), x^16+x^14+x^13+x^11+1, x^17+x^12+1 (G3RUH), x^23+x^18+1 (V.34).
+# The search also tries the reciprocal of each, which runs the sequence backwards.
+LFSR_POLYS = (0x91, 0xC1, 0x221, 0x211, 0xC001, 0x16801, 0x21001, 0x840001)
+
+def format_poly(poly):
+    # Returns a polynomial in x^n+...+1 notation.
+    terms = [k for k in range(poly.bit_length() - 1, -1, -1) if poly >> k & 1]
+    return "+".join("1" if k == 0 else "x" if k == 1 else f"x^{k}" for k in terms)
+
+def reciprocal_poly(poly):
+    return int(reflect_bits(poly, poly.bit_length()))
+
+def berlekamp_massey(bits):
+    # Shortest LFSR generating bits, in connection form s[n] = XOR c[i] s[n-i] for i = 1..L.
+    # Returns (connection, L) with bit i of connection holding c[i] (bit 0 set).
+    conn, prev = 1, 1
+    length, shift = 0, 1
+    history = 0 # Bit i holds s[n-i].
+    for n, bit in enumerate(bits):
+        history = (history << 1) | int(bit)
+        if bin(conn & history).count('1') & 1 == 0:
+            shift += 1
+            continue
+        saved = conn
+        conn ^= prev << shift
+        if 2 * length <= n:
+            length, prev, shift = n + 1 - length, saved, 1
+        else:
+            shift += 1
+    return conn, length
+
+def lfsr_sequence(poly, seeds, n):
+    # Runs s[k+L] = XOR s[k+j] over the x^j terms (j < L) of the degree L characteristic
+    # polynomial. seeds is a (rows, L) matrix of first bits. Returns (rows, n) uint8.
+    degree = poly.bit_length() - 1
+    taps = [j for j in range(degree) if poly >> j & 1]
+    seeds = np.atleast_2d(np.asarray(seeds, dtype=np.uint8))
+    seq = np.zeros((len(seeds), max(n, degree)), dtype=np.uint8)
+    seq[:, :degree] = seeds
+    for k in range(degree, n):
+        acc = seq[:, k - degree + taps[0]].copy()
+        for j in taps[1:]:
+            acc ^= seq[:, k - degree + j]
+        seq[:, k] = acc
+    return seq[:, :n]
+
+def byte_entropy(data):
+    # Shannon entropy (bits per byte) of the byte values in each row of a uint8 matrix.
+    # Uses H = log2(n) - sum(c * log2(c)) / n over the value counts c, with c * log2(c)
+    # looked up rather than computed.
+    rows, cols = data.shape
+    if cols == 0:
+        return np.zeros(rows)
+    keys = (np.arange(rows, dtype=np.int64)[:, None] * 256 + data).ravel()
+    counts = np.bincount(keys, minlength=rows * 256).reshape(rows, 256)
+    c = np.arange(cols + 1, dtype=np.float64)
+    table = c * np.log2(np.maximum(c, 1))
+    return np.log2(cols) - table[counts].sum(axis=1) / cols
+
+# Bit order reversal within a byte.
+_BYTE_REVERSE = np.array([int(f"{b:08b}"[::-1], 2) for b in range(256)], dtype=np.uint8)
+
+def descramble_packets(matrix, lengths, kind, poly, keystream=None, start_bit=0):
+    # Undoes whitening on framed packets (packed rows) from start_bit on. Additive
+    # descrambling XORs keystream (bits); self-synchronizing descrambling XORs each bit with
+    # the received bits at the polynomial's delays. Returns the new packed matrix.
+    bits = np.unpackbits(matrix, axis=1)
+    body = bits[:, start_bit:]
+    if kind == 'Additive':
+        span = min(len(keystream), body.shape[1])
+        body[:, :span] ^= keystream[:span]
+    else:
+        received = body.copy()
+        for delay in (j for j in range(1, poly.bit_length()) if poly >> j & 1):
+            body[:, delay:] ^= received[:, :-delay]
+    bits[np.arange(bits.shape[1])[None, :] >= np.asarray(lengths)[:, None]] = 0
+    return np.packbits(bits, axis=1)
+
+def _packet_sample(matrix, lengths, start_bit, max_packets, max_bytes):
+    # Whole bytes after start_bit from the first max_packets packets, cut to a common width.
+    # Returns (bits (packets, nbits), bytes (packets, nbits // 8)).
+    nbits = (np.asarray(lengths[:max_packets], dtype=np.int64) - start_bit).min() // 8 * 8
+    nbits = int(min(max(nbits, 0), max_bytes * 8))
+    bits = np.unpackbits(matrix[:max_packets], axis=1)[:, start_bit:start_bit + nbits]
+    return bits, np.packbits(bits, axis=1)
+
+def search_descramblers(matrix, lengths, start_bit=0, known=None, known_offset=0, polys=LFSR_POLYS,
+                        max_degree=16, max_packets=64, max_bytes=64, keep=20):
+    # Searches whitening that makes the framed packets (after start_bit) least random.
+    # With known plaintext bits at known_offset (after start_bit), the keystream over that
+    # region (majority of all packets) is solved with Berlekamp-Massey and extended both
+    # ways. Otherwise additive LFSRs from polys (and reciprocals, up to max_degree) are tried
+    # with every seed in both bit orders, and self-synchronizing descramblers with every
+    # poly. All seeds of a polynomial are XOR combinations of L basis sequences, so the
+    # whole seed space is built and scored at once on a few packets, and the best seeds
+    # are rescored on up to max_packets.
+    # Returns (baseline, candidates): the entropy of the packets as they are, and a list of
+    # (entropy, kind, poly, seed, lsb_first, keystream) sorted by entropy (bits per byte).
+    # seed holds the first L keystream bits MSB first; keystream is None when self-synchronizing.
+    lengths = np.asarray(lengths, dtype=np.int64)
+    bits, data = _packet_sample(matrix, lengths, start_bit, max_packets, max_bytes)
+    if data.shape[1] == 0:
+        return None, []
+    total = int(lengths.max()) - start_bit
+    baseline = float(byte_entropy(data.reshape(1, -1))[0])
+    
+    def score(keystreams):
+        # Entropy of the sample after XORing each keystream (rows of packed bytes).
+        mixed = data[None, :, :] ^ keystreams[:, None, :data.shape[1]]
+        return byte_entropy(mixed.reshape(len(keystreams), -1))
+    
+    candidates = []
+    if known is not None and len(known):
+        # Keystream bits observed over the known region, by majority across packets.
+        region = np.unpackbits(matrix, axis=1)[:, start_bit + known_offset:start_bit + known_offset + len(known)]
+        observed = ((region ^ np.asarray(known, dtype=np.uint8)).sum(axis=0) * 2 > len(region)).astype(np.uint8)
+        conn, degree = berlekamp_massey(observed)
+        if 0 < degree and 2 * degree <= len(observed):
+            poly = int(reflect_bits(conn, degree + 1))
+            forward = lfsr_sequence(poly, observed[:degree], total - known_offset)[0]
+            if poly & 1:
+                # Time-reversed, the sequence follows the reciprocal polynomial.
+                backward = lfsr_sequence(reciprocal_poly(poly), observed[:degree][::-1], known_offset + degree)[0][::-1]
+                keystream = np.concatenate((backward[:known_offset], forward))
+            else:
+                keystream = np.concatenate((np.zeros(known_offset, dtype=np.uint8), forward))
+            entropy = float(score(np.packbits(keystream[None, :bits.shape[1]], axis=1))[0])
+            seed = int("".join(map(str, keystream[:degree])), 2)
+            candidates.append((entropy, 'Additive', poly, seed, False, keystream))
+        return baseline, candidates
+    
+    tried = []
+    for poly in polys:
+        for p in (poly, reciprocal_poly(poly)):
+            if p in tried: continue
+            tried.append(p)
+            degree = p.bit_length() - 1
+            
+            # Self-synchronizing descrambler: no seed, output depends on received bits only.
+            descrambled = descramble_packets(np.packbits(bits, axis=1), np.full(len(bits), bits.shape[1]), 'Self-Synchronizing', p)
+            entropy = float(byte_entropy(descrambled[:, degree // 8 + 1:].reshape(1, -1))[0])
+            candidates.append((entropy, 'Self-Synchronizing', p, None, False, None))
+            
+            if degree > max_degree: continue
+            # Every seed's keystream is the XOR of the basis sequences of its set bits.
+            basis = lfsr_sequence(p, np.eye(degree, dtype=np.uint8), total)
+            packed = np.packbits(basis[:, :bits.shape[1]], axis=1)
+            table = np.zeros((1, packed.shape[1]), dtype=np.uint8)
+            for k in range(degree):
+                table = np.concatenate((table, table ^ packed[k]), axis=0)
+            for lsb_first in (False, True):
+                streams = _BYTE_REVERSE[table] if lsb_first else table
+                screen = data[:4]
+                mixed = screen[None, :, :] ^ streams[:, None, :]
+                entropy = byte_entropy(mixed.reshape(len(streams), -1))
+                best = np.argsort(entropy)[:keep]
+                for seed_index, ent in zip(best.tolist(), score(streams[best]).tolist()):
+                    seed_bits = np.array([(seed_index >> k) & 1 for k in range(degree)], dtype=np.uint8)
+                    keystream = np.bitwise_xor.reduce(basis[seed_bits == 1], axis=0)
+                    if lsb_first:
+                        padded = np.concatenate((keystream, np.zeros(-len(keystream) % 8, dtype=np.uint8)))
+                        keystream = padded.reshape(-1, 8)[:, ::-1].ravel()[:total]
+                    seed = int("".join(map(str, seed_bits)), 2)
+                    candidates.append((ent, 'Additive', p, seed, lsb_first, keystream))
+    
+    candidates.sort(key=lambda c: c[0])
+    return baseline, candidates[:keep]
+
+def decoding_chains(modulus):
+    # Every combination of the workbench transforms, in the order they are applied:
+    # (differential, mapping preset, invert, line code or None, pair phase).
+    presets = ('binary',) if modulus <= 2 else ('binary', 'gray')
+    codes = [(None, 0)] + [(code, phase) for code in LINE_CODES for phase in (0, 1)]
+    return [(differential, preset, invert, code, phase)
+            for differential in (False, True) for preset in presets 
+            for invert in (False, True) for code, phase in codes]
+
+def describe_chain(chain):
+    differential, preset, invert, code, phase = chain
+    steps = ["Differential" if differential else "Absolute", preset.capitalize()]
+    if invert:
+        steps.append("Invert")
+    if code is not None:
+        steps.append(f"{code} (phase {phase})")
+    return " > ".join(steps)
+
+def apply_decoding_chain(symbols, modulus, chain):
+    # Runs symbols through a chain from decoding_chains.
+    # Returns (bits, violations): a BitBuffer, and the packed line code violation mask or None.
+    differential, preset, invert, code, phase = chain
+    if differential:
+        symbols = decode_differential(symbols, modulus)
+    buffer = map_symbols_to_bits(symbols, generate_mapping_dict(modulus, preset))
+    if invert:
+        buffer = buffer.invert()
+    if code is None:
+        return buffer, None
+    bits, violations, _ = decode_line_code(buffer, code, phase)
+    return bits, violations
+
+# State of a decoding chain pool worker: (symbols, modulus, sync, max_errors).
+_chain_state = None
+
+def _init_chain_worker(symbols, modulus, sync, max_errors):
+    # Process pool initializer for search_decoding_chains; each worker keeps the inputs.
+    global _chain_state
+    _chain_state = (symbols, modulus, sync, max_errors)
+
+def _score_chain_worker(chain):
+    # Process pool worker for search_decoding_chains.
+    return _score_chain(chain, *_chain_state)
+
+def _score_chain(chain, symbols, modulus, sync, max_errors):
+    # Returns (hits, penalty, entropy, violation rate, digest) for one chain. The digest
+    # covers the whole output, so only chains with identical bits share it.
+    bits, violations = apply_decoding_chain(symbols, modulus, chain)
+    if len(bits) == 0:
+        return 0, 1.0, 8.0, 1.0, b""
+    
+    hits = 0
+    if sync is not None:
+        hits = len(find_pattern_hits(bits, sync, max_errors=max_errors, include_inverted=False)[0])
+    
+    # A correct line code decode leaves few violations. Output that still decodes cleanly
+    # as Manchester is probably still line coded, so it is penalised by how clean it is.
+    if violations is not None:
+        rate = count_bits(violations) / len(bits)
+        penalty = rate
+    else:
+        _, residual, _ = decode_line_code(bits, LINE_CODES[0])
+        rate = 0.0
+        penalty = max(0.0, 0.5 - count_bits(residual) / max(len(bits) // 2, 1))
+    
+    entropy = float(byte_entropy(np.frombuffer(bits.tobytes(), dtype=np.uint8)[None, :])[0])
+    digest = hashlib.blake2b(bits.tobytes())
+    digest.update(len(bits).to_bytes(8, 'little'))
+    return hits, penalty, entropy, rate, digest.digest()
+
+def search_decoding_chains(symbols, modulus, sync=None, max_errors=0, max_symbols=1 << 22, max_workers=None):
+    # Evaluates every decoding chain on the symbols (up to max_symbols) and ranks them by
+    # sync word hits (when sync, a BitBuffer, is given), then line code cleanliness in steps
+    # of 5%, then byte entropy. Chains with identical output are listed once.
+    # Returns a list of (chain, hits, violation rate, entropy), best first.
+    symbols = np.asarray(symbols)[:max_symbols]
+    chains = decoding_chains(modulus)
+    
+    if len(symbols) < (1 << 20):
+        scores = [_score_chain(chain, symbols, modulus, sync, max_errors) for chain in chains]
+    else:
+        # Workers get the symbols once through the initializer rather than with every chain.
+        ctx = multiprocessing.get_context('spawn')
+        with concurrent.futures.ProcessPoolExecutor(max_workers=max_workers, mp_context=ctx, 
+                                                    initializer=_init_chain_worker,
+                                                    initargs=(symbols, modulus, sync, max_errors)) as pool:
+            scores = list(pool.map(_score_chain_worker, chains))
+    
+    order = sorted(range(len(chains)), key=lambda k: (-scores[k][0], round(scores[k][1] * 20), scores[k][2]))
+    seen = set()
+    ranked = []
+    for k in order:
+        hits, _, entropy, rate, digest = scores[k]
+        if digest in seen: continue
+        seen.add(digest)
+        ranked.append((chains[k], hits, rate, entropy))
+    return ranked